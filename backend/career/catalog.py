@@ -0,0 +1,82 @@
+"""
+Cached catalog responses (subjects, universities, programs, career paths).
+
+The catalog is near-static reference data. Serialized list and detail
+payloads are cached under a catalog-wide version that is bumped whenever any
+catalog row or relation changes (see career.signals), so stale payloads are
+never served and need no explicit deletion; they simply age out.
+
+Responses carry an ETag derived from the version and the request URL. A
+client revalidating with If-None-Match costs one cache lookup and gets a
+304; any other repeat request costs one lookup for the version and one for
+the payload.
+"""
+
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.response import Response
+
+from utils.conditional import etag_matches, not_modified
+
+
+VERSION_KEY = 'career:catalog:version'
+
+CACHE_CONTROL = 'private, no-cache'
+
+
+def get_cache_timeout():
+    return getattr(settings, 'CAREER_CATALOG_CACHE_TIMEOUT', 3600)
+
+
+def get_catalog_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # Seeded from the clock so an evicted version never reuses an old number
+        cache.add(VERSION_KEY, int(time.time() * 1000), None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def bump_catalog_version():
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        # Nothing cached yet, or the key was evicted
+        cache.set(VERSION_KEY, int(time.time() * 1000), None)
+
+
+def invalidate_catalog():
+    transaction.on_commit(bump_catalog_version)
+
+
+class CatalogCacheMixin:
+    """Serve list/retrieve responses from the versioned catalog cache."""
+
+    def catalog_response(self, request, build):
+        version = get_catalog_version()
+        variant = hashlib.sha1(
+            f"{type(self).__name__}|{request.build_absolute_uri()}".encode()
+        ).hexdigest()[:20]
+        etag = f'"{version}-{variant}"'
+        if etag_matches(request, etag):
+            return not_modified(etag, CACHE_CONTROL)
+
+        key = f"career:catalog:{version}:{variant}"
+        data = cache.get(key)
+        if data is None:
+            data = build().data
+            cache.set(key, data, get_cache_timeout())
+        response = Response(data)
+        response['ETag'] = etag
+        response['Cache-Control'] = CACHE_CONTROL
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.catalog_response(request, lambda: super(CatalogCacheMixin, self).list(request, *args, **kwargs))
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.catalog_response(request, lambda: super(CatalogCacheMixin, self).retrieve(request, *args, **kwargs))
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-18 09:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('career', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='careerpath',
+            name='trait_profile',
+            field=models.JSONField(blank=True, default=dict, help_text='Trait weights used by the quiz scorer, e.g. {"analytical": 0.8, "social": 0.2}'),
+        ),
+    ]
@@ -17,6 +17,11 @@ class Subject(models.Model):
     level = models.CharField(max_length=20, choices=LEVEL_CHOICES)
     description = models.TextField()
     
+    class Meta:
+        indexes = [
+            models.Index(fields=['level'], name='career_subject_level_idx'),
+        ]
+    
     def __str__(self):
         return f"{self.name} ({self.get_level_display()})"
 
@@ -68,6 +73,10 @@ class CareerPath(models.Model):
     average_salary = models.CharField(max_length=100)
     job_outlook = models.TextField()
     related_programs = models.ManyToManyField(Program, related_name='career_paths')
+    trait_profile = models.JSONField(
+        default=dict, blank=True,
+        help_text="Trait weights used by the quiz scorer, e.g. {\"analytical\": 0.8, \"social\": 0.2}"
+    )
     
     def __str__(self):
         return self.title
@@ -84,6 +93,9 @@ class Recommendation(models.Model):
     class Meta:
         unique_together = ['user', 'career_path']
         ordering = ['-score']
+        indexes = [
+            models.Index(fields=['user', '-score'], name='career_rec_user_score_idx'),
+        ]
     
     def __str__(self):
         return f"{self.user.full_name} - {self.career_path.title} ({self.score}%)"
@@ -0,0 +1,172 @@
+"""
+Career recommendation scoring for submitted quizzes.
+
+Quiz options and CareerPath trait profiles are loaded once each and laid out
+as matrices over a shared trait vocabulary. A user's trait vector is the sum
+of the rows of the options they picked, and every career is scored in one
+matrix product (cosine similarity, scaled to 0-100).
+
+Careers without a trait profile (e.g. created before the field existed) are
+profiled from keywords in their required skills and sector instead, so they
+still take part in scoring.
+"""
+
+import re
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+
+from .models import CareerPath, QuizOption, QuizResult, Recommendation
+
+
+def parse_traits(text):
+    return [trait.strip().lower() for trait in (text or '').split(',') if trait.strip()]
+
+
+# Keywords in a career's skills or sector that indicate each quiz trait
+TRAIT_KEYWORDS = {
+    'analytical': ['analy', 'data', 'research', 'math', 'statistic', 'science', 'engineer', 'financ', 'account'],
+    'creative': ['design', 'creativ', 'art', 'writ', 'media', 'music', 'architect', 'marketing'],
+    'social': ['communicat', 'teach', 'educat', 'health', 'care', 'counsel', 'customer', 'nurs', 'community'],
+    'practical': ['technical', 'construct', 'mechanic', 'repair', 'manufactur', 'agricultur', 'maintenance', 'hands-on'],
+    'leadership': ['manag', 'leader', 'business', 'strateg', 'entrepreneur', 'project', 'administrat'],
+}
+
+TRAIT_PATTERNS = {
+    trait: re.compile(r'\b(?:' + '|'.join(re.escape(keyword) for keyword in keywords) + ')')
+    for trait, keywords in TRAIT_KEYWORDS.items()
+}
+
+
+def derive_trait_profile(skills_required, sector):
+    """Trait weights (summing to 1) from keyword hits in a career's skills and sector."""
+    text = f"{skills_required or ''} {sector or ''}".lower()
+    hits = {trait: len(pattern.findall(text)) for trait, pattern in TRAIT_PATTERNS.items()}
+    total = sum(hits.values())
+    return {trait: round(count / total, 2) for trait, count in hits.items() if count} if total else {}
+
+
+def get_recommendation_limit():
+    return getattr(settings, 'CAREER_RECOMMENDATION_LIMIT', 5)
+
+
+class QuizScorer:
+    """
+    Scores a quiz submission against every CareerPath.
+
+    Both the quiz options and the career profiles are fetched with a single
+    query each, regardless of how many questions or careers exist.
+    """
+
+    def __init__(self, quiz):
+        self.quiz = quiz
+        options = list(
+            QuizOption.objects.filter(question__quiz=quiz).values_list('id', 'question_id', 'career_traits')
+        )
+        self.careers = list(CareerPath.objects.only('id', 'title', 'trait_profile', 'skills_required', 'sector'))
+        profiles = [
+            career.trait_profile or derive_trait_profile(career.skills_required, career.sector)
+            for career in self.careers
+        ]
+
+        option_traits = [parse_traits(traits) for _, _, traits in options]
+        vocabulary = set()
+        for traits in option_traits:
+            vocabulary.update(traits)
+        for profile in profiles:
+            vocabulary.update(str(trait).lower() for trait in profile)
+        self.traits = sorted(vocabulary)
+        trait_index = {trait: i for i, trait in enumerate(self.traits)}
+
+        # options x traits: 1 for every trait an option indicates
+        self.option_index = {}
+        self.option_question = {}
+        self.option_matrix = np.zeros((len(options), len(self.traits)))
+        for row, ((option_id, question_id, _), traits) in enumerate(zip(options, option_traits)):
+            self.option_index[str(option_id)] = row
+            self.option_question[str(option_id)] = str(question_id)
+            for trait in traits:
+                self.option_matrix[row, trait_index[trait]] += 1
+
+        # careers x traits: the weights from each career's trait profile
+        self.career_matrix = np.zeros((len(self.careers), len(self.traits)))
+        for row, profile in enumerate(profiles):
+            for trait, weight in profile.items():
+                try:
+                    self.career_matrix[row, trait_index[str(trait).lower()]] = float(weight)
+                except (TypeError, ValueError):
+                    continue
+
+    def trait_vector(self, answers):
+        """Sum the trait rows of the selected options, ignoring unknown answers."""
+        selection = np.zeros(len(self.option_index))
+        for question_id, option_id in answers.items():
+            row = self.option_index.get(str(option_id))
+            if row is not None and self.option_question[str(option_id)] == str(question_id):
+                selection[row] = 1
+        return selection @ self.option_matrix
+
+    def score(self, trait_vector):
+        """Return a 0-100 cosine score for every career."""
+        norms = np.linalg.norm(self.career_matrix, axis=1) * np.linalg.norm(trait_vector)
+        raw = self.career_matrix @ trait_vector
+        return np.divide(raw, norms, out=np.zeros_like(raw), where=norms > 0) * 100
+
+    def explain(self, career_row, trait_vector):
+        contributions = self.career_matrix[career_row] * trait_vector
+        ranked = [self.traits[i] for i in np.argsort(-contributions) if contributions[i] > 0][:2]
+        return (
+            f"Based on your quiz results, you have strong {', '.join(ranked)} traits "
+            f"which align well with this career."
+        )
+
+    def record(self, user, answers):
+        """Persist the quiz result with the user's trait counts."""
+        vector = self.trait_vector(answers)
+        result, _ = QuizResult.objects.update_or_create(
+            user=user,
+            quiz=self.quiz,
+            defaults={
+                'answers': answers,
+                'score': {trait: int(count) for trait, count in zip(self.traits, vector)}
+            }
+        )
+        return result
+
+    @transaction.atomic
+    def recommend(self, user, answers, limit=None):
+        """
+        Replace the user's recommendations with the top-scoring careers in
+        one bulk upsert.
+        """
+        limit = limit or get_recommendation_limit()
+        vector = self.trait_vector(answers)
+        scores = self.score(vector)
+        top_rows = [row for row in np.argsort(-scores, kind='stable')[:limit] if scores[row] > 0]
+        recommendations = [
+            Recommendation(
+                user=user,
+                career_path=self.careers[row],
+                score=round(float(min(scores[row], 100.0)), 2),
+                reasoning=self.explain(row, vector),
+            )
+            for row in top_rows
+        ]
+        Recommendation.objects.filter(user_id=user.pk).exclude(
+            career_path_id__in=[rec.career_path_id for rec in recommendations]
+        ).delete()
+        Recommendation.objects.bulk_create(
+            recommendations,
+            update_conflicts=True,
+            unique_fields=['user', 'career_path'],
+            update_fields=['score', 'reasoning'],
+        )
+        return recommendations
+
+    @transaction.atomic
+    def submit(self, user, answers, limit=None):
+        """Record the result and regenerate recommendations in one go."""
+        result = self.record(user, answers)
+        self.recommend(user, answers, limit)
+        return result
@@ -50,7 +50,7 @@ class CareerPathDetailSerializer(serializers.ModelSerializer):
         model = CareerPath
         fields = [
             'id', 'title', 'description', 'skills_required', 'sector',
-            'average_salary', 'job_outlook', 'related_programs'
+            'average_salary', 'job_outlook', 'trait_profile', 'related_programs'
         ]
 
 
@@ -93,6 +93,11 @@ class CareerQuizDetailSerializer(serializers.ModelSerializer):
 
 class QuizSubmissionSerializer(serializers.Serializer):
     answers = serializers.JSONField()
+    
+    def validate_answers(self, value):
+        if not isinstance(value, dict):
+            raise serializers.ValidationError("Answers must map question IDs to selected option IDs")
+        return value
 
 
 class QuizResultSerializer(serializers.ModelSerializer):
@@ -0,0 +1,19 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from .catalog import invalidate_catalog
+from .models import CareerPath, Program, Subject, University
+
+
+CATALOG_MODELS = [Subject, University, Program, CareerPath]
+
+
+def catalog_changed(sender, **kwargs):
+    invalidate_catalog()
+
+
+for model in CATALOG_MODELS:
+    post_save.connect(catalog_changed, sender=model, dispatch_uid=f'catalog_save_{model.__name__}')
+    post_delete.connect(catalog_changed, sender=model, dispatch_uid=f'catalog_delete_{model.__name__}')
+
+for through in [Program.subjects_required.through, CareerPath.related_programs.through]:
+    m2m_changed.connect(catalog_changed, sender=through, dispatch_uid=f'catalog_m2m_{through.__name__}')
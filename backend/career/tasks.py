@@ -0,0 +1,14 @@
+"""Background tasks of the career app (registered with the tasks app)."""
+
+from tasks.registry import task
+from .models import QuizResult
+from .scoring import QuizScorer
+
+
+@task(name='career.generate_recommendations')
+def generate_recommendations(result_id):
+    """Regenerate the user's career recommendations from a stored quiz result."""
+    result = QuizResult.objects.select_related('quiz', 'user').filter(pk=result_id).first()
+    if result is None:
+        return 0  # deleted before the worker got to it
+    return len(QuizScorer(result.quiz).recommend(result.user, result.answers))
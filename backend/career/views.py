@@ -1,6 +1,7 @@
 from rest_framework import generics, permissions, status
 from rest_framework.views import APIView
 from rest_framework.response import Response
+from django.db import transaction
 from django.shortcuts import get_object_or_404
 
 from .models import (
@@ -13,10 +14,14 @@ from .serializers import (
     RecommendationSerializer, CareerQuizListSerializer, CareerQuizDetailSerializer,
     QuizSubmissionSerializer, QuizResultSerializer
 )
+from .catalog import CatalogCacheMixin
+from .scoring import QuizScorer
+from .tasks import generate_recommendations
 from utils.permissions import IsStudent
+from utils.prefetch import PrefetchPlanMixin, apply_prefetch_plan
 
 
-class SubjectListView(generics.ListAPIView):
+class SubjectListView(CatalogCacheMixin, PrefetchPlanMixin, generics.ListAPIView):
     queryset = Subject.objects.all()
     serializer_class = SubjectSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -29,13 +34,13 @@ class SubjectListView(generics.ListAPIView):
         return queryset
 
 
-class SubjectDetailView(generics.RetrieveAPIView):
+class SubjectDetailView(CatalogCacheMixin, PrefetchPlanMixin, generics.RetrieveAPIView):
     queryset = Subject.objects.all()
     serializer_class = SubjectSerializer
     permission_classes = [permissions.IsAuthenticated]
 
 
-class UniversityListView(generics.ListAPIView):
+class UniversityListView(CatalogCacheMixin, PrefetchPlanMixin, generics.ListAPIView):
     queryset = University.objects.all()
     serializer_class = UniversitySerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -48,13 +53,13 @@ class UniversityListView(generics.ListAPIView):
         return queryset
 
 
-class UniversityDetailView(generics.RetrieveAPIView):
+class UniversityDetailView(CatalogCacheMixin, PrefetchPlanMixin, generics.RetrieveAPIView):
     queryset = University.objects.all()
     serializer_class = UniversitySerializer
     permission_classes = [permissions.IsAuthenticated]
 
 
-class ProgramListView(generics.ListAPIView):
+class ProgramListView(CatalogCacheMixin, PrefetchPlanMixin, generics.ListAPIView):
     queryset = Program.objects.all()
     serializer_class = ProgramListSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -72,13 +77,13 @@ class ProgramListView(generics.ListAPIView):
         return queryset
 
 
-class ProgramDetailView(generics.RetrieveAPIView):
+class ProgramDetailView(CatalogCacheMixin, PrefetchPlanMixin, generics.RetrieveAPIView):
     queryset = Program.objects.all()
     serializer_class = ProgramDetailSerializer
     permission_classes = [permissions.IsAuthenticated]
 
 
-class CareerPathListView(generics.ListAPIView):
+class CareerPathListView(CatalogCacheMixin, PrefetchPlanMixin, generics.ListAPIView):
     queryset = CareerPath.objects.all()
     serializer_class = CareerPathListSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -96,35 +101,35 @@ class CareerPathListView(generics.ListAPIView):
         return queryset
 
 
-class CareerPathDetailView(generics.RetrieveAPIView):
+class CareerPathDetailView(CatalogCacheMixin, PrefetchPlanMixin, generics.RetrieveAPIView):
     queryset = CareerPath.objects.all()
     serializer_class = CareerPathDetailSerializer
     permission_classes = [permissions.IsAuthenticated]
 
 
-class RecommendationListView(generics.ListAPIView):
+class RecommendationListView(PrefetchPlanMixin, generics.ListAPIView):
     serializer_class = RecommendationSerializer
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
-        return Recommendation.objects.filter(user=self.request.user)
+        return Recommendation.objects.filter(user_id=self.request.user.pk)
 
 
-class RecommendationDetailView(generics.RetrieveAPIView):
+class RecommendationDetailView(PrefetchPlanMixin, generics.RetrieveAPIView):
     serializer_class = RecommendationSerializer
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
-        return Recommendation.objects.filter(user=self.request.user)
+        return Recommendation.objects.filter(user_id=self.request.user.pk)
 
 
-class CareerQuizListView(generics.ListAPIView):
+class CareerQuizListView(PrefetchPlanMixin, generics.ListAPIView):
     queryset = CareerQuiz.objects.all()
     serializer_class = CareerQuizListSerializer
     permission_classes = [permissions.IsAuthenticated]
 
 
-class CareerQuizDetailView(generics.RetrieveAPIView):
+class CareerQuizDetailView(PrefetchPlanMixin, generics.RetrieveAPIView):
     queryset = CareerQuiz.objects.all()
     serializer_class = CareerQuizDetailSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -140,77 +145,30 @@ class SubmitQuizView(APIView):
         if serializer.is_valid():
             answers = serializer.validated_data['answers']
             
-            # Process quiz answers to calculate traits and scores
-            # This is a simplified implementation
-            traits = {
-                'analytical': 0,
-                'creative': 0,
-                'social': 0,
-                'practical': 0,
-                'leadership': 0
-            }
-            
-            # Process each answer and map to traits
-            for question_id, option_id in answers.items():
-                try:
-                    option = QuizOption.objects.get(id=option_id)
-                    option_traits = option.career_traits.split(',')
-                    
-                    for trait in option_traits:
-                        trait = trait.strip().lower()
-                        if trait in traits:
-                            traits[trait] += 1
-                except QuizOption.DoesNotExist:
-                    pass
-            
-            # Create or update quiz result
-            result, created = QuizResult.objects.update_or_create(
-                user=request.user,
-                quiz=quiz,
-                defaults={
-                    'answers': answers,
-                    'score': traits
-                }
-            )
-            
-            # Generate career recommendations based on quiz results
-            # Find careers that match the top traits
-            dominant_traits = sorted(traits.items(), key=lambda x: x[1], reverse=True)[:2]
-            dominant_trait_names = [t[0] for t in dominant_traits]
-            
-            # This would be a more sophisticated algorithm in production
-            # For now, we'll create some basic recommendations
-            for career in CareerPath.objects.all()[:5]:  # Limit to 5 for demo
-                # In production, this would use a proper matching algorithm
-                # Here we're just creating sample recommendations
-                score = float(50 + (traits.get('analytical', 0) * 5))  # Sample score calculation
-                Recommendation.objects.update_or_create(
-                    user=request.user,
-                    career_path=career,
-                    defaults={
-                        'score': min(score, 100.0),  # Cap at 100%
-                        'reasoning': f"Based on your quiz results, you have strong {', '.join(dominant_trait_names)} traits which align well with this career."
-                    }
-                )
+            # Store the result now; scoring every career path and replacing
+            # the user's recommendations happens in the background
+            with transaction.atomic():
+                result = QuizScorer(quiz).record(request.user, answers)
+                generate_recommendations.delay(result.pk)
             
             return Response(QuizResultSerializer(result).data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class QuizResultListView(generics.ListAPIView):
+class QuizResultListView(PrefetchPlanMixin, generics.ListAPIView):
     serializer_class = QuizResultSerializer
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
-        return QuizResult.objects.filter(user=self.request.user)
+        return QuizResult.objects.filter(user_id=self.request.user.pk)
 
 
-class QuizResultDetailView(generics.RetrieveAPIView):
+class QuizResultDetailView(PrefetchPlanMixin, generics.RetrieveAPIView):
     serializer_class = QuizResultSerializer
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
-        return QuizResult.objects.filter(user=self.request.user)
+        return QuizResult.objects.filter(user_id=self.request.user.pk)
 
 
 class GetOLevelRecommendationsView(APIView):
@@ -261,7 +219,10 @@ class GetALevelRecommendationsView(APIView):
             # Logic to recommend programs based on A Level subjects
             # Find programs that match the subjects
             # This would be a more sophisticated algorithm in production
-            recommended_programs = Program.objects.filter(subjects_required__in=a_level_subjects).distinct()[:10]
+            recommended_programs = apply_prefetch_plan(
+                Program.objects.filter(subjects_required__in=a_level_subjects).distinct(),
+                ProgramListSerializer
+            )[:10]
             
             return Response({
                 'programs': ProgramListSerializer(recommended_programs, many=True).data,
@@ -306,7 +267,7 @@ class GetCareerRecommendationsView(APIView):
     def get(self, request):
         try:
             # Get user's quiz results
-            quiz_results = QuizResult.objects.filter(user=request.user).order_by('-completed_at').first()
+            quiz_results = QuizResult.objects.filter(user_id=request.user.pk).order_by('-completed_at').first()
             
             if not quiz_results:
                 return Response({
@@ -315,7 +276,10 @@ class GetCareerRecommendationsView(APIView):
                 })
             
             # Get user's recommendations
-            recommendations = Recommendation.objects.filter(user=request.user).order_by('-score')
+            recommendations = apply_prefetch_plan(
+                Recommendation.objects.filter(user_id=request.user.pk).order_by('-score'),
+                RecommendationSerializer
+            )
             
             return Response({
                 'message': 'Career recommendations based on your profile and quiz results',
@@ -0,0 +1,14 @@
+"""
+ASGI config for NeXTStep platform.
+
+Required for the server-sent event stream (core.views.EventStreamView),
+e.g. `uvicorn config.asgi:application`.
+"""
+
+import os
+
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+application = get_asgi_application()
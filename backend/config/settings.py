@@ -38,10 +38,13 @@ INSTALLED_APPS = [
     'career',
     'jobs',
     'learning',
+    'tasks',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'utils.jsonlog.RequestLoggingMiddleware',
+    'utils.profiling.QueryProfilerMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -70,6 +73,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'config.wsgi.application'
+ASGI_APPLICATION = 'config.asgi.application'
 
 # Database
 DATABASES = {
@@ -79,6 +83,28 @@ DATABASES = {
     }
 }
 
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'nextstep-default',
+    },
+    # Auth versions and revoked token IDs (see utils.tokens). Local stand-in:
+    # use a cache shared by all processes (e.g. django.core.cache.backends.
+    # redis.RedisCache) in production so revocations apply everywhere
+    'tokens': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'nextstep-tokens',
+        'OPTIONS': {'MAX_ENTRIES': 100000},
+    },
+    # Rate limit token buckets (see utils.throttling); shared in production
+    # too, so every process draws from the same buckets
+    'throttle': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'nextstep-throttle',
+        'OPTIONS': {'MAX_ENTRIES': 100000},
+    },
+}
+
 # Custom user model
 AUTH_USER_MODEL = 'core.CustomUser'
 
@@ -87,6 +113,49 @@ AUTHENTICATION_BACKENDS = [
 ]
 
 
+# Password hashing. The first hasher hashes new passwords; hashes made by the
+# others (or with other cost settings) are upgraded on the next login.
+# PASSWORD_HASHER=argon2 prefers Argon2 (requires argon2-cffi)
+PASSWORD_HASHERS = [
+    'utils.hashers.TunedScryptPasswordHasher',
+    'utils.hashers.TunedArgon2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+]
+if os.environ.get('PASSWORD_HASHER') == 'argon2':
+    PASSWORD_HASHERS.insert(0, PASSWORD_HASHERS.pop(1))
+
+PASSWORD_HASHING = {
+    'SCRYPT': {'WORK_FACTOR': 2 ** 14, 'BLOCK_SIZE': 8, 'PARALLELISM': 1},
+    'ARGON2': {'TIME_COST': 2, 'MEMORY_COST': 65536, 'PARALLELISM': 1},
+}
+
+# Logins verify passwords on a bounded pool; beyond WORKERS + QUEUE
+# concurrent attempts the endpoint answers 503 (see core.login)
+LOGIN_POOL = {
+    'WORKERS': int(os.environ.get('LOGIN_POOL_WORKERS', os.cpu_count() or 1)),
+    'QUEUE': int(os.environ.get('LOGIN_POOL_QUEUE', 2 * (os.cpu_count() or 1))),
+    'TIMEOUT': 10,
+}
+
+# Rate limits and concurrency caps for auth and search endpoints
+THROTTLING = {
+    'ENABLED': os.environ.get('THROTTLING', 'True') == 'True',
+    'CACHE': 'throttle',
+    'RATES': {
+        # 'account' counts attempts per email from each client address
+        'login': {'ip': '20/min', 'account': '30/hour', 'endpoint': '1200/min'},
+        'register': {'ip': '5/hour', 'endpoint': '300/min'},
+        'job_search': {'user': '60/min', 'ip': '120/min'},
+        'resource_search': {'user': '60/min', 'ip': '120/min'},
+    },
+    'CONCURRENCY': {
+        'auth': int(os.environ.get('AUTH_CONCURRENCY', 2 * (os.cpu_count() or 1))),
+        'search': int(os.environ.get('SEARCH_CONCURRENCY', 8)),
+    },
+    'RETRY_AFTER': 1,
+}
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -119,13 +188,15 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'utils.tokens.StatelessJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
-    'PAGE_SIZE': 10
+    'PAGE_SIZE': 10,
+    # Reverse proxies in front of the app; X-Forwarded-For is ignored at 0
+    'NUM_PROXIES': int(os.environ.get('NUM_PROXIES', 0)),
 }
 
 # JWT Settings
@@ -154,6 +225,16 @@ SIMPLE_JWT = {
     'SLIDING_TOKEN_REFRESH_EXP_CLAIM': 'refresh_exp',
     'SLIDING_TOKEN_LIFETIME': timedelta(minutes=5),
     'SLIDING_TOKEN_REFRESH_LIFETIME': timedelta(days=1),
+    'TOKEN_REFRESH_SERIALIZER': 'utils.tokens.TokenRefreshSerializer',
+}
+
+# Access tokens carry role/approved/institution claims; the user's
+# auth_version is re-checked through the cache at most this often, and
+# revoked token IDs are kept in the same cache
+AUTH_TOKENS = {
+    'CACHE': 'tokens',
+    'VERSION_CACHE_TIMEOUT': 30,
+    'PURGE_INTERVAL': 3600,
 }
 
 # CORS settings
@@ -170,3 +251,96 @@ SWAGGER_SETTINGS = {
         }
     }
 }
+
+# Job search settings
+JOB_SEARCH = {
+    'BACKEND': 'jobs.search.InvertedIndexBackend',
+    'FIELD_BOOSTS': {'title': 3.0, 'skills': 2.0, 'company': 1.5, 'description': 1.0},
+    'PREFIX_MATCHING': True,
+    'MAX_RESULTS': 1000,
+}
+
+# Minimum cosine similarity stored in the job/resume match index
+SKILL_MATCH_MIN_SCORE = 0.1
+
+# Seconds a serialized catalog payload (subjects, universities, programs,
+# career paths) stays cached; any catalog change invalidates it immediately
+CAREER_CATALOG_CACHE_TIMEOUT = 3600
+
+# Streaming CSV/NDJSON exports; background exports are written to DIRECTORY
+EXPORTS = {
+    'CHUNK_SIZE': 2000,
+    'DIRECTORY': os.path.join(BASE_DIR, 'exports'),
+}
+
+# Number of careers kept per user after a quiz submission
+CAREER_RECOMMENDATION_LIMIT = 5
+
+# Server-sent event delivery of notifications and messages (core.realtime)
+REALTIME = {
+    'BROKER': 'core.realtime.InMemoryBroker',
+    'HEARTBEAT_SECONDS': 15,
+    'REPLAY_LIMIT': 100,
+}
+
+# Seconds a user's unread notification count is served from cache
+NOTIFICATION_UNREAD_CACHE_TIMEOUT = 300
+
+# Background tasks (tasks app). Start workers with `manage.py run_tasks`;
+# TASKS_EAGER=True runs tasks in-process after commit instead
+TASKS = {
+    'EAGER': os.environ.get('TASKS_EAGER', 'False') == 'True',
+    'MAX_ATTEMPTS': 3,
+    'BACKOFF_BASE': 5,
+    'BACKOFF_MAX': 600,
+    'LEASE_SECONDS': 900,
+}
+
+# Bulk notification delivery (core.fanout): recipients per bulk insert and
+# the pause between inserts that keeps fan-out from crowding out requests
+NOTIFICATION_FANOUT = {
+    'CHUNK_SIZE': 500,
+    'CHUNK_DELAY': 0.05,
+}
+
+# UINs reserved per round trip to the per-year sequence (see utils.uin_generator)
+UIN_BLOCK_SIZE = 100
+
+# Query profiling (per-request query counts, DB time and N+1 detection)
+QUERY_PROFILER = {
+    'ENABLED': os.environ.get('QUERY_PROFILER', str(DEBUG)) == 'True',
+    'N_PLUS_ONE_THRESHOLD': 5,
+    # Per-view query budgets keyed by URL name, e.g. {'course_list': 5}
+    'BUDGETS': {},
+    'DEFAULT_BUDGET': None,
+    # Raise QueryBudgetExceeded instead of logging (useful in tests)
+    'RAISE_ON_BUDGET': os.environ.get('QUERY_BUDGET_STRICT', 'False') == 'True',
+}
+
+# Structured logging: JSON lines on stdout, written by a background thread
+# from a bounded queue (see utils.jsonlog)
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'json': {
+            'class': 'utils.jsonlog.QueueingHandler',
+            'stream': 'ext://sys.stdout',
+            'maxsize': 10000,
+        },
+    },
+    'loggers': {
+        'api.requests': {'handlers': ['json'], 'level': 'INFO', 'propagate': False},
+        'core': {'handlers': ['json'], 'level': os.environ.get('CORE_LOG_LEVEL', 'INFO'), 'propagate': False},
+        'utils': {'handlers': ['json'], 'level': 'WARNING', 'propagate': False},
+    },
+}
+
+# One request record per sampled request; 5xx and slow requests always
+REQUEST_LOGGING = {
+    'ENABLED': os.environ.get('REQUEST_LOGGING', 'True') == 'True',
+    'DEFAULT_SAMPLE_RATE': float(os.environ.get('REQUEST_LOG_SAMPLE_RATE', '0.1')),
+    # Per URL name, e.g. auth endpoints in full, the event stream never
+    'SAMPLE_RATES': {'login': 1.0, 'register': 1.0, 'event_stream': 0.0},
+    'SLOW_REQUEST_MS': 1000,
+}
@@ -1,6 +1,9 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
-from .models import CustomUser, Notification, Message, SavedItem, AdminLog, InstitutionApproval, SystemSetting
+from .models import (
+    CustomUser, Notification, NotificationFanout, Message, SavedItem, AdminLog, InstitutionApproval, SystemSetting,
+    RevokedToken,
+)
 
 class CustomUserAdmin(UserAdmin):
     list_display = ('email', 'full_name', 'uin', 'role', 'institution', 'is_active', 'date_joined')
@@ -28,6 +31,13 @@ class NotificationAdmin(admin.ModelAdmin):
     search_fields = ('user__email', 'title', 'message')
 
 
+class NotificationFanoutAdmin(admin.ModelAdmin):
+    list_display = ('title', 'audience_type', 'audience_id', 'status', 'sent', 'total', 'created_at')
+    list_filter = ('audience_type', 'status', 'created_at')
+    search_fields = ('title', 'audience_id', 'created_by__email')
+    readonly_fields = ('status', 'total', 'sent', 'last_user_id', 'error', 'started_at', 'finished_at')
+
+
 class MessageAdmin(admin.ModelAdmin):
     list_display = ('sender', 'recipient', 'subject', 'is_read', 'sent_at')
     list_filter = ('is_read', 'sent_at')
@@ -57,10 +67,19 @@ class SystemSettingAdmin(admin.ModelAdmin):
     search_fields = ('key', 'value')
 
 
+class RevokedTokenAdmin(admin.ModelAdmin):
+    list_display = ('jti', 'user', 'token_type', 'reason', 'revoked_at', 'expires_at')
+    list_filter = ('token_type', 'reason', 'revoked_at')
+    search_fields = ('jti', 'user__email')
+    readonly_fields = ('jti', 'user', 'token_type', 'reason', 'revoked_at', 'expires_at')
+
+
 admin.site.register(CustomUser, CustomUserAdmin)
 admin.site.register(Notification, NotificationAdmin)
+admin.site.register(NotificationFanout, NotificationFanoutAdmin)
 admin.site.register(Message, MessageAdmin)
 admin.site.register(SavedItem, SavedItemAdmin)
 admin.site.register(AdminLog, AdminLogAdmin)
 admin.site.register(InstitutionApproval, InstitutionApprovalAdmin)
 admin.site.register(SystemSetting, SystemSettingAdmin)
+admin.site.register(RevokedToken, RevokedTokenAdmin)
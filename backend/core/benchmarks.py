@@ -0,0 +1,280 @@
+"""
+Index benchmark for the hot list views.
+
+seed_dataset() fills the current database with a synthetic but realistically
+shaped dataset (bulk inserted, timestamps spread over a year). run_suite()
+then requests every list view in LIST_VIEW_BENCHMARKS as a representative
+user, timing it and capturing the EXPLAIN plan of every SELECT it issued.
+The management command `benchmark_indexes` runs the suite twice against a
+throwaway test database: once with the access-pattern indexes dropped and
+once with them in place.
+"""
+
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.db import connection
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from career.catalog import bump_catalog_version
+from career.models import CareerPath, Recommendation, Subject
+from jobs.models import Job, JobApplication
+from learning.models import LearningResource, LearningTrack, TrackProgress, UserProgress
+from lms.models import Assignment, Course, Submission
+from .models import CustomUser, Message, Notification
+from .synthetic import COUNTRIES, explicit_timestamps, timestamp_fields
+
+
+# Models whose Meta.indexes are dropped for the "before" run
+INDEXED_MODELS = [
+    Notification, Message, Job, JobApplication, Submission,
+    UserProgress, TrackProgress, Subject, Recommendation,
+]
+
+def _bulk(model, objs):
+    return model.objects.bulk_create(objs, batch_size=1000)
+
+
+def seed_dataset(scale=1, seed=0):
+    """
+    Insert a dataset proportional to `scale` and return the users and
+    objects the benchmark requests are made as.
+    """
+    rng = random.Random(seed)
+    now = timezone.now()
+    password = make_password('benchmark')
+
+    def past(days=365):
+        return now - timedelta(seconds=rng.randrange(days * 86400))
+
+    counts = {
+        'students': 1000 * scale,
+        'lecturers': 25 * scale,
+        'employers': 50 * scale,
+        'courses': 50 * scale,
+        'jobs': 1000 * scale,
+        'resources': 500 * scale,
+        'tracks': 50 * scale,
+        'subjects': 300 * scale,
+        'careers': 100,
+    }
+
+    def users(role, count):
+        return [
+            CustomUser(
+                email=f"{role.lower()}{i}@bench.nextstep", full_name=f"{role.title()} {i}",
+                role=role, password=password, approved=True,
+                date_joined=past(),
+            )
+            for i in range(count)
+        ]
+
+    students = _bulk(CustomUser, users('TERTIARY', counts['students']))
+    lecturers = _bulk(CustomUser, users('LECTURER', counts['lecturers']))
+    employers = _bulk(CustomUser, users('EMPLOYER', counts['employers']))
+    everyone = students + lecturers + employers
+
+    with explicit_timestamps(*timestamp_fields(Notification, 'created_at')):
+        _bulk(Notification, [
+            Notification(
+                user=user, title='Update', message='Something happened', type=rng.choice(['system', 'message', 'job_match']),
+                is_read=rng.random() < 0.7, created_at=past(),
+            )
+            for user in everyone for _ in range(40)
+        ])
+
+    with explicit_timestamps(*timestamp_fields(Message, 'sent_at')):
+        _bulk(Message, [
+            Message(
+                sender=rng.choice(everyone), recipient=user, subject='Hello', content='Message body',
+                is_read=rng.random() < 0.5, sent_at=past(),
+            )
+            for user in everyone for _ in range(10)
+        ])
+
+    courses = _bulk(Course, [
+        Course(
+            title=f"Course {i}", code=f"BENCH{i:05d}", description='Course description', institution='Bench University',
+            instructor=lecturers[i % len(lecturers)], semester='1',
+            start_date=(now - timedelta(days=90)).date(), end_date=(now + timedelta(days=90)).date(),
+        )
+        for i in range(counts['courses'])
+    ])
+    assignments = _bulk(Assignment, [
+        Assignment(course=course, title=f"Assignment {n}", description='Do the work', due_date=past(90), total_points=100)
+        for course in courses for n in range(5)
+    ])
+    with explicit_timestamps(*timestamp_fields(Submission, 'submitted_at')):
+        _bulk(Submission, [
+            Submission(
+                assignment=assignment, student=student, content='Answer',
+                status=rng.choice(['submitted', 'graded', 'late']), submitted_at=past(90),
+            )
+            for assignment in assignments for student in rng.sample(students, min(40, len(students)))
+        ])
+
+    with explicit_timestamps(*timestamp_fields(Job, 'created_at', 'updated_at')):
+        jobs = _bulk(Job, [
+            Job(
+                title=f"Job {i}", company=f"Company {i % 200}", location='City', country=rng.choice(COUNTRIES),
+                description='Job description', requirements='Requirements', responsibilities='Responsibilities',
+                job_type=rng.choice([choice for choice, _ in Job.JOB_TYPE_CHOICES]), skills='python, sql',
+                application_deadline=(now + timedelta(days=30)).date(),
+                status=rng.choices(['OPEN', 'CLOSED', 'FILLED', 'DRAFT'], weights=[6, 2, 1, 1])[0],
+                posted_by=employers[i % len(employers)], created_at=past(), updated_at=now,
+            )
+            for i in range(counts['jobs'])
+        ])
+    with explicit_timestamps(*timestamp_fields(JobApplication, 'applied_at', 'updated_at')):
+        _bulk(JobApplication, [
+            JobApplication(
+                job=job, applicant=student, cover_letter='Cover letter',
+                status=rng.choice([choice for choice, _ in JobApplication.STATUS_CHOICES]),
+                applied_at=past(), updated_at=now,
+            )
+            for student in students for job in rng.sample(jobs, min(10, len(jobs)))
+        ])
+
+    with explicit_timestamps(*timestamp_fields(LearningResource, 'created_at', 'updated_at')):
+        resources = _bulk(LearningResource, [
+            LearningResource(
+                title=f"Resource {i}", description='Resource description', provider='INTERNAL', resource_type='VIDEO',
+                url=f"https://example.com/resources/{i}", duration='1 hour', difficulty_level='BEGINNER',
+                skills='python', created_at=past(), updated_at=now,
+            )
+            for i in range(counts['resources'])
+        ])
+    _bulk(UserProgress, [
+        UserProgress(user=student, resource=resource, status='IN_PROGRESS', last_activity=past())
+        for student in students for resource in rng.sample(resources, min(20, len(resources)))
+    ])
+    with explicit_timestamps(*timestamp_fields(LearningTrack, 'created_at', 'updated_at')):
+        tracks = _bulk(LearningTrack, [
+            LearningTrack(
+                title=f"Track {i}", description='Track description', created_by=lecturers[i % len(lecturers)],
+                difficulty_level='BEGINNER', skills_gained='python', estimated_completion_time='4 weeks',
+                created_at=past(), updated_at=now,
+            )
+            for i in range(counts['tracks'])
+        ])
+    _bulk(TrackProgress, [
+        TrackProgress(user=student, track=track, completion_percentage=rng.randrange(100), last_activity=past())
+        for student in students for track in rng.sample(tracks, min(5, len(tracks)))
+    ])
+
+    _bulk(Subject, [
+        Subject(
+            name=f"Subject {i}", subject_code=f"SUB{i:05d}", description='Subject description',
+            level=rng.choice([choice for choice, _ in Subject.LEVEL_CHOICES]),
+        )
+        for i in range(counts['subjects'])
+    ])
+    careers = _bulk(CareerPath, [
+        CareerPath(
+            title=f"Career {i}", description='Career description', skills_required='python', sector='Technology',
+            average_salary='$1000', job_outlook='Good',
+        )
+        for i in range(counts['careers'])
+    ])
+    _bulk(Recommendation, [
+        Recommendation(user=student, career_path=career, score=rng.uniform(0, 100), reasoning='Good fit')
+        for student in students for career in rng.sample(careers, min(5, len(careers)))
+    ])
+
+    return {
+        'student': students[0],
+        'lecturer': courses[0].instructor,
+        'employer': employers[0],
+        'assignment': assignments[0],
+    }
+
+
+# (name, user key, url builder)
+LIST_VIEW_BENCHMARKS = [
+    ('notifications', 'student', lambda ctx: '/api/auth/notifications/'),
+    ('messages', 'student', lambda ctx: '/api/auth/messages/'),
+    ('jobs', 'student', lambda ctx: '/api/jobs/jobs/?job_type=FULL_TIME&country=Zimbabwe'),
+    ('employer_applications', 'employer', lambda ctx: '/api/jobs/employer/applications/?status=APPLIED'),
+    ('applicant_applications', 'student', lambda ctx: '/api/jobs/applicant/applications/'),
+    ('submissions', 'lecturer', lambda ctx: f"/api/lms/assignments/{ctx['assignment'].pk}/submissions/"),
+    ('resource_progress', 'student', lambda ctx: '/api/learning/progress/resources/'),
+    ('track_progress', 'student', lambda ctx: '/api/learning/progress/tracks/'),
+    ('subjects', 'student', lambda ctx: '/api/career/subjects/?level=A_LEVEL'),
+    ('recommendations', 'student', lambda ctx: '/api/career/recommendations/'),
+]
+
+
+class StatementCapture:
+    """Execute wrapper that keeps the raw SQL and parameters of each statement."""
+
+    def __init__(self):
+        self.statements = []
+
+    def __call__(self, execute, sql, params, many, context):
+        self.statements.append((sql, params))
+        return execute(sql, params, many, context)
+
+
+def explain(sql, params):
+    prefix = connection.ops.explain_query_prefix()
+    with connection.cursor() as cursor:
+        cursor.execute(f"{prefix} {sql}", params)
+        return [str(row[-1]) for row in cursor.fetchall()]
+
+
+def analyze():
+    """Refresh planner statistics so both runs see the same data distribution."""
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+
+
+def set_indexes(enabled):
+    with connection.schema_editor() as schema_editor:
+        for model in INDEXED_MODELS:
+            for index in model._meta.indexes:
+                if enabled:
+                    schema_editor.add_index(model, index)
+                else:
+                    schema_editor.remove_index(model, index)
+    analyze()
+
+
+def run_suite(context, repeat=20):
+    """Time every list view and capture the plans of the queries it ran."""
+    client = APIClient()
+    results = {}
+    for name, user_key, build_url in LIST_VIEW_BENCHMARKS:
+        client.force_authenticate(context[user_key])
+        url = build_url(context)
+
+        # Every request misses the catalog cache, so catalog views run their queries
+        bump_catalog_version()
+        capture = StatementCapture()
+        with connection.execute_wrapper(capture):
+            response = client.get(url)
+        if response.status_code != 200:
+            raise RuntimeError(f"{name}: GET {url} returned {response.status_code}")
+
+        timings = []
+        for _ in range(repeat):
+            bump_catalog_version()
+            start = time.perf_counter()
+            client.get(url)
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+
+        results[name] = {
+            'url': url,
+            'queries': len(capture.statements),
+            'median_ms': round(statistics.median(timings), 3),
+            'p95_ms': round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 3),
+            'plans': [
+                {'sql': sql, 'plan': explain(sql, params)}
+                for sql, params in capture.statements if sql.lstrip().upper().startswith('SELECT')
+            ],
+        }
+    return results
@@ -0,0 +1,27 @@
+"""User listing exports (see utils.export)."""
+
+from utils.export import Export, register
+from .models import CustomUser, UserRole
+
+
+@register
+class UserExport(Export):
+    name = 'core.users'
+    columns = [
+        ('uin', 'UIN'), ('full_name', 'Full name'), ('email', 'Email'), ('phone', 'Phone'),
+        ('role', 'Role'), ('institution', 'Institution'), ('school', 'School'),
+        ('university', 'University'), ('program', 'Program'), ('company', 'Company'),
+        ('is_active', 'Active'), ('approved', 'Approved'), ('date_joined', 'Joined'),
+    ]
+    filter_params = ['role', 'institution']
+    ordering = ('date_joined', 'pk')
+
+    def has_permission(self):
+        return self.user.role in (UserRole.INSTITUTION_ADMIN, UserRole.MINISTRY_ADMIN, UserRole.SUPERUSER)
+
+    def get_queryset(self):
+        users = CustomUser.objects.filter(**self.params)
+        # Institution admins only see their own institution
+        if self.user.role == UserRole.INSTITUTION_ADMIN:
+            users = users.filter(institution=self.user.institution)
+        return users
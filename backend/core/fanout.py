@@ -0,0 +1,198 @@
+"""
+Bulk notification fan-out.
+
+A NotificationFanout row describes one notification sent to an audience
+(a course's students, a job's applicants, a role or an institution). The
+worker walks the audience in primary-key order and inserts one chunk of
+Notifications per short transaction with bulk_create, bumping the unread
+counters and progress in the same transaction and pausing between chunks so
+a large announcement never holds locks or saturates the primary database.
+
+Delivery runs as a background task (core.deliver_fanout). Since
+bulk_create bypasses the Notification signals, counters and server push are
+handled here explicitly. The last delivered user ID is recorded with every
+chunk, so a retried or interrupted fan-out resumes where it stopped.
+"""
+
+import time
+import uuid
+from functools import partial
+
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from tasks.registry import task
+from .models import CustomUser, Notification, NotificationFanout, UserRole
+from .notifications import adjust_unread_many
+from .realtime import notification_event, publish_on_commit
+
+
+DEFAULT_SETTINGS = {
+    'CHUNK_SIZE': 500,
+    # Seconds to sleep between chunks
+    'CHUNK_DELAY': 0.05,
+}
+
+
+def get_fanout_settings():
+    return {**DEFAULT_SETTINGS, **getattr(settings, 'NOTIFICATION_FANOUT', {})}
+
+
+# Audiences
+
+def _course_audience(course_id):
+    return CustomUser.objects.filter(enrolled_courses=course_id)
+
+
+def _job_audience(job_id):
+    return CustomUser.objects.filter(job_applications__job=job_id)
+
+
+def _role_audience(role):
+    return CustomUser.objects.filter(role=role)
+
+
+def _institution_audience(institution):
+    return CustomUser.objects.filter(institution=institution)
+
+
+AUDIENCES = {
+    'course': _course_audience,
+    'job': _job_audience,
+    'role': _role_audience,
+    'institution': _institution_audience,
+}
+
+
+def audience_queryset(audience_type, audience_id):
+    return AUDIENCES[audience_type](audience_id).filter(is_active=True)
+
+
+def validate_audience(audience_type, audience_id):
+    """Return an error message for an audience that cannot exist, else None."""
+    if audience_type in ('course', 'job'):
+        try:
+            uuid.UUID(str(audience_id))
+        except ValueError:
+            return f"A {audience_type} audience needs a {audience_type} ID."
+        model = apps.get_model('lms', 'Course') if audience_type == 'course' else apps.get_model('jobs', 'Job')
+        if not model.objects.filter(pk=audience_id).exists():
+            return f"No such {audience_type}."
+    elif audience_type == 'role' and audience_id not in UserRole.values:
+        return "Unknown role."
+    return None
+
+
+def can_send(user, audience_type, audience_id):
+    """Whether `user` may notify the audience."""
+    if user.role in (UserRole.SUPERUSER, UserRole.MINISTRY_ADMIN):
+        return True
+    if audience_type == 'course':
+        Course = apps.get_model('lms', 'Course')
+        course = Course.objects.filter(pk=audience_id).values('instructor_id', 'institution').first()
+        return bool(course) and (
+            course['instructor_id'] == user.pk or
+            (user.role == UserRole.INSTITUTION_ADMIN and course['institution'] == user.institution)
+        )
+    if audience_type == 'job':
+        Job = apps.get_model('jobs', 'Job')
+        return Job.objects.filter(pk=audience_id, posted_by_id=user.pk).exists()
+    if audience_type == 'institution':
+        return user.role == UserRole.INSTITUTION_ADMIN and bool(user.institution) and audience_id == user.institution
+    return False
+
+
+# Delivery
+
+def deliver_notifications(user_ids, title, message, link=None, type='system'):
+    """
+    Create one Notification per user with a single bulk insert. bulk_create
+    skips the Notification signals, so unread counters and server push are
+    handled here. Returns the notifications.
+    """
+    user_ids = list(user_ids)
+    if not user_ids:
+        return []
+    with transaction.atomic():
+        notifications = Notification.objects.bulk_create([
+            Notification(user_id=user_id, title=title, message=message, link=link, type=type)
+            for user_id in user_ids
+        ])
+        adjust_unread_many(user_ids, 1)
+        for notification in notifications:
+            publish_on_commit(notification.user_id, partial(notification_event, notification))
+    return notifications
+
+
+def _deliver_chunk(fanout, user_ids):
+    with transaction.atomic():
+        deliver_notifications(user_ids, fanout.title, fanout.message, fanout.link, fanout.type)
+        NotificationFanout.objects.filter(pk=fanout.pk).update(
+            sent=F('sent') + len(user_ids), last_user_id=user_ids[-1]
+        )
+
+
+def run_fanout(fanout_id, resume=False):
+    """
+    Deliver a pending fan-out (or, with resume=True, continue a running or
+    failed one).
+
+    Returns False if the fan-out was already claimed by another worker.
+    """
+    claimable = ['pending', 'running', 'failed'] if resume else ['pending']
+    claimed = NotificationFanout.objects.filter(pk=fanout_id, status__in=claimable).update(
+        status='running', started_at=timezone.now(), error=''
+    )
+    if not claimed:
+        return False
+
+    fanout = NotificationFanout.objects.get(pk=fanout_id)
+    options = get_fanout_settings()
+    try:
+        audience = audience_queryset(fanout.audience_type, fanout.audience_id)
+        NotificationFanout.objects.filter(pk=fanout.pk).update(total=fanout.sent + (
+            audience.filter(pk__gt=fanout.last_user_id).count() if fanout.last_user_id else audience.count()
+        ))
+
+        last_user_id = fanout.last_user_id
+        while True:
+            chunk = audience.order_by('pk')
+            if last_user_id:
+                chunk = chunk.filter(pk__gt=last_user_id)
+            user_ids = list(chunk.values_list('pk', flat=True).distinct()[:options['CHUNK_SIZE']])
+            if not user_ids:
+                break
+            _deliver_chunk(fanout, user_ids)
+            last_user_id = user_ids[-1]
+            if len(user_ids) < options['CHUNK_SIZE']:
+                break
+            if options['CHUNK_DELAY']:
+                time.sleep(options['CHUNK_DELAY'])
+    except Exception as exc:
+        NotificationFanout.objects.filter(pk=fanout.pk).update(
+            status='failed', error=repr(exc), finished_at=timezone.now()
+        )
+        raise
+
+    NotificationFanout.objects.filter(pk=fanout.pk).update(status='completed', finished_at=timezone.now())
+    return True
+
+
+@task(name='core.deliver_fanout', max_attempts=5)
+def deliver_fanout(fanout_id):
+    # Retries pick up after the last chunk that was delivered
+    run_fanout(fanout_id, resume=True)
+    return NotificationFanout.objects.values('status', 'sent', 'total').get(pk=fanout_id)
+
+
+def start_fanout(created_by, audience_type, audience_id, title, message, link=None, type='system'):
+    """Record a fan-out and queue its delivery."""
+    fanout = NotificationFanout.objects.create(
+        created_by=created_by, audience_type=audience_type, audience_id=audience_id,
+        title=title, message=message, link=link, type=type,
+    )
+    deliver_fanout.delay(fanout.pk)
+    return fanout
@@ -0,0 +1,163 @@
+"""
+Load benchmark harness.
+
+Replays a weighted mix of read-heavy API calls through the Django test
+client, authenticated with access tokens of users sampled from the current
+database (typically one filled by `generate_synthetic_data`), and reports
+latency percentiles and queries per endpoint. Reports can be saved as JSON and compared against
+a previous run to give every performance change a baseline.
+"""
+
+import random
+import statistics
+import time
+
+from rest_framework.test import APIClient
+
+from jobs.models import Job
+from learning.models import LearningResource
+from lms.models import Assignment, Course
+from utils.profiling import QueryRecorder
+from utils.tokens import tokens_for_user
+from utils.stats import percentile
+from .models import CustomUser, UserRole
+
+
+STUDENT_ROLES = [UserRole.O_LEVEL_STUDENT, UserRole.A_LEVEL_STUDENT, UserRole.TERTIARY_STUDENT]
+
+USER_GROUPS = {
+    'student': STUDENT_ROLES,
+    'tertiary': [UserRole.TERTIARY_STUDENT],
+    'lecturer': [UserRole.LECTURER],
+    'employer': [UserRole.EMPLOYER],
+    'any': [choice for choice, _ in UserRole.choices],
+}
+
+
+class Fixtures:
+    """Users and object IDs sampled once from the database for URL building."""
+
+    def __init__(self, rng, sample_size=200):
+        self.rng = rng
+        self.users = {}
+        for group, roles in USER_GROUPS.items():
+            self.users[group] = list(CustomUser.objects.filter(role__in=roles, is_active=True).order_by('?')[:sample_size])
+        self.ids = {
+            'course': self._sample(Course.objects.all(), sample_size),
+            'job': self._sample(Job.objects.filter(status='OPEN'), sample_size),
+            'resource': self._sample(LearningResource.objects.all(), sample_size),
+        }
+        # Lecturers only see submissions for their own courses
+        lecturer_ids = [user.pk for user in self.users['lecturer']]
+        self.lecturer_assignments = {}
+        for assignment_id, instructor_id in Assignment.objects.filter(
+            course__instructor_id__in=lecturer_ids
+        ).values_list('id', 'course__instructor_id')[:sample_size * 5]:
+            self.lecturer_assignments.setdefault(instructor_id, []).append(assignment_id)
+
+    def _sample(self, queryset, size):
+        return list(queryset.order_by('?').values_list('id', flat=True)[:size])
+
+    def user(self, group):
+        users = self.users[group]
+        return self.rng.choice(users) if users else None
+
+    def pick(self, kind):
+        ids = self.ids[kind]
+        return self.rng.choice(ids) if ids else None
+
+    def lecturer_assignment(self):
+        if not self.lecturer_assignments:
+            return None, None
+        instructor_id = self.rng.choice(list(self.lecturer_assignments))
+        user = next(user for user in self.users['lecturer'] if user.pk == instructor_id)
+        return user, self.rng.choice(self.lecturer_assignments[instructor_id])
+
+
+def _simple(group, url):
+    return lambda fixtures: (fixtures.user(group), url)
+
+
+def _detail(group, kind, pattern):
+    def build(fixtures):
+        object_id = fixtures.pick(kind)
+        return fixtures.user(group), pattern.format(object_id) if object_id else None
+    return build
+
+
+def _submissions(fixtures):
+    user, assignment_id = fixtures.lecturer_assignment()
+    return user, f"/api/lms/assignments/{assignment_id}/submissions/" if assignment_id else None
+
+
+# (name, weight, builder returning (user, url))
+API_MIX = [
+    ('notifications', 15, _simple('any', '/api/auth/notifications/')),
+    ('messages', 5, _simple('any', '/api/auth/messages/')),
+    ('course_list', 10, _simple('student', '/api/lms/courses/')),
+    ('course_detail', 8, _detail('student', 'course', '/api/lms/courses/{}/')),
+    ('submissions', 4, _submissions),
+    ('job_list', 12, _simple('tertiary', '/api/jobs/jobs/')),
+    ('job_search', 8, _simple('tertiary', '/api/jobs/jobs/search/?q=python')),
+    ('job_detail', 6, _detail('tertiary', 'job', '/api/jobs/jobs/{}/')),
+    ('applicant_applications', 5, _simple('tertiary', '/api/jobs/applicant/applications/')),
+    ('employer_applications', 5, _simple('employer', '/api/jobs/employer/applications/')),
+    ('resource_list', 8, _simple('student', '/api/learning/resources/')),
+    ('resource_detail', 4, _detail('student', 'resource', '/api/learning/resources/{}/')),
+    ('progress', 5, _simple('student', '/api/learning/progress/resources/')),
+    ('career_paths', 3, _simple('student', '/api/career/career-paths/')),
+    ('quiz_results', 2, _simple('student', '/api/career/quiz-results/')),
+]
+
+
+def run_load(requests=1000, seed=0, warmup=20, mix=None):
+    """Replay `requests` weighted calls and return per-endpoint statistics."""
+    rng = random.Random(seed)
+    mix = mix or API_MIX
+    fixtures = Fixtures(rng)
+    client = APIClient()
+    names = [name for name, _, _ in mix]
+    weights = [weight for _, weight, _ in mix]
+    builders = {name: build for name, _, build in mix}
+    samples = {name: {'latencies': [], 'queries': [], 'errors': 0, 'skipped': 0} for name in names}
+    # Real tokens, so authentication costs what it does in production
+    tokens = {}
+
+    for n in range(warmup + requests):
+        name = rng.choices(names, weights)[0]
+        user, url = builders[name](fixtures)
+        if user is None or url is None:
+            samples[name]['skipped'] += 1
+            continue
+        if user.pk not in tokens:
+            tokens[user.pk] = str(tokens_for_user(user).access_token)
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens[user.pk]}")
+
+        recorder = QueryRecorder()
+        start = time.perf_counter()
+        with recorder.record():
+            response = client.get(url)
+        elapsed = (time.perf_counter() - start) * 1000
+        if n < warmup:
+            continue
+
+        entry = samples[name]
+        if response.status_code >= 400:
+            entry['errors'] += 1
+        entry['latencies'].append(elapsed)
+        entry['queries'].append(recorder.count)
+
+    report = {}
+    for name, entry in samples.items():
+        latencies = sorted(entry['latencies'])
+        report[name] = {
+            'requests': len(latencies),
+            'errors': entry['errors'],
+            'skipped': entry['skipped'],
+            'p50_ms': round(percentile(latencies, 50), 3),
+            'p95_ms': round(percentile(latencies, 95), 3),
+            'p99_ms': round(percentile(latencies, 99), 3),
+            'avg_queries': round(statistics.mean(entry['queries']), 2) if entry['queries'] else 0,
+            'max_queries': max(entry['queries'], default=0),
+        }
+    return report
@@ -0,0 +1,89 @@
+"""
+Bounded password checking for the login endpoint.
+
+Password hashing is deliberately CPU-bound, so a burst of logins (exam
+results, a job fair) could occupy every worker thread and starve all other
+endpoints. Logins are therefore verified on a small dedicated thread pool:
+at most WORKERS hashes run at once and at most QUEUE more wait. Further
+attempts are rejected immediately with LoginThrottled (HTTP 503 with
+Retry-After) instead of piling up behind the hashing.
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+
+from django.conf import settings
+from django.contrib.auth import authenticate
+from django.db import close_old_connections
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+DEFAULT_SETTINGS = {
+    'WORKERS': os.cpu_count() or 1,
+    'QUEUE': 2 * (os.cpu_count() or 1),
+    # Seconds a request waits for its turn and its hash
+    'TIMEOUT': 10,
+    'RETRY_AFTER': 1,
+}
+
+
+def get_login_settings():
+    return {**DEFAULT_SETTINGS, **getattr(settings, 'LOGIN_POOL', {})}
+
+
+class LoginThrottled(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Too many logins in progress, try again shortly."
+    default_code = 'login_throttled'
+
+    def __init__(self, retry_after):
+        super().__init__()
+        self.wait = retry_after
+
+
+class LoginPool:
+    def __init__(self, workers, queue):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='login')
+        self.slots = threading.BoundedSemaphore(workers + queue)
+
+    def _run(self, func, args, kwargs):
+        close_old_connections()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            close_old_connections()
+
+    def submit(self, func, *args, **kwargs):
+        if not self.slots.acquire(blocking=False):
+            return None
+        future = self.executor.submit(self._run, func, args, kwargs)
+        future.add_done_callback(lambda _: self.slots.release())
+        return future
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_login_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            options = get_login_settings()
+            _pool = LoginPool(options['WORKERS'], options['QUEUE'])
+    return _pool
+
+
+def authenticate_bounded(email, password):
+    """authenticate() on the login pool; raises LoginThrottled when it is saturated."""
+    options = get_login_settings()
+    future = get_login_pool().submit(authenticate, username=email, password=password)
+    if future is None:
+        raise LoginThrottled(options['RETRY_AFTER'])
+    try:
+        return future.result(timeout=options['TIMEOUT'])
+    except FutureTimeout:
+        raise LoginThrottled(options['RETRY_AFTER'])
@@ -0,0 +1,55 @@
+import json
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from core.benchmarks import analyze, run_suite, seed_dataset, set_indexes
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway test database and compare list view latency and "
+        "query plans with and without the access-pattern indexes"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=int, default=1, help="Dataset size multiplier")
+        parser.add_argument('--repeat', type=int, default=20, help="Timed requests per view")
+        parser.add_argument('--output', help="Write the full report (including plans) as JSON to this path")
+        parser.add_argument('--plans', action='store_true', help="Print the query plans as well as timings")
+
+    def handle(self, *args, **options):
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            self.stdout.write(f"Seeding dataset (scale {options['scale']})...")
+            context = seed_dataset(scale=options['scale'])
+            analyze()
+
+            set_indexes(False)
+            before = run_suite(context, repeat=options['repeat'])
+            set_indexes(True)
+            after = run_suite(context, repeat=options['repeat'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        self.report(before, after, show_plans=options['plans'])
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                json.dump({'before': before, 'after': after}, fh, indent=2)
+            self.stdout.write(f"Report written to {options['output']}")
+
+    def report(self, before, after, show_plans=False):
+        self.stdout.write(f"\n{'view':<24}{'queries':>8}{'before ms':>12}{'after ms':>12}{'speedup':>10}")
+        for name, result in after.items():
+            old = before[name]
+            speedup = old['median_ms'] / result['median_ms'] if result['median_ms'] else 0
+            self.stdout.write(
+                f"{name:<24}{result['queries']:>8}{old['median_ms']:>12.2f}{result['median_ms']:>12.2f}{speedup:>9.1f}x"
+            )
+            if not show_plans:
+                continue
+            for label, plans in (('before', old['plans']), ('after', result['plans'])):
+                for entry in plans:
+                    self.stdout.write(f"    [{label}] {entry['sql'][:140]}")
+                    for line in entry['plan']:
+                        self.stdout.write(f"        {line}")
@@ -0,0 +1,108 @@
+import os
+import threading
+import time
+import uuid
+
+from django.contrib.auth.hashers import get_hasher, get_hashers
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import override_settings
+from rest_framework.test import APIClient
+
+from core.models import CustomUser
+from utils.stats import percentile
+
+
+PASSWORD = 'Benchmark-password-1'
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure password hashing cost per hasher and end-to-end login throughput "
+        "(creates and removes a temporary user)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hasher', action='append', default=[], help="Hasher algorithm (repeatable); default all usable")
+        parser.add_argument('--iterations', type=int, default=20, help="Password checks per hasher")
+        parser.add_argument('--requests', type=int, default=100, help="Login requests for the throughput run")
+        parser.add_argument('--concurrency', type=int, default=8, help="Concurrent clients for the throughput run")
+
+    def handle(self, *args, **options):
+        cores = os.cpu_count() or 1
+        self.stdout.write(f"{'hasher':<12}{'ms/check':>10}{'checks/s/core':>15}")
+        for hasher in self.hashers(options['hasher']):
+            encoded = hasher.encode(PASSWORD, hasher.salt())
+            started = time.perf_counter()
+            for _ in range(options['iterations']):
+                hasher.verify(PASSWORD, encoded)
+            per_check = (time.perf_counter() - started) / options['iterations']
+            self.stdout.write(f"{hasher.algorithm:<12}{per_check * 1000:>10.1f}{1 / per_check:>15.1f}")
+
+        user = CustomUser.objects.create_user(
+            f"benchmark-login-{uuid.uuid4().hex}@example.invalid", PASSWORD, full_name='Login benchmark'
+        )
+        try:
+            # Measure the login pool, not the per-IP and per-account rate limits
+            with override_settings(THROTTLING={'ENABLED': False}):
+                report = self.throughput(user.email, options['requests'], options['concurrency'])
+        finally:
+            user.delete()
+
+        latencies = sorted(report['latencies'])
+        self.stdout.write(
+            f"\n{options['requests']} logins, {options['concurrency']} concurrent clients, {cores} core(s): "
+            f"{report['ok'] / report['elapsed']:.1f} logins/s ({report['ok'] / report['elapsed'] / cores:.1f} per core), "
+            f"p50 {percentile(latencies, 50):.0f} ms, p95 {percentile(latencies, 95):.0f} ms, "
+            f"{report['throttled']} rejected with 503, {report['failed']} failed"
+        )
+
+    def hashers(self, names):
+        if not names:
+            usable = []
+            for hasher in get_hashers():
+                try:
+                    hasher.encode(PASSWORD, hasher.salt())
+                except ValueError:
+                    continue  # library not installed
+                usable.append(hasher)
+            return usable
+        try:
+            return [get_hasher(name) for name in names]
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+    def throughput(self, email, requests, concurrency):
+        report = {'ok': 0, 'throttled': 0, 'failed': 0, 'latencies': []}
+        lock = threading.Lock()
+        remaining = iter(range(requests))
+
+        def client():
+            api = APIClient()
+            try:
+                while True:
+                    with lock:
+                        if next(remaining, None) is None:
+                            return
+                    started = time.perf_counter()
+                    response = api.post('/api/auth/login/', {'email': email, 'password': PASSWORD}, format='json')
+                    elapsed = (time.perf_counter() - started) * 1000
+                    with lock:
+                        if response.status_code == 200:
+                            report['ok'] += 1
+                            report['latencies'].append(elapsed)
+                        elif response.status_code == 503:
+                            report['throttled'] += 1
+                        else:
+                            report['failed'] += 1
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=client) for _ in range(concurrency)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        report['elapsed'] = time.perf_counter() - started
+        return report
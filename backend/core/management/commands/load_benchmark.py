@@ -0,0 +1,50 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+
+from core.loadtest import run_load
+
+
+class Command(BaseCommand):
+    help = "Replay a weighted mix of API calls and report latency percentiles and queries per endpoint"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=1000)
+        parser.add_argument('--warmup', type=int, default=20)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', help="Save the report as JSON to this path")
+        parser.add_argument('--baseline', help="Compare against a report previously saved with --output")
+
+    def handle(self, *args, **options):
+        baseline = {}
+        if options['baseline']:
+            try:
+                with open(options['baseline']) as fh:
+                    baseline = json.load(fh)
+            except (OSError, ValueError) as exc:
+                raise CommandError(f"Could not read baseline: {exc}")
+
+        # Every simulated user shares one address; rate limits would turn the mix into 429s
+        with override_settings(THROTTLING={'ENABLED': False}):
+            report = run_load(requests=options['requests'], seed=options['seed'], warmup=options['warmup'])
+
+        self.stdout.write(
+            f"{'endpoint':<24}{'reqs':>6}{'err':>5}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'queries':>9}"
+            + (f"{'p95 vs base':>13}" if baseline else '')
+        )
+        for name, stats in report.items():
+            line = (
+                f"{name:<24}{stats['requests']:>6}{stats['errors']:>5}{stats['p50_ms']:>10.2f}"
+                f"{stats['p95_ms']:>10.2f}{stats['p99_ms']:>10.2f}{stats['avg_queries']:>9.1f}"
+            )
+            previous = baseline.get(name)
+            if previous and previous['p95_ms']:
+                change = (stats['p95_ms'] - previous['p95_ms']) / previous['p95_ms'] * 100
+                line += f"{change:>+12.1f}%"
+            self.stdout.write(line)
+
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                json.dump(report, fh, indent=2)
+            self.stdout.write(f"Report written to {options['output']}")
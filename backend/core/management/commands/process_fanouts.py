@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from core.fanout import run_fanout
+from core.models import NotificationFanout
+
+
+class Command(BaseCommand):
+    help = "Deliver pending notification fan-outs directly, without the task worker"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--pending-only', action='store_true',
+            help="Skip fan-outs left 'running' (use while a web worker may still be delivering them)"
+        )
+
+    def handle(self, *args, **options):
+        statuses = ['pending'] if options['pending_only'] else ['pending', 'running']
+        fanouts = NotificationFanout.objects.filter(status__in=statuses).order_by('created_at')
+        for fanout_id in fanouts.values_list('pk', flat=True):
+            try:
+                if not run_fanout(fanout_id, resume=not options['pending_only']):
+                    continue
+            except Exception as exc:
+                self.stderr.write(f"Fan-out {fanout_id} failed: {exc!r}")
+                continue
+            fanout = NotificationFanout.objects.get(pk=fanout_id)
+            self.stdout.write(f"{fanout.title}: {fanout.status}, {fanout.sent}/{fanout.total} delivered")
+        self.stdout.write(self.style.SUCCESS("Done"))
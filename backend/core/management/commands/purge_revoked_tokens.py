@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from utils.tokens import purge_revoked_tokens
+
+
+class Command(BaseCommand):
+    help = "Delete audit records of revoked tokens that have expired"
+
+    def handle(self, *args, **options):
+        deleted = purge_revoked_tokens()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired revoked token(s)"))
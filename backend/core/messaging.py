@@ -0,0 +1,105 @@
+"""
+Threaded messaging.
+
+Every Message belongs to a Conversation between its sender and recipient.
+The conversation keeps a pointer to its latest message, and each participant
+row carries that timestamp and the participant's unread count, so the inbox
+is a single range scan over (user, -last_message_at) and thread pages are a
+keyset scan over (conversation, -sent_at).
+
+Messages saved through any path (API, admin, shell) are attached to their
+conversation by the signals in core.signals.
+"""
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .models import Conversation, ConversationParticipant, Message
+
+
+def participant_key(*user_ids):
+    return ':'.join(sorted(str(user_id) for user_id in set(user_ids)))
+
+
+def get_or_create_conversation(*user_ids):
+    key = participant_key(*user_ids)
+    conversation = Conversation.objects.filter(participant_key=key).first()
+    if conversation is not None:
+        return conversation
+    try:
+        with transaction.atomic():
+            conversation = Conversation.objects.create(participant_key=key)
+            ConversationParticipant.objects.bulk_create([
+                ConversationParticipant(conversation=conversation, user_id=user_id) for user_id in set(user_ids)
+            ])
+    except IntegrityError:
+        # Created concurrently by the other participant
+        conversation = Conversation.objects.get(participant_key=key)
+    return conversation
+
+
+def record_message(message):
+    """Advance the conversation and participant rows for a newly saved message."""
+    Conversation.objects.filter(pk=message.conversation_id).update(
+        last_message=message, last_message_at=message.sent_at
+    )
+    ConversationParticipant.objects.filter(conversation_id=message.conversation_id).update(
+        last_message_at=message.sent_at
+    )
+    if not message.is_read:
+        ConversationParticipant.objects.filter(
+            conversation_id=message.conversation_id, user_id=message.recipient_id
+        ).update(unread_count=F('unread_count') + 1)
+
+
+def forget_message(message):
+    """Undo a deleted message's contribution to its conversation."""
+    if message.conversation_id is None:
+        return
+    if not message.is_read:
+        ConversationParticipant.objects.filter(
+            conversation_id=message.conversation_id, user_id=message.recipient_id
+        ).update(unread_count=Greatest(F('unread_count') - 1, Value(0)))
+    latest = Message.objects.filter(conversation_id=message.conversation_id).order_by('-sent_at', '-pk').first()
+    if latest is None or latest.sent_at < message.sent_at:
+        last_message_at = latest.sent_at if latest else None
+        Conversation.objects.filter(pk=message.conversation_id).update(
+            last_message=latest, last_message_at=last_message_at
+        )
+        ConversationParticipant.objects.filter(conversation_id=message.conversation_id).update(
+            last_message_at=last_message_at
+        )
+
+
+def send_message(sender, recipient, subject, content):
+    return Message.objects.create(sender=sender, recipient=recipient, subject=subject, content=content)
+
+
+@transaction.atomic
+def mark_conversation_read(conversation, user):
+    """Mark every message to `user` in the conversation read; returns how many changed."""
+    updated = Message.objects.filter(conversation=conversation, recipient_id=user.pk, is_read=False).update(is_read=True)
+    ConversationParticipant.objects.filter(conversation=conversation, user_id=user.pk).update(
+        unread_count=0, last_read_at=timezone.now()
+    )
+    return updated
+
+
+@transaction.atomic
+def mark_message_read(message):
+    if Message.objects.filter(pk=message.pk, is_read=False).update(is_read=True):
+        ConversationParticipant.objects.filter(
+            conversation_id=message.conversation_id, user_id=message.recipient_id
+        ).update(unread_count=Greatest(F('unread_count') - 1, Value(0)))
+    message.is_read = True
+
+
+@transaction.atomic
+def mark_message_unread(message):
+    if Message.objects.filter(pk=message.pk, is_read=True).update(is_read=False):
+        ConversationParticipant.objects.filter(
+            conversation_id=message.conversation_id, user_id=message.recipient_id
+        ).update(unread_count=F('unread_count') + 1)
+    message.is_read = False
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.1 on 2026-10-18 09:21
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_access_pattern_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UinSequence',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('year', models.PositiveIntegerField(unique=True)),
+                ('next_value', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+    ]
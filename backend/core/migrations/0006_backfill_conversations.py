@@ -0,0 +1,50 @@
+from django.db import migrations
+
+
+BATCH_SIZE = 1000
+
+
+def backfill_conversations(apps, schema_editor):
+    Message = apps.get_model('core', 'Message')
+    Conversation = apps.get_model('core', 'Conversation')
+    ConversationParticipant = apps.get_model('core', 'ConversationParticipant')
+
+    # One pass over the existing messages, oldest first
+    threads = {}
+    rows = Message.objects.filter(conversation__isnull=True).order_by('sent_at', 'pk').values_list(
+        'id', 'sender_id', 'recipient_id', 'is_read', 'sent_at'
+    )
+    for message_id, sender_id, recipient_id, is_read, sent_at in rows.iterator(chunk_size=BATCH_SIZE):
+        key = ':'.join(sorted({str(sender_id), str(recipient_id)}))
+        thread = threads.setdefault(key, {
+            'users': {sender_id, recipient_id}, 'messages': [], 'unread': {}, 'last': None, 'last_at': None,
+        })
+        thread['messages'].append(message_id)
+        thread['last'], thread['last_at'] = message_id, sent_at
+        if not is_read:
+            thread['unread'][recipient_id] = thread['unread'].get(recipient_id, 0) + 1
+
+    for key, thread in threads.items():
+        conversation = Conversation.objects.create(
+            participant_key=key, last_message_id=thread['last'], last_message_at=thread['last_at']
+        )
+        ConversationParticipant.objects.bulk_create([
+            ConversationParticipant(
+                conversation=conversation, user_id=user_id,
+                unread_count=thread['unread'].get(user_id, 0), last_message_at=thread['last_at'],
+            )
+            for user_id in thread['users']
+        ])
+        for start in range(0, len(thread['messages']), BATCH_SIZE):
+            Message.objects.filter(pk__in=thread['messages'][start:start + BATCH_SIZE]).update(conversation=conversation)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_conversations'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_conversations, migrations.RunPython.noop),
+    ]
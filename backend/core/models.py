@@ -1,8 +1,8 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin, BaseUserManager
 import uuid
 from django.utils import timezone
-from utils.uin_generator import generate_uin
+from utils.uin_generator import generate_uin, generate_uins
 
 
 # User role choices
@@ -19,7 +19,17 @@ class UserRole(models.TextChoices):
     GENERAL_USER = 'GENERAL', 'General User'
 
 
-class CustomUserManager(BaseUserManager):
+class CustomUserQuerySet(models.QuerySet):
+    def bulk_create(self, objs, *args, **kwargs):
+        # bulk_create bypasses save(), so allocate missing UINs here in one go
+        objs = list(objs)
+        missing = [obj for obj in objs if not obj.uin]
+        for obj, uin in zip(missing, generate_uins(len(missing))):
+            obj.uin = uin
+        return super().bulk_create(objs, *args, **kwargs)
+
+
+class CustomUserManager(BaseUserManager.from_queryset(CustomUserQuerySet)):
     def create_user(self, email, password=None, **extra_fields):
         if not email:
             raise ValueError('The Email field must be set')
@@ -67,18 +77,59 @@ class CustomUser(AbstractBaseUser, PermissionsMixin):
     specialization = models.CharField(max_length=255, blank=True, null=True)  # For lecturers
     approved = models.BooleanField(default=False)  # For lecturers, mentors, employers
     
+    # Bumped whenever a field signed into access tokens (or the password)
+    # changes, which invalidates tokens issued before (see utils.tokens)
+    auth_version = models.PositiveIntegerField(default=1)
+    
     objects = CustomUserManager()
     
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['full_name']
     
+    AUTH_STATE_FIELDS = ('role', 'approved', 'institution', 'is_active', 'password')
+    
     def __str__(self):
         return f"{self.full_name} ({self.email})"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_auth_state = instance._auth_state()
+        return instance
+    
+    def _auth_state(self):
+        return tuple(self.__dict__.get(field) for field in self.AUTH_STATE_FIELDS)
+    
+    def check_password(self, raw_password):
+        # A hash upgraded on login (see utils.hashers) is not a password change
+        self._rehashing = True
+        try:
+            return super().check_password(raw_password)
+        finally:
+            self._rehashing = False
+    
     def save(self, *args, **kwargs):
         if not self.uin:
             self.uin = generate_uin()
+        loaded = getattr(self, '_loaded_auth_state', None)
+        if loaded is not None and getattr(self, '_rehashing', False):
+            loaded = loaded[:-1] + (self.password,)
+        if loaded is not None and loaded != self._auth_state():
+            self.auth_version += 1
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'auth_version'}
         super().save(*args, **kwargs)
+        self._loaded_auth_state = self._auth_state()
+
+
+class UinSequence(models.Model):
+    """Per-year counter behind UIN allocation (see utils.uin_generator)."""
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    year = models.PositiveIntegerField(unique=True)
+    next_value = models.PositiveBigIntegerField(default=0)
+    
+    def __str__(self):
+        return f"{self.year}: {self.next_value}"
 
 
 class Notification(models.Model):
@@ -93,13 +144,125 @@ class Notification(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='core_notif_user_created_idx'),
+            models.Index(fields=['user', 'is_read'], name='core_notif_user_read_idx'),
+        ]
     
     def __str__(self):
         return f"{self.title} - {self.user.full_name}"
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored read state so the unread counter sees transitions
+        instance._loaded_is_read = instance.__dict__.get('is_read')
+        return instance
+    
+    def save(self, *args, **kwargs):
+        # Counter maintenance runs in post_save; keep both in one transaction
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
+        self._loaded_is_read = self.is_read
+    
+    def delete(self, *args, **kwargs):
+        with transaction.atomic(using=kwargs.get('using')):
+            return super().delete(*args, **kwargs)
+
+
+class NotificationCounter(models.Model):
+    """Denormalised unread notification count per user (see core.notifications)."""
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.OneToOneField(CustomUser, on_delete=models.CASCADE, related_name='notification_counter')
+    unread_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.user_id}: {self.unread_count} unread"
+
+
+class NotificationFanout(models.Model):
+    """A notification sent to a whole audience, delivered in chunks (see core.fanout)."""
+    AUDIENCE_CHOICES = (
+        ('course', 'Course students'),
+        ('job', 'Job applicants'),
+        ('role', 'Users with a role'),
+        ('institution', 'Users at an institution'),
+    )
+    STATUS_CHOICES = (
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    )
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    created_by = models.ForeignKey(CustomUser, on_delete=models.SET_NULL, related_name='notification_fanouts', null=True)
+    audience_type = models.CharField(max_length=20, choices=AUDIENCE_CHOICES)
+    audience_id = models.CharField(max_length=255)  # course/job ID, role value or institution name
+    title = models.CharField(max_length=255)
+    message = models.TextField()
+    link = models.CharField(max_length=255, blank=True, null=True)
+    type = models.CharField(max_length=50, default='system')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    total = models.PositiveIntegerField(default=0)
+    sent = models.PositiveIntegerField(default=0)
+    # Highest recipient ID delivered so far; an interrupted fan-out resumes after it
+    last_user_id = models.UUIDField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return f"{self.title} -> {self.audience_type}:{self.audience_id} ({self.status})"
+    
+    @property
+    def progress(self):
+        return round(self.sent / self.total, 4) if self.total else (1.0 if self.status == 'completed' else 0.0)
+
+
+class Conversation(models.Model):
+    """A message thread between users (see core.messaging)."""
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    # Sorted participant IDs; finds the thread for a pair of users in one lookup
+    participant_key = models.CharField(max_length=255, unique=True)
+    last_message = models.ForeignKey('Message', on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    last_message_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    def __str__(self):
+        return f"Conversation {self.participant_key}"
+
+
+class ConversationParticipant(models.Model):
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    conversation = models.ForeignKey(Conversation, on_delete=models.CASCADE, related_name='participants')
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='conversations')
+    unread_count = models.PositiveIntegerField(default=0)
+    # Copied from the conversation so the inbox is one indexed range scan
+    last_message_at = models.DateTimeField(null=True, blank=True)
+    last_read_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        unique_together = ['conversation', 'user']
+        ordering = ['-last_message_at']
+        indexes = [
+            models.Index(fields=['user', '-last_message_at'], name='core_participant_inbox_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.user_id} in {self.conversation_id}"
 
 
 class Message(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    conversation = models.ForeignKey(
+        Conversation, on_delete=models.CASCADE, related_name='messages', null=True, blank=True
+    )
     sender = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='sent_messages')
     recipient = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='received_messages')
     subject = models.CharField(max_length=255)
@@ -109,9 +272,23 @@ class Message(models.Model):
     
     class Meta:
         ordering = ['-sent_at']
+        indexes = [
+            models.Index(fields=['recipient', '-sent_at'], name='core_msg_recipient_sent_idx'),
+            models.Index(fields=['sender', '-sent_at'], name='core_msg_sender_sent_idx'),
+            models.Index(fields=['conversation', '-sent_at'], name='core_msg_conversation_idx'),
+        ]
     
     def __str__(self):
         return f"{self.subject} - From: {self.sender.full_name} To: {self.recipient.full_name}"
+    
+    def save(self, *args, **kwargs):
+        # Conversation bookkeeping runs in pre/post_save; keep it in one transaction
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
+    
+    def delete(self, *args, **kwargs):
+        with transaction.atomic(using=kwargs.get('using')):
+            return super().delete(*args, **kwargs)
 
 
 class SavedItem(models.Model):
@@ -184,3 +361,32 @@ class SystemSetting(models.Model):
     
     def __str__(self):
         return self.key
+
+
+class RevokedToken(models.Model):
+    """
+    Audit record of a revoked JWT. Revocation is enforced from the token
+    cache (see utils.tokens); rows are purged once the token has expired.
+    """
+    REASON_CHOICES = (
+        ('logout', 'Logout'),
+        ('rotated', 'Rotated on refresh'),
+        ('admin', 'Revoked by an administrator'),
+    )
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    jti = models.CharField(max_length=255, unique=True)
+    user = models.ForeignKey(CustomUser, on_delete=models.SET_NULL, related_name='revoked_tokens', null=True, blank=True)
+    token_type = models.CharField(max_length=20)
+    reason = models.CharField(max_length=20, choices=REASON_CHOICES)
+    revoked_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField()
+    
+    class Meta:
+        ordering = ['-revoked_at']
+        indexes = [
+            models.Index(fields=['expires_at'], name='core_revoked_expires_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.token_type} {self.jti} ({self.reason})"
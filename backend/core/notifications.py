@@ -0,0 +1,88 @@
+"""
+Notification inbox: unread counters and bulk read-state changes.
+
+Each user's unread count is denormalised into NotificationCounter and kept in
+step with Notification writes inside the same transaction (see
+core.signals). Reads go through the cache, which is invalidated once the
+transaction commits. Counters are created lazily from a COUNT the first time
+they are needed, so existing users need no backfill.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .models import Notification, NotificationCounter
+
+
+def get_cache_timeout():
+    return getattr(settings, 'NOTIFICATION_UNREAD_CACHE_TIMEOUT', 300)
+
+
+def _cache_key(user_id):
+    return f"notifications:unread:{user_id}"
+
+
+def invalidate_unread_count(user_id):
+    transaction.on_commit(lambda: cache.delete(_cache_key(user_id)))
+
+
+def _backfill(user_id):
+    """Create the user's counter from the notifications table."""
+    unread = Notification.objects.filter(user_id=user_id, is_read=False).count()
+    try:
+        with transaction.atomic():
+            counter = NotificationCounter.objects.create(user_id=user_id, unread_count=unread)
+    except IntegrityError:
+        # Another request created it first
+        counter = NotificationCounter.objects.get(user_id=user_id)
+    return counter.unread_count
+
+
+def adjust_unread(user_id, delta):
+    """Add `delta` to a user's unread counter (never below zero)."""
+    adjust_unread_many([user_id], delta)
+
+
+def adjust_unread_many(user_ids, delta):
+    """Add `delta` to several users' unread counters in one statement."""
+    if not delta or not user_ids:
+        return
+    # Users without a counter yet are counted from scratch on their next read
+    NotificationCounter.objects.filter(user_id__in=user_ids).update(
+        unread_count=Greatest(F('unread_count') + delta, Value(0)),
+        updated_at=timezone.now(),
+    )
+    keys = [_cache_key(user_id) for user_id in user_ids]
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def unread_count(user):
+    key = _cache_key(user.pk)
+    count = cache.get(key)
+    if count is None:
+        count = NotificationCounter.objects.filter(user_id=user.pk).values_list('unread_count', flat=True).first()
+        if count is None:
+            count = _backfill(user.pk)
+        cache.set(key, count, get_cache_timeout())
+    return count
+
+
+@transaction.atomic
+def mark_read(user, ids):
+    """Mark the given notifications of `user` read; returns how many changed."""
+    updated = Notification.objects.filter(user_id=user.pk, id__in=ids, is_read=False).update(is_read=True)
+    adjust_unread(user.pk, -updated)
+    return updated
+
+
+@transaction.atomic
+def mark_all_read(user):
+    updated = Notification.objects.filter(user_id=user.pk, is_read=False).update(is_read=True)
+    if updated:
+        NotificationCounter.objects.update_or_create(user=user, defaults={'unread_count': 0})
+        invalidate_unread_count(user.pk)
+    return updated
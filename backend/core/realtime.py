@@ -0,0 +1,245 @@
+"""
+Server push for notifications and messages.
+
+Creating a Notification or Message publishes an event to the recipient's
+channel once the transaction commits (see core.signals). EventStreamView
+holds a server-sent event stream per browser tab and forwards everything
+published on the user's channel, so clients no longer poll the list views.
+
+Every event id is a cursor over (timestamp, primary key). A reconnecting
+client sends it back as Last-Event-ID (or ?last_event_id=) and the events it
+missed are replayed from the database, REPLAY_LIMIT per query, until the
+stream has caught up; only then does live delivery resume.
+
+The broker is pluggable through settings.REALTIME['BROKER']. InMemoryBroker
+fans out within one process, which suits a single ASGI worker and tests; a
+multi-worker deployment needs a broker backed by a shared pub/sub.
+"""
+
+import asyncio
+import json
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone as dt_timezone
+from functools import lru_cache
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Q
+from django.utils.module_loading import import_string
+
+from utils.prefetch import apply_prefetch_plan
+from .models import Message, Notification
+from .serializers import MessageSerializer, NotificationSerializer
+
+
+DEFAULT_SETTINGS = {
+    'BROKER': 'core.realtime.InMemoryBroker',
+    'HEARTBEAT_SECONDS': 15,
+    'REPLAY_LIMIT': 100,
+    'QUEUE_SIZE': 1000,
+    'RETRY_MS': 5000,
+}
+
+
+def get_realtime_settings():
+    return {**DEFAULT_SETTINGS, **getattr(settings, 'REALTIME', {})}
+
+
+def user_channel(user_id):
+    return f"user:{user_id}"
+
+
+# Cursors
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+MICROSECOND = timedelta(microseconds=1)
+
+
+def make_cursor(timestamp, pk):
+    # Integer arithmetic: the cursor must round-trip to the exact timestamp
+    micros = (timestamp - EPOCH) // MICROSECOND
+    return f"{micros}:{pk}"
+
+
+def parse_cursor(cursor):
+    """Return (datetime, pk string), or None for a missing/malformed cursor."""
+    try:
+        micros, pk = cursor.split(':', 1)
+        return EPOCH + int(micros) * MICROSECOND, str(uuid.UUID(pk))
+    except (AttributeError, ValueError, OverflowError, OSError):
+        return None
+
+
+def after_position(field, since, after_pk):
+    """Rows strictly after the cursor in (field, pk) order."""
+    return Q(**{f'{field}__gt': since}) | Q(**{field: since, 'pk__gt': after_pk})
+
+
+# Events
+
+def notification_event(notification):
+    return {
+        'id': make_cursor(notification.created_at, notification.pk),
+        'type': 'notification',
+        'data': NotificationSerializer(notification).data,
+    }
+
+
+def message_event(message):
+    return {
+        'id': make_cursor(message.sent_at, message.pk),
+        'type': 'message',
+        'data': MessageSerializer(message).data,
+    }
+
+
+def format_sse(event):
+    payload = json.dumps(event['data'], cls=DjangoJSONEncoder)
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {payload}\n\n"
+
+
+def replay_events(user, cursor, limit=None):
+    """
+    The first `limit` events for `user` after `cursor`, oldest first. A full
+    page means more may follow, from the last returned event's id.
+    """
+    position = parse_cursor(cursor)
+    if position is None:
+        return []
+    since, after_pk = position
+    limit = limit or get_realtime_settings()['REPLAY_LIMIT']
+
+    notifications = Notification.objects.filter(
+        after_position('created_at', since, after_pk), user_id=user.pk
+    ).order_by('created_at', 'pk')[:limit]
+    messages = apply_prefetch_plan(
+        Message.objects.filter(after_position('sent_at', since, after_pk), recipient_id=user.pk), MessageSerializer
+    ).order_by('sent_at', 'pk')[:limit]
+
+    # The first `limit` of the merged order lie within the first `limit` of each source
+    events = [(n.created_at, str(n.pk), notification_event(n)) for n in notifications]
+    events += [(m.sent_at, str(m.pk), message_event(m)) for m in messages]
+    events.sort(key=lambda item: item[:2])
+    return [event for _, _, event in events[:limit]]
+
+
+# Brokers
+
+class BaseBroker:
+    def publish(self, channel, event):
+        raise NotImplementedError
+
+    def subscribe(self, channel):
+        """Return a subscription; must be called from the consuming event loop."""
+        raise NotImplementedError
+
+
+class QueueSubscription:
+    def __init__(self, broker, channel, maxsize):
+        self.broker = broker
+        self.channel = channel
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=maxsize)
+        self.overflowed = False
+
+    def deliver(self, event):
+        try:
+            self.loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:
+            pass  # the consuming loop has already shut down
+
+    def _put(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # The stream is closed and the client resumes from its cursor
+            self.overflowed = True
+
+    async def get(self, timeout):
+        """Next event, or None if nothing arrived within `timeout` seconds."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class InMemoryBroker(BaseBroker):
+    """Process-local pub/sub; publish may be called from any thread."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions = {}
+
+    def subscribe(self, channel):
+        subscription = QueueSubscription(self, channel, get_realtime_settings()['QUEUE_SIZE'])
+        with self._lock:
+            self._subscriptions.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.channel)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.channel]
+
+    def publish(self, channel, event):
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(channel, ()))
+        for subscription in subscriptions:
+            subscription.deliver(event)
+
+    def subscriber_count(self, channel):
+        with self._lock:
+            return len(self._subscriptions.get(channel, ()))
+
+
+@lru_cache(maxsize=None)
+def _load_broker(path):
+    return import_string(path)()
+
+
+def get_broker():
+    return _load_broker(get_realtime_settings()['BROKER'])
+
+
+def publish_on_commit(user_id, build_event):
+    """Publish build_event() to the user's channel after the current transaction commits."""
+    transaction.on_commit(lambda: get_broker().publish(user_channel(user_id), build_event()))
+
+
+# Streaming
+
+async def event_stream(user, last_event_id=None):
+    options = get_realtime_settings()
+    subscription = get_broker().subscribe(user_channel(user.pk))
+    try:
+        yield f"retry: {options['RETRY_MS']}\n\n"
+
+        # Subscribed before replaying, so nothing published in between is lost
+        sent = set()
+        cursor = last_event_id
+        while cursor:
+            events = await sync_to_async(replay_events)(user, cursor, options['REPLAY_LIMIT'])
+            for event in events:
+                sent.add(event['id'])
+                yield format_sse(event)
+            # A short page means the replay has caught up
+            cursor = events[-1]['id'] if len(events) == options['REPLAY_LIMIT'] else None
+
+        while not subscription.overflowed:
+            event = await subscription.get(options['HEARTBEAT_SECONDS'])
+            if event is None:
+                yield ": keepalive\n\n"
+            elif event['id'] not in sent:
+                yield format_sse(event)
+    finally:
+        subscription.close()
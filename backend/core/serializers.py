@@ -1,6 +1,10 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
-from .models import Notification, Message, SavedItem, AdminLog, InstitutionApproval, SystemSetting, UserRole
+from django.db.models import Prefetch
+from .models import (
+    Notification, NotificationFanout, Message, ConversationParticipant, SavedItem, AdminLog, InstitutionApproval,
+    SystemSetting, UserRole,
+)
 
 User = get_user_model()
 
@@ -93,6 +97,28 @@ class NotificationSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at']
 
 
+class NotificationMarkReadSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.UUIDField(), allow_empty=False, max_length=1000)
+
+
+class NotificationFanoutSerializer(serializers.ModelSerializer):
+    progress = serializers.FloatField(read_only=True)
+    
+    class Meta:
+        model = NotificationFanout
+        fields = ['id', 'audience_type', 'audience_id', 'title', 'message', 'link', 'type',
+                  'status', 'total', 'sent', 'progress', 'error', 'created_at', 'started_at', 'finished_at']
+        read_only_fields = ['id', 'status', 'total', 'sent', 'progress', 'error',
+                            'created_at', 'started_at', 'finished_at']
+    
+    def validate(self, data):
+        from .fanout import validate_audience  # core.fanout imports this module
+        error = validate_audience(data['audience_type'], data['audience_id'])
+        if error:
+            raise serializers.ValidationError({'audience_id': error})
+        return data
+
+
 class MessageSerializer(serializers.ModelSerializer):
     sender_name = serializers.SerializerMethodField()
     recipient_name = serializers.SerializerMethodField()
@@ -102,6 +128,7 @@ class MessageSerializer(serializers.ModelSerializer):
         fields = ['id', 'sender', 'sender_name', 'recipient', 'recipient_name', 
                   'subject', 'content', 'is_read', 'sent_at']
         read_only_fields = ['id', 'sender', 'sender_name', 'sent_at']
+        select_related = ['sender', 'recipient']
     
     def get_sender_name(self, obj):
         return obj.sender.full_name
@@ -110,6 +137,38 @@ class MessageSerializer(serializers.ModelSerializer):
         return obj.recipient.full_name
 
 
+class MessageUpdateSerializer(MessageSerializer):
+    """Edits a message's text; read state goes through core.messaging."""
+    
+    class Meta(MessageSerializer.Meta):
+        read_only_fields = ['id', 'sender', 'sender_name', 'recipient', 'is_read', 'sent_at']
+
+
+class MessageReadStateSerializer(serializers.Serializer):
+    is_read = serializers.BooleanField(default=True)
+
+
+class ConversationSerializer(serializers.ModelSerializer):
+    """An inbox entry: one participant's view of a conversation."""
+    id = serializers.UUIDField(source='conversation_id', read_only=True)
+    participants = serializers.SerializerMethodField()
+    last_message = MessageSerializer(source='conversation.last_message', read_only=True)
+    
+    class Meta:
+        model = ConversationParticipant
+        fields = ['id', 'participants', 'last_message', 'unread_count', 'last_message_at']
+        prefetch_related = [
+            Prefetch('conversation__participants', queryset=ConversationParticipant.objects.select_related('user'))
+        ]
+    
+    def get_participants(self, obj):
+        return [
+            {'id': participant.user_id, 'full_name': participant.user.full_name}
+            for participant in obj.conversation.participants.all()
+            if participant.user_id != obj.user_id
+        ]
+
+
 class SavedItemSerializer(serializers.ModelSerializer):
     class Meta:
         model = SavedItem
@@ -124,6 +183,7 @@ class AdminLogSerializer(serializers.ModelSerializer):
         model = AdminLog
         fields = ['id', 'user', 'user_name', 'action', 'details', 'timestamp']
         read_only_fields = ['id', 'timestamp']
+        select_related = ['user']
     
     def get_user_name(self, obj):
         return obj.user.full_name
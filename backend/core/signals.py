@@ -0,0 +1,59 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from utils.tokens import forget_auth_version
+from .models import CustomUser, Message, Notification
+from .messaging import forget_message, get_or_create_conversation, record_message
+from .notifications import adjust_unread
+from .realtime import message_event, notification_event, publish_on_commit
+
+
+@receiver(post_save, sender=Notification)
+def track_unread_on_save(sender, instance, created, **kwargs):
+    if created:
+        delta = 0 if instance.is_read else 1
+    else:
+        was_read = getattr(instance, '_loaded_is_read', instance.is_read)
+        delta = int(bool(was_read)) - int(bool(instance.is_read))
+    adjust_unread(instance.user_id, delta)
+
+
+@receiver(post_delete, sender=Notification)
+def track_unread_on_delete(sender, instance, **kwargs):
+    was_read = getattr(instance, '_loaded_is_read', instance.is_read)
+    if not was_read:
+        adjust_unread(instance.user_id, -1)
+
+
+@receiver(post_save, sender=Notification)
+def push_notification(sender, instance, created, **kwargs):
+    if created:
+        publish_on_commit(instance.user_id, lambda: notification_event(instance))
+
+
+@receiver(post_save, sender=Message)
+def push_message(sender, instance, created, **kwargs):
+    if created:
+        publish_on_commit(instance.recipient_id, lambda: message_event(instance))
+
+
+@receiver(pre_save, sender=Message)
+def attach_conversation(sender, instance, **kwargs):
+    if instance.conversation_id is None:
+        instance.conversation = get_or_create_conversation(instance.sender_id, instance.recipient_id)
+
+
+@receiver(post_save, sender=Message)
+def update_conversation(sender, instance, created, **kwargs):
+    if created:
+        record_message(instance)
+
+
+@receiver(post_delete, sender=Message)
+def update_conversation_on_delete(sender, instance, **kwargs):
+    forget_message(instance)
+
+
+@receiver(post_save, sender=CustomUser)
+def refresh_auth_version(sender, instance, **kwargs):
+    forget_auth_version(instance.pk)
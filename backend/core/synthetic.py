@@ -0,0 +1,467 @@
+"""
+Synthetic population generator.
+
+SyntheticPopulation inserts a production-shaped dataset into the current
+database: users across every UserRole, courses with enrolled students,
+assignments and submissions, jobs and applications, learning resources with
+progress rows, career quiz results, notifications and message threads.
+Everything is written with bulk_create in fixed-size batches and only
+primary keys are kept in memory, so populations of millions of users are
+practical. Relations are built from primary keys directly; no signals fire,
+so the denormalised rows signals would maintain (notification counters,
+conversation state) are written alongside, and the job search index, skill
+matches and gradebooks are rebuilt at the end. UINs are allocated by
+CustomUser's bulk_create.
+"""
+
+import random
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import timedelta
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+
+from career.models import CareerQuiz, QuizOption, QuizQuestion, QuizResult
+from career.scoring import parse_traits
+from jobs.matching import rebuild_matches
+from jobs.models import Job, JobApplication
+from jobs.search import get_search_backend
+from learning.models import LearningResource, UserProgress
+from lms.gradebook import rebuild_course
+from lms.models import Assignment, Course, Submission
+from .messaging import participant_key
+from .models import (
+    Conversation, ConversationParticipant, CustomUser, Message, Notification, NotificationCounter, UserRole,
+)
+
+
+# Relative share of each role in the generated population
+ROLE_WEIGHTS = {
+    UserRole.O_LEVEL_STUDENT: 25,
+    UserRole.A_LEVEL_STUDENT: 20,
+    UserRole.TERTIARY_STUDENT: 35,
+    UserRole.LECTURER: 3,
+    UserRole.MENTOR: 2,
+    UserRole.EMPLOYER: 4,
+    UserRole.INSTITUTION_ADMIN: 0.5,
+    UserRole.MINISTRY_ADMIN: 0.1,
+    UserRole.SUPERUSER: 0.01,
+    UserRole.GENERAL_USER: 10.39,
+}
+
+STUDENT_ROLES = [UserRole.O_LEVEL_STUDENT, UserRole.A_LEVEL_STUDENT, UserRole.TERTIARY_STUDENT]
+
+DEFAULT_RATIOS = {
+    'courses_per_lecturer': 3,
+    'enrollments_per_student': 4,
+    'assignments_per_course': 5,
+    'submission_rate': 0.6,
+    'jobs_per_employer': 8,
+    'applications_per_student': 3,
+    'resources_per_1000_users': 20,
+    'progress_per_student': 6,
+    'quiz_completion_rate': 0.5,
+    'notifications_per_user': 5,
+    'conversations_per_user': 2,
+    'messages_per_conversation': 4,
+}
+
+COUNTRIES = ['Zimbabwe', 'South Africa', 'Zambia', 'Botswana', 'Kenya', 'Mozambique']
+INSTITUTIONS = ['University of Zimbabwe', 'NUST', 'Midlands State University', 'Chinhoyi University', 'Africa University']
+SKILLS = ['python', 'sql', 'excel', 'accounting', 'marketing', 'design', 'java', 'networking', 'writing', 'statistics']
+NOTIFICATION_TYPES = ['submission', 'job_match', 'message', 'system']
+QUIZ_TRAITS = ['analytical', 'creative', 'social', 'practical', 'leadership', 'technical', 'caring', 'organised']
+
+
+@contextmanager
+def explicit_timestamps(*fields):
+    """Let bulk_create keep the timestamps we set instead of auto_now(_add)."""
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def timestamp_fields(model, *names):
+    return [model._meta.get_field(name) for name in names]
+
+
+class SyntheticPopulation:
+    def __init__(self, users, seed=0, batch_size=5000, ratios=None, password='synthetic', log=None):
+        self.total_users = users
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+        self.ratios = {**DEFAULT_RATIOS, **(ratios or {})}
+        self.password = make_password(password)
+        self.log = log or (lambda message: None)
+        self.now = timezone.now()
+        self.counts = {}
+
+        self.user_ids = {role: [] for role in ROLE_WEIGHTS}
+        self.course_students = {}
+
+    def past(self, days=365):
+        return self.now - timedelta(seconds=self.rng.randrange(days * 86400))
+
+    def insert(self, model, rows, label=None):
+        """bulk_create an iterable of unsaved instances in batches."""
+        label = label or model._meta.model_name
+        rows = iter(rows)
+        total = 0
+        while True:
+            batch = list(islice(rows, self.batch_size))
+            if not batch:
+                break
+            with transaction.atomic():
+                model.objects.bulk_create(batch, batch_size=self.batch_size)
+            total += len(batch)
+        self.counts[label] = self.counts.get(label, 0) + total
+        self.log(f"  {label}: {total}")
+        return total
+
+    def generate(self):
+        start = time.perf_counter()
+        self.create_users()
+        self.create_courses()
+        self.create_jobs()
+        self.create_learning()
+        self.create_quiz_results()
+        self.create_notifications()
+        self.create_messages()
+        self.rebuild_derived()
+        self.log(f"Done in {time.perf_counter() - start:.1f}s")
+        return self.counts
+
+    # Users
+
+    def _role_plan(self):
+        weights = sum(ROLE_WEIGHTS.values())
+        plan = {role: int(self.total_users * weight / weights) for role, weight in ROLE_WEIGHTS.items()}
+        # Rounding leftovers go to the largest group
+        plan[UserRole.TERTIARY_STUDENT] += self.total_users - sum(plan.values())
+        return plan
+
+    def create_users(self):
+        run = uuid.uuid4().hex[:8]
+        plan = self._role_plan()
+        self.log(f"Users ({self.total_users}):")
+
+        def rows(role, count):
+            is_staff = role == UserRole.SUPERUSER
+            for i in range(count):
+                user_id = uuid.uuid4()
+                self.user_ids[role].append(user_id)
+                yield CustomUser(
+                    id=user_id,
+                    email=f"{role.lower()}.{i}.{run}@synthetic.nextstep",
+                    full_name=f"{role.label} {i}",
+                    role=role,
+                    password=self.password,
+                    institution=self.rng.choice(INSTITUTIONS),
+                    approved=True,
+                    is_staff=is_staff,
+                    is_superuser=is_staff,
+                    date_joined=self.past(730),
+                )
+
+        for role, count in plan.items():
+            self.insert(CustomUser, rows(role, count), label=f"users ({role})")
+
+    @property
+    def all_users(self):
+        return [user_id for user_ids in self.user_ids.values() for user_id in user_ids]
+
+    @property
+    def students(self):
+        return [user_id for role in STUDENT_ROLES for user_id in self.user_ids[role]]
+
+    # LMS
+
+    def create_courses(self):
+        lecturers = self.user_ids[UserRole.LECTURER]
+        students = self.students
+        if not lecturers:
+            return
+        self.log("LMS:")
+        run = uuid.uuid4().hex[:6].upper()
+
+        def course_rows():
+            for n, lecturer_id in enumerate(lecturers * self.ratios['courses_per_lecturer']):
+                course_id = uuid.uuid4()
+                self.course_students[course_id] = []
+                start = self.past(180).date()
+                yield Course(
+                    id=course_id, title=f"Course {n}", code=f"S{run}{n:07d}",
+                    description='Synthetic course', institution=self.rng.choice(INSTITUTIONS),
+                    instructor_id=lecturer_id, semester=str(self.rng.randint(1, 2)),
+                    start_date=start, end_date=start + timedelta(days=120),
+                )
+
+        self.insert(Course, course_rows())
+
+        course_ids = list(self.course_students)
+        per_student = min(self.ratios['enrollments_per_student'], len(course_ids))
+
+        def enrollment_rows():
+            for student_id in students:
+                for course_id in self.rng.sample(course_ids, per_student):
+                    self.course_students[course_id].append(student_id)
+                    yield Course.students.through(course_id=course_id, customuser_id=student_id)
+
+        self.insert(Course.students.through, enrollment_rows(), label='enrollments')
+
+        assignments = []
+
+        def assignment_rows():
+            for course_id in course_ids:
+                for n in range(self.ratios['assignments_per_course']):
+                    assignment_id = uuid.uuid4()
+                    assignments.append((assignment_id, course_id))
+                    yield Assignment(
+                        id=assignment_id, course_id=course_id, title=f"Assignment {n + 1}",
+                        description='Synthetic assignment', due_date=self.past(120), total_points=100,
+                    )
+
+        self.insert(Assignment, assignment_rows())
+
+        def submission_rows():
+            for assignment_id, course_id in assignments:
+                enrolled = self.course_students[course_id]
+                for student_id in self.rng.sample(enrolled, int(len(enrolled) * self.ratios['submission_rate'])):
+                    graded = self.rng.random() < 0.5
+                    yield Submission(
+                        assignment_id=assignment_id, student_id=student_id, content='Synthetic answer',
+                        status='graded' if graded else self.rng.choice(['submitted', 'late']),
+                        points_earned=self.rng.randint(30, 100) if graded else None,
+                        submitted_at=self.past(120),
+                    )
+
+        with explicit_timestamps(*timestamp_fields(Submission, 'submitted_at')):
+            self.insert(Submission, submission_rows())
+
+    # Jobs
+
+    def create_jobs(self):
+        employers = self.user_ids[UserRole.EMPLOYER]
+        applicants = self.user_ids[UserRole.TERTIARY_STUDENT]
+        if not employers:
+            return
+        self.log("Jobs:")
+        job_ids = []
+        job_types = [choice for choice, _ in Job.JOB_TYPE_CHOICES]
+
+        def job_rows():
+            for n, employer_id in enumerate(employers * self.ratios['jobs_per_employer']):
+                job_id = uuid.uuid4()
+                job_ids.append(job_id)
+                yield Job(
+                    id=job_id, title=f"Job {n}", company=f"Company {n % 500}", location='City',
+                    country=self.rng.choice(COUNTRIES), description='Synthetic job',
+                    requirements='Requirements', responsibilities='Responsibilities',
+                    job_type=self.rng.choice(job_types),
+                    skills=', '.join(self.rng.sample(SKILLS, 3)),
+                    application_deadline=(self.now + timedelta(days=self.rng.randint(-30, 60))).date(),
+                    status=self.rng.choices(['OPEN', 'CLOSED', 'FILLED', 'DRAFT'], weights=[6, 2, 1, 1])[0],
+                    posted_by_id=employer_id, created_at=self.past(), updated_at=self.now,
+                )
+
+        with explicit_timestamps(*timestamp_fields(Job, 'created_at', 'updated_at')):
+            self.insert(Job, job_rows())
+
+        statuses = [choice for choice, _ in JobApplication.STATUS_CHOICES]
+        per_student = min(self.ratios['applications_per_student'], len(job_ids))
+
+        def application_rows():
+            for student_id in applicants:
+                for job_id in self.rng.sample(job_ids, per_student):
+                    yield JobApplication(
+                        job_id=job_id, applicant_id=student_id, cover_letter='Synthetic cover letter',
+                        status=self.rng.choice(statuses), applied_at=self.past(), updated_at=self.now,
+                    )
+
+        with explicit_timestamps(*timestamp_fields(JobApplication, 'applied_at', 'updated_at')):
+            self.insert(JobApplication, application_rows())
+
+    # Learning
+
+    def create_learning(self):
+        self.log("Learning:")
+        resource_count = max(50, self.total_users * self.ratios['resources_per_1000_users'] // 1000)
+        providers = [choice for choice, _ in LearningResource.PROVIDER_CHOICES]
+        types = [choice for choice, _ in LearningResource.RESOURCE_TYPE_CHOICES]
+        levels = [choice for choice, _ in LearningResource.DIFFICULTY_CHOICES]
+        resource_ids = []
+
+        def resource_rows():
+            for n in range(resource_count):
+                resource_id = uuid.uuid4()
+                resource_ids.append(resource_id)
+                yield LearningResource(
+                    id=resource_id, title=f"Resource {n}", description='Synthetic resource',
+                    provider=self.rng.choice(providers), resource_type=self.rng.choice(types),
+                    url=f"https://example.com/resources/{resource_id}", duration='1 hour',
+                    difficulty_level=self.rng.choice(levels), skills=', '.join(self.rng.sample(SKILLS, 2)),
+                    created_at=self.past(), updated_at=self.now,
+                )
+
+        with explicit_timestamps(*timestamp_fields(LearningResource, 'created_at', 'updated_at')):
+            self.insert(LearningResource, resource_rows())
+
+        per_student = min(self.ratios['progress_per_student'], len(resource_ids))
+
+        def progress_rows():
+            for student_id in self.students:
+                for resource_id in self.rng.sample(resource_ids, per_student):
+                    completion = self.rng.choice([0, 10, 25, 50, 75, 100])
+                    yield UserProgress(
+                        user_id=student_id, resource_id=resource_id, completion_percentage=completion,
+                        status='COMPLETED' if completion == 100 else 'IN_PROGRESS' if completion else 'NOT_STARTED',
+                        last_activity=self.past(),
+                    )
+
+        self.insert(UserProgress, progress_rows())
+
+    # Career
+
+    def _quiz(self):
+        quiz = CareerQuiz.objects.first()
+        if quiz is not None:
+            return quiz
+        quiz = CareerQuiz.objects.create(title='Career interest quiz', description='Synthetic career quiz')
+        for order in range(1, 11):
+            question = QuizQuestion.objects.create(quiz=quiz, text=f"Question {order}", order=order)
+            QuizOption.objects.bulk_create([
+                QuizOption(question=question, text=f"Option {n}", career_traits=', '.join(self.rng.sample(QUIZ_TRAITS, 2)))
+                for n in range(4)
+            ])
+        return quiz
+
+    def create_quiz_results(self):
+        self.log("Career:")
+        quiz = self._quiz()
+        questions = {}
+        for option_id, question_id, traits in QuizOption.objects.filter(question__quiz=quiz).values_list(
+            'id', 'question_id', 'career_traits'
+        ):
+            questions.setdefault(str(question_id), []).append((str(option_id), parse_traits(traits)))
+        if not questions:
+            return
+
+        def result_rows():
+            for student_id in self.students:
+                if self.rng.random() >= self.ratios['quiz_completion_rate']:
+                    continue
+                answers = {}
+                score = {}
+                for question_id, options in questions.items():
+                    option_id, traits = self.rng.choice(options)
+                    answers[question_id] = option_id
+                    for trait in traits:
+                        score[trait] = score.get(trait, 0) + 1
+                yield QuizResult(user_id=student_id, quiz=quiz, answers=answers, score=score, completed_at=self.past())
+
+        self.insert(QuizResult, result_rows())
+
+    # Notifications and messages
+
+    def create_notifications(self):
+        self.log("Notifications:")
+        unread = {}
+
+        def notification_rows():
+            for user_id in self.all_users:
+                for n in range(self.ratios['notifications_per_user']):
+                    is_read = self.rng.random() < 0.7
+                    if not is_read:
+                        unread[user_id] = unread.get(user_id, 0) + 1
+                    yield Notification(
+                        user_id=user_id, title=f"Notification {n + 1}", message='Synthetic notification',
+                        is_read=is_read, type=self.rng.choice(NOTIFICATION_TYPES), created_at=self.past(90),
+                    )
+
+        with explicit_timestamps(*timestamp_fields(Notification, 'created_at')):
+            self.insert(Notification, notification_rows())
+        self.insert(
+            NotificationCounter,
+            (NotificationCounter(user_id=user_id, unread_count=unread.get(user_id, 0)) for user_id in self.all_users),
+            label='notification counters',
+        )
+
+    def create_messages(self):
+        users = self.all_users
+        if len(users) < 2:
+            return
+        self.log("Messages:")
+        conversations, participants, messages = [], [], []
+        seen = set()
+
+        def flush():
+            # Conversations point at their last message, so each batch goes in one transaction
+            with transaction.atomic():
+                Conversation.objects.bulk_create(conversations, batch_size=self.batch_size)
+                Message.objects.bulk_create(messages, batch_size=self.batch_size)
+                ConversationParticipant.objects.bulk_create(participants, batch_size=self.batch_size)
+            for label, rows in (('conversations', conversations), ('messages', messages)):
+                self.counts[label] = self.counts.get(label, 0) + len(rows)
+            for rows in (conversations, participants, messages):
+                rows.clear()
+
+        with explicit_timestamps(*timestamp_fields(Conversation, 'created_at'), *timestamp_fields(Message, 'sent_at')):
+            for _ in range(len(users) * self.ratios['conversations_per_user'] // 2):
+                pair = self.rng.sample(users, 2)
+                key = participant_key(*pair)
+                if key in seen:
+                    continue
+                seen.add(key)
+                sent_at = self.past(90)
+                thread = []
+                for n in range(self.ratios['messages_per_conversation']):
+                    sender_id, recipient_id = pair if n % 2 == 0 else pair[::-1]
+                    sent_at += timedelta(minutes=self.rng.randint(1, 600))
+                    thread.append(Message(
+                        id=uuid.uuid4(), sender_id=sender_id, recipient_id=recipient_id,
+                        subject='Synthetic message', content='Synthetic message body',
+                        # The latest reply is still unread
+                        is_read=n < self.ratios['messages_per_conversation'] - 1, sent_at=sent_at,
+                    ))
+                conversation = Conversation(
+                    id=uuid.uuid4(), participant_key=key, created_at=thread[0].sent_at,
+                    last_message_id=thread[-1].id, last_message_at=thread[-1].sent_at,
+                )
+                for message in thread:
+                    message.conversation_id = conversation.id
+                conversations.append(conversation)
+                messages.extend(thread)
+                participants.extend(
+                    ConversationParticipant(
+                        conversation_id=conversation.id, user_id=user_id, last_message_at=thread[-1].sent_at,
+                        unread_count=sum(1 for message in thread if message.recipient_id == user_id and not message.is_read),
+                    )
+                    for user_id in pair
+                )
+                if len(messages) >= self.batch_size:
+                    flush()
+            flush()
+        self.log(f"  conversations: {self.counts.get('conversations', 0)}")
+        self.log(f"  messages: {self.counts.get('messages', 0)}")
+
+    # Derived data
+
+    def rebuild_derived(self):
+        """Rebuild what signals would have maintained for the bulk-inserted rows."""
+        self.log("Indexes:")
+        get_search_backend().rebuild(batch_size=self.batch_size)
+        self.log("  job search index")
+        rebuild_matches(batch_size=self.batch_size)
+        self.log("  skill matches")
+        for course_id in self.course_students:
+            rebuild_course(Course(pk=course_id))
+        self.log(f"  gradebooks: {len(self.course_students)}")
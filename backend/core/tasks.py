@@ -0,0 +1,5 @@
+"""Background tasks of the core app (registered with the tasks app)."""
+
+from .fanout import deliver_fanout  # noqa: F401
+from utils.export import run_export  # noqa: F401
+from utils.tokens import purge_revoked_tokens  # noqa: F401
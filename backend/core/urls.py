@@ -3,8 +3,13 @@ from rest_framework_simplejwt.views import TokenRefreshView
 from .views import (
     RegisterView, LoginView, LogoutView, UserView, ChangePasswordView,
     NotificationListView, NotificationDetailView, MarkNotificationReadView,
-    MessageListView, MessageDetailView, SavedItemListView, SavedItemDetailView
+    UnreadNotificationCountView, BulkMarkNotificationsReadView, MarkAllNotificationsReadView,
+    NotificationFanoutListView, NotificationFanoutDetailView,
+    MessageListView, MessageDetailView, InboxView, ConversationMessagesView, MarkConversationReadView,
+    SavedItemListView, SavedItemDetailView,
+    UserExportView, QueryProfileView, RequestLogStatsView, ThrottleStatsView, EventStreamView
 )
+from utils.export import ExportStatusView
 
 urlpatterns = [
     # Authentication
@@ -17,14 +22,34 @@ urlpatterns = [
     
     # Notifications
     path('notifications/', NotificationListView.as_view(), name='notification_list'),
+    path('notifications/unread-count/', UnreadNotificationCountView.as_view(), name='notification_unread_count'),
+    path('notifications/mark-read/', BulkMarkNotificationsReadView.as_view(), name='notifications_mark_read'),
+    path('notifications/mark-all-read/', MarkAllNotificationsReadView.as_view(), name='notifications_mark_all_read'),
+    path('notifications/fanouts/', NotificationFanoutListView.as_view(), name='notification_fanout_list'),
+    path('notifications/fanouts/<uuid:pk>/', NotificationFanoutDetailView.as_view(), name='notification_fanout_detail'),
     path('notifications/<uuid:pk>/', NotificationDetailView.as_view(), name='notification_detail'),
     path('notifications/<uuid:pk>/read/', MarkNotificationReadView.as_view(), name='mark_notification_read'),
     
+    # Server push
+    path('events/', EventStreamView.as_view(), name='event_stream'),
+    
     # Messages
     path('messages/', MessageListView.as_view(), name='message_list'),
+    path('messages/inbox/', InboxView.as_view(), name='message_inbox'),
+    path('messages/conversations/<uuid:pk>/', ConversationMessagesView.as_view(), name='conversation_messages'),
+    path('messages/conversations/<uuid:pk>/read/', MarkConversationReadView.as_view(), name='conversation_read'),
     path('messages/<uuid:pk>/', MessageDetailView.as_view(), name='message_detail'),
     
     # Saved Items
     path('saved-items/', SavedItemListView.as_view(), name='saved_item_list'),
     path('saved-items/<uuid:pk>/', SavedItemDetailView.as_view(), name='saved_item_detail'),
+    
+    # Exports
+    path('users/export/', UserExportView.as_view(), name='user_export'),
+    path('exports/<uuid:pk>/', ExportStatusView.as_view(), name='export_status'),
+    
+    # Instrumentation
+    path('profiler/queries/', QueryProfileView.as_view(), name='query_profile'),
+    path('profiler/logging/', RequestLogStatsView.as_view(), name='request_log_stats'),
+    path('profiler/throttling/', ThrottleStatsView.as_view(), name='throttle_stats'),
 ]
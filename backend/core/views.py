@@ -1,52 +1,84 @@
+import logging
+
 from rest_framework import status, generics, permissions
 from rest_framework.views import APIView
 from rest_framework.response import Response
+from rest_framework.exceptions import AuthenticationFailed, PermissionDenied
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 from rest_framework_simplejwt.tokens import RefreshToken
-from django.contrib.auth import authenticate
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.views import View
 
-from .models import Notification, Message, SavedItem
+from .models import Notification, NotificationFanout, UserRole, Message, ConversationParticipant, SavedItem
 from .serializers import (
     UserRegisterSerializer, UserSerializer, LoginSerializer, ChangePasswordSerializer,
-    NotificationSerializer, MessageSerializer, SavedItemSerializer
+    NotificationSerializer, NotificationMarkReadSerializer, NotificationFanoutSerializer, MessageSerializer, ConversationSerializer,
+    MessageUpdateSerializer, MessageReadStateSerializer, SavedItemSerializer
 )
-
-
-class RegisterView(generics.CreateAPIView):
+from .notifications import unread_count, mark_read, mark_all_read
+from .messaging import mark_conversation_read, mark_message_read, mark_message_unread
+from .fanout import can_send, start_fanout
+from .realtime import event_stream
+from .exports import UserExport
+from .login import authenticate_bounded
+from utils.permissions import IsSuperuser, IsInstitutionOrMinistryAdmin
+from utils.profiling import query_stats
+from utils.prefetch import PrefetchPlanMixin
+from utils.pagination import FeedPagination, KeysetPagination
+from utils.export import ExportView
+from utils.tokens import StatelessJWTAuthentication, revoke, tokens_for_user
+from utils.jsonlog import log_stats, redact
+from utils.throttling import AdmissionControlMixin, throttle_stats
+
+
+logger = logging.getLogger(__name__)
+
+
+class RegisterView(AdmissionControlMixin, generics.CreateAPIView):
     permission_classes = [permissions.AllowAny]
     serializer_class = UserRegisterSerializer
+    throttle_scope = 'register'
+    # Hashes a password, like login
+    admission_pool = 'auth'
 
     def post(self, request, *args, **kwargs):
-        print("Incoming register data:", request.data)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Register attempt", extra={'payload': redact(request.data)})
 
         serializer = self.serializer_class(data=request.data)
         if serializer.is_valid():
             user = serializer.save()
-            refresh = RefreshToken.for_user(user)
+            refresh = tokens_for_user(user)
             return Response({
                 'refresh': str(refresh),
                 'access': str(refresh.access_token),
                 'user': UserSerializer(user).data
             }, status=status.HTTP_201_CREATED)
-        print(serializer.errors) 
+        logger.info("Registration rejected", extra={'errors': serializer.errors})
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class LoginView(APIView):
+class LoginView(AdmissionControlMixin, APIView):
     permission_classes = [permissions.AllowAny]
     serializer_class = LoginSerializer
+    # Concurrency is bounded by the login pool (see core.login)
+    throttle_scope = 'login'
+    account_field = 'email'
 
     def post(self, request):
-        print("Incoming login data:", request.data)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Login attempt", extra={'payload': redact(request.data)})
 
         serializer = self.serializer_class(data=request.data)
         if serializer.is_valid():
-            user = authenticate(
-                username=serializer.validated_data['email'],
-                password=serializer.validated_data['password']
+            user = authenticate_bounded(
+                serializer.validated_data['email'],
+                serializer.validated_data['password']
             )
             if user:
-                refresh = RefreshToken.for_user(user)
+                refresh = tokens_for_user(user)
                 return Response({
                     'refresh': str(refresh),
                     'access': str(refresh.access_token),
@@ -60,12 +92,17 @@ class LoginView(APIView):
 class LogoutView(APIView):
     def post(self, request):
         try:
-            refresh_token = request.data.get('refresh')
-            token = RefreshToken(refresh_token)
-            token.blacklist()
-            return Response(status=status.HTTP_205_RESET_CONTENT)
-        except Exception as e:
+            token = RefreshToken(request.data.get('refresh'))
+        except TokenError as e:
             return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        if str(token.get('user_id')) != str(request.user.pk):
+            return Response({'detail': 'Token belongs to another user'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        revoke(token, 'logout')
+        # The access token used for this request stops working too
+        if request.auth is not None:
+            revoke(request.auth, 'logout')
+        return Response(status=status.HTTP_205_RESET_CONTENT)
 
 
 class UserView(APIView):
@@ -92,70 +129,235 @@ class ChangePasswordView(APIView):
             
             request.user.set_password(serializer.validated_data['new_password'])
             request.user.save()
-            return Response({'success': 'Password updated'}, status=status.HTTP_200_OK)
+            # The password change revoked the old tokens
+            refresh = tokens_for_user(request.user)
+            return Response({
+                'success': 'Password updated',
+                'refresh': str(refresh),
+                'access': str(refresh.access_token),
+            }, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class NotificationListView(generics.ListAPIView):
+class NotificationListView(PrefetchPlanMixin, generics.ListAPIView):
     serializer_class = NotificationSerializer
+    pagination_class = FeedPagination
+    keyset_ordering = '-created_at'
 
     def get_queryset(self):
-        return Notification.objects.filter(user=self.request.user)
+        return Notification.objects.filter(user_id=self.request.user.pk)
 
 
-class NotificationDetailView(generics.RetrieveDestroyAPIView):
+class NotificationDetailView(PrefetchPlanMixin, generics.RetrieveDestroyAPIView):
     serializer_class = NotificationSerializer
     
     def get_queryset(self):
-        return Notification.objects.filter(user=self.request.user)
+        return Notification.objects.filter(user_id=self.request.user.pk)
 
 
 class MarkNotificationReadView(APIView):
     def post(self, request, pk):
-        notification = get_object_or_404(Notification, pk=pk, user=request.user)
-        notification.is_read = True
-        notification.save()
+        if not mark_read(request.user, [pk]):
+            # Already read, or not the user's notification
+            get_object_or_404(Notification, pk=pk, user_id=request.user.pk)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
-class MessageListView(generics.ListCreateAPIView):
+class UnreadNotificationCountView(APIView):
+    def get(self, request):
+        return Response({'unread_count': unread_count(request.user)})
+
+
+class BulkMarkNotificationsReadView(APIView):
+    def post(self, request):
+        serializer = NotificationMarkReadSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        updated = mark_read(request.user, serializer.validated_data['ids'])
+        return Response({'updated': updated, 'unread_count': unread_count(request.user)})
+
+
+class MarkAllNotificationsReadView(APIView):
+    def post(self, request):
+        updated = mark_all_read(request.user)
+        return Response({'updated': updated, 'unread_count': unread_count(request.user)})
+
+
+class NotificationFanoutMixin:
+    serializer_class = NotificationFanoutSerializer
+    
+    def get_queryset(self):
+        user = self.request.user
+        if user.role in (UserRole.SUPERUSER, UserRole.MINISTRY_ADMIN):
+            return NotificationFanout.objects.all()
+        return NotificationFanout.objects.filter(created_by_id=user.pk)
+
+
+class NotificationFanoutListView(NotificationFanoutMixin, generics.ListCreateAPIView):
+    """Announcements to a whole audience; delivery happens in the background."""
+    
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        if not can_send(request.user, data['audience_type'], data['audience_id']):
+            raise PermissionDenied("You cannot notify this audience.")
+        fanout = start_fanout(created_by=request.user, **data)
+        return Response(self.get_serializer(fanout).data, status=status.HTTP_202_ACCEPTED)
+
+
+class NotificationFanoutDetailView(NotificationFanoutMixin, generics.RetrieveAPIView):
+    pass
+
+
+class EventStreamView(View):
+    """
+    Server-sent event stream of the user's notifications and messages.
+
+    EventSource cannot set headers, so the access token may also be passed
+    as ?token=. Either way the token goes through the same revocation and
+    auth_version checks as API requests. Reconnecting clients resume from
+    Last-Event-ID.
+    """
+
+    def authenticate(self, request):
+        authenticator = StatelessJWTAuthentication()
+        token = request.GET.get('token')
+        try:
+            if token:
+                return authenticator.get_user(authenticator.get_validated_token(token))
+            result = authenticator.authenticate(request)
+        except (InvalidToken, TokenError, AuthenticationFailed):
+            return None
+        return result[0] if result else None
+
+    async def get(self, request):
+        user = await sync_to_async(self.authenticate)(request)
+        if user is None or not user.is_active:
+            return JsonResponse({'detail': 'Authentication credentials were not provided or are invalid.'}, status=401)
+
+        last_event_id = request.headers.get('Last-Event-ID') or request.GET.get('last_event_id')
+        response = StreamingHttpResponse(event_stream(user, last_event_id), content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+
+class MessageListView(PrefetchPlanMixin, generics.ListCreateAPIView):
     serializer_class = MessageSerializer
+    pagination_class = FeedPagination
+    keyset_ordering = '-sent_at'
 
     def get_queryset(self):
         user = self.request.user
-        return Message.objects.filter(recipient=user) | Message.objects.filter(sender=user)
+        return Message.objects.filter(recipient_id=user.pk) | Message.objects.filter(sender_id=user.pk)
     
     def perform_create(self, serializer):
         serializer.save(sender=self.request.user)
 
 
-class MessageDetailView(generics.RetrieveUpdateDestroyAPIView):
+class MessageDetailView(PrefetchPlanMixin, generics.RetrieveUpdateDestroyAPIView):
     serializer_class = MessageSerializer
     
     def get_queryset(self):
         user = self.request.user
-        return Message.objects.filter(recipient=user) | Message.objects.filter(sender=user)
+        return Message.objects.filter(recipient_id=user.pk) | Message.objects.filter(sender_id=user.pk)
+    
+    def get_serializer_class(self):
+        if self.request.method in ('PUT', 'PATCH'):
+            return MessageUpdateSerializer
+        return MessageSerializer
     
     def update(self, request, *args, **kwargs):
         instance = self.get_object()
-        if instance.recipient == request.user:
-            instance.is_read = True
-            instance.save()
+        if instance.recipient_id == request.user.pk:
+            # Updating a message reads it unless the recipient sets is_read=false
+            read_state = MessageReadStateSerializer(data=request.data)
+            read_state.is_valid(raise_exception=True)
+            if read_state.validated_data['is_read']:
+                mark_message_read(instance)
+            else:
+                mark_message_unread(instance)
         return super().update(request, *args, **kwargs)
 
 
-class SavedItemListView(generics.ListCreateAPIView):
+class InboxView(PrefetchPlanMixin, generics.ListAPIView):
+    """The user's conversations, most recently active first."""
+    serializer_class = ConversationSerializer
+    pagination_class = KeysetPagination
+    keyset_ordering = '-last_message_at'
+    
+    def get_queryset(self):
+        return ConversationParticipant.objects.filter(user_id=self.request.user.pk, last_message_at__isnull=False)
+
+
+class ConversationMessagesView(PrefetchPlanMixin, generics.ListAPIView):
+    """One conversation's messages, newest first."""
+    serializer_class = MessageSerializer
+    pagination_class = KeysetPagination
+    keyset_ordering = '-sent_at'
+    
+    def get_queryset(self):
+        participant = get_object_or_404(ConversationParticipant, conversation_id=self.kwargs['pk'], user_id=self.request.user.pk)
+        return Message.objects.filter(conversation_id=participant.conversation_id)
+
+
+class MarkConversationReadView(APIView):
+    def post(self, request, pk):
+        participant = get_object_or_404(ConversationParticipant, conversation_id=pk, user_id=request.user.pk)
+        updated = mark_conversation_read(participant.conversation_id, request.user)
+        return Response({'updated': updated})
+
+
+class SavedItemListView(PrefetchPlanMixin, generics.ListCreateAPIView):
     serializer_class = SavedItemSerializer
 
     def get_queryset(self):
-        return SavedItem.objects.filter(user=self.request.user)
+        return SavedItem.objects.filter(user_id=self.request.user.pk)
     
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
 
-class SavedItemDetailView(generics.RetrieveDestroyAPIView):
+class SavedItemDetailView(PrefetchPlanMixin, generics.RetrieveDestroyAPIView):
     serializer_class = SavedItemSerializer
     
     def get_queryset(self):
-        return SavedItem.objects.filter(user=self.request.user)
+        return SavedItem.objects.filter(user_id=self.request.user.pk)
+
+
+class QueryProfileView(APIView):
+    permission_classes = [IsSuperuser]
+    
+    def get(self, request):
+        return Response(query_stats.snapshot())
+    
+    def delete(self, request):
+        query_stats.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class RequestLogStatsView(APIView):
+    permission_classes = [IsSuperuser]
+    
+    def get(self, request):
+        return Response(log_stats.snapshot())
+    
+    def delete(self, request):
+        log_stats.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class ThrottleStatsView(APIView):
+    permission_classes = [IsSuperuser]
+    
+    def get(self, request):
+        return Response(throttle_stats.snapshot())
+    
+    def delete(self, request):
+        throttle_stats.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class UserExportView(ExportView):
+    permission_classes = [IsInstitutionOrMinistryAdmin]
+    export_class = UserExport
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Job, JobApplication, ResumeUpload
+from .models import Job, JobApplication, ResumeUpload, Skill
 
 class JobAdmin(admin.ModelAdmin):
     list_display = ('title', 'company', 'location', 'job_type', 'status', 'posted_by', 'created_at')
@@ -22,6 +22,12 @@ class ResumeUploadAdmin(admin.ModelAdmin):
     date_hierarchy = 'uploaded_at'
 
 
+class SkillAdmin(admin.ModelAdmin):
+    list_display = ('name',)
+    search_fields = ('name',)
+
+
 admin.site.register(Job, JobAdmin)
 admin.site.register(JobApplication, JobApplicationAdmin)
 admin.site.register(ResumeUpload, ResumeUploadAdmin)
+admin.site.register(Skill, SkillAdmin)
\ No newline at end of file
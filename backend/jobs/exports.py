@@ -0,0 +1,26 @@
+"""Job application exports (see utils.export)."""
+
+from core.models import UserRole
+from utils.export import Export, register
+from .models import Job, JobApplication
+
+
+@register
+class JobApplicationExport(Export):
+    name = 'jobs.job_applications'
+    columns = [
+        ('id', 'Application'), ('applicant__uin', 'UIN'), ('applicant__full_name', 'Full name'),
+        ('applicant__email', 'Email'), ('applicant__phone', 'Phone'), ('status', 'Status'),
+        ('resume__title', 'Resume'), ('employer_notes', 'Notes'),
+        ('applied_at', 'Applied at'), ('updated_at', 'Updated at'),
+    ]
+    filter_params = ['status']
+    ordering = ('applied_at', 'pk')
+
+    def has_permission(self):
+        if self.user.role in (UserRole.MINISTRY_ADMIN, UserRole.SUPERUSER):
+            return True
+        return Job.objects.filter(pk=self.kwargs['job_id'], posted_by=self.user).exists()
+
+    def get_queryset(self):
+        return JobApplication.objects.filter(job_id=self.kwargs['job_id'], **self.params)
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from jobs.models import JobSearchDocument
+from jobs.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = "Rebuild the job search index from scratch (e.g. after bulk imports that bypass signals)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        backend.rebuild(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Indexed {JobSearchDocument.objects.count()} jobs with {backend.__class__.__name__}"
+        ))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from jobs.matching import rebuild_matches
+from jobs.models import Skill, SkillMatch
+
+
+class Command(BaseCommand):
+    help = "Recompute every job/resume skill vector and the precomputed match index"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        rebuild_matches(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Built {SkillMatch.objects.count()} matches over {Skill.objects.count()} skills"
+        ))
@@ -0,0 +1,204 @@
+"""
+Job <-> resume skill matching.
+
+Skills from Job.skills and ResumeUpload.skills are normalised into the shared
+Skill vocabulary and stored as L2-normalised sparse vectors (JobSkill and
+ResumeSkill). The cosine similarity of every job/resume pair that shares at
+least one skill is precomputed into SkillMatch, so "top-N resumes for a job"
+and "top-N jobs for a resume" are single indexed reads. Vectors and matches
+are refreshed incrementally whenever one side changes.
+"""
+
+import math
+import re
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+
+from .models import Job, ResumeUpload, Skill, JobSkill, ResumeSkill, SkillMatch
+
+
+# Common spellings folded onto one vocabulary entry
+SKILL_ALIASES = {
+    'js': 'javascript',
+    'ts': 'typescript',
+    'node': 'node.js',
+    'nodejs': 'node.js',
+    'reactjs': 'react',
+    'react.js': 'react',
+    'postgres': 'postgresql',
+    'ml': 'machine learning',
+    'ai': 'artificial intelligence',
+    'ms excel': 'excel',
+    'microsoft excel': 'excel',
+    'golang': 'go',
+}
+
+MAX_SKILL_LENGTH = 100
+
+
+def get_min_match_score():
+    return getattr(settings, 'SKILL_MATCH_MIN_SCORE', 0.1)
+
+
+def normalize_skill(raw):
+    """Lowercase, collapse whitespace and resolve aliases for a single skill."""
+    name = re.sub(r'\s+', ' ', raw.strip().lower())
+    return SKILL_ALIASES.get(name, name)[:MAX_SKILL_LENGTH]
+
+
+def parse_skills(text):
+    """Turn a comma-separated skills field into a set of normalised names."""
+    if not text:
+        return set()
+    return {skill for skill in (normalize_skill(part) for part in re.split(r'[,;\n]', text)) if skill}
+
+
+def get_skill_ids(names):
+    """Resolve skill names to IDs, adding unseen names to the vocabulary."""
+    if not names:
+        return {}
+    skills = dict(Skill.objects.filter(name__in=names).values_list('name', 'id'))
+    missing = [name for name in names if name not in skills]
+    if missing:
+        Skill.objects.bulk_create([Skill(name=name) for name in missing], ignore_conflicts=True)
+        skills.update(Skill.objects.filter(name__in=missing).values_list('name', 'id'))
+    return skills
+
+
+def build_vector(text):
+    """Return {skill_id: weight} with weights normalised to unit length."""
+    skill_ids = get_skill_ids(parse_skills(text))
+    if not skill_ids:
+        return {}
+    weight = 1.0 / math.sqrt(len(skill_ids))
+    return {skill_id: weight for skill_id in skill_ids.values()}
+
+
+def score_against(vector, other_vectors):
+    """
+    Accumulate dot products between one vector and the rows of an inverted
+    list of (owner_id, skill_id, weight) tuples.
+    """
+    scores = defaultdict(float)
+    shared = defaultdict(int)
+    for owner_id, skill_id, weight in other_vectors:
+        scores[owner_id] += vector[skill_id] * weight
+        shared[owner_id] += 1
+    return scores, shared
+
+
+@transaction.atomic
+def update_job_matches(job):
+    vector = build_vector(job.skills)
+    current = dict(JobSkill.objects.filter(job=job).values_list('skill_id', 'weight'))
+    if current == vector:
+        return
+
+    JobSkill.objects.filter(job=job).delete()
+    SkillMatch.objects.filter(job=job).delete()
+    if not vector:
+        return
+    JobSkill.objects.bulk_create([
+        JobSkill(job=job, skill_id=skill_id, weight=weight) for skill_id, weight in vector.items()
+    ])
+
+    # Only inactive resumes lack a vector, so no join on ResumeUpload is needed
+    rows = ResumeSkill.objects.filter(skill_id__in=vector.keys()).values_list('resume_id', 'skill_id', 'weight')
+    scores, shared = score_against(vector, rows.iterator(chunk_size=2000))
+    min_score = get_min_match_score()
+    SkillMatch.objects.bulk_create([
+        SkillMatch(job=job, resume_id=resume_id, score=score, shared_skills=shared[resume_id])
+        for resume_id, score in scores.items() if score >= min_score
+    ], batch_size=1000)
+
+
+@transaction.atomic
+def update_resume_matches(resume):
+    vector = build_vector(resume.skills) if resume.is_active else {}
+    current = dict(ResumeSkill.objects.filter(resume=resume).values_list('skill_id', 'weight'))
+    if current == vector:
+        return
+
+    ResumeSkill.objects.filter(resume=resume).delete()
+    SkillMatch.objects.filter(resume=resume).delete()
+    if not vector:
+        return
+    ResumeSkill.objects.bulk_create([
+        ResumeSkill(resume=resume, skill_id=skill_id, weight=weight) for skill_id, weight in vector.items()
+    ])
+
+    rows = JobSkill.objects.filter(skill_id__in=vector.keys()).values_list('job_id', 'skill_id', 'weight')
+    scores, shared = score_against(vector, rows.iterator(chunk_size=2000))
+    min_score = get_min_match_score()
+    SkillMatch.objects.bulk_create([
+        SkillMatch(job_id=job_id, resume=resume, score=score, shared_skills=shared[job_id])
+        for job_id, score in scores.items() if score >= min_score
+    ], batch_size=1000)
+
+
+def top_resumes_for_job(job, limit=10):
+    return (
+        SkillMatch.objects
+        .filter(job=job, resume__is_active=True)
+        .select_related('resume__user')
+        .order_by('-score')[:limit]
+    )
+
+
+def top_jobs_for_resume(resume, limit=10):
+    return (
+        SkillMatch.objects
+        .filter(resume=resume, job__status='OPEN')
+        .select_related('job')
+        .order_by('-score')[:limit]
+    )
+
+
+@transaction.atomic
+def rebuild_matches(batch_size=1000):
+    """Recompute every vector and match from scratch."""
+    SkillMatch.objects.all().delete()
+    JobSkill.objects.all().delete()
+    ResumeSkill.objects.all().delete()
+
+    job_vectors = {}
+    for job_id, skills in Job.objects.values_list('id', 'skills').iterator(chunk_size=batch_size):
+        vector = build_vector(skills)
+        if vector:
+            job_vectors[job_id] = vector
+    JobSkill.objects.bulk_create([
+        JobSkill(job_id=job_id, skill_id=skill_id, weight=weight)
+        for job_id, vector in job_vectors.items() for skill_id, weight in vector.items()
+    ], batch_size=batch_size)
+
+    # Inverted list skill -> [(job_id, weight)] so each resume only visits jobs it shares a skill with
+    jobs_by_skill = defaultdict(list)
+    for job_id, vector in job_vectors.items():
+        for skill_id, weight in vector.items():
+            jobs_by_skill[skill_id].append((job_id, weight))
+
+    min_score = get_min_match_score()
+    resume_skills = []
+    matches = []
+    resumes = ResumeUpload.objects.filter(is_active=True).values_list('id', 'skills')
+    for resume_id, skills in resumes.iterator(chunk_size=batch_size):
+        vector = build_vector(skills)
+        resume_skills.extend(
+            ResumeSkill(resume_id=resume_id, skill_id=skill_id, weight=weight) for skill_id, weight in vector.items()
+        )
+        rows = (
+            (job_id, skill_id, job_weight)
+            for skill_id in vector for job_id, job_weight in jobs_by_skill.get(skill_id, ())
+        )
+        scores, shared = score_against(vector, rows)
+        matches.extend(
+            SkillMatch(job_id=job_id, resume_id=resume_id, score=score, shared_skills=shared[job_id])
+            for job_id, score in scores.items() if score >= min_score
+        )
+        if len(matches) >= batch_size:
+            SkillMatch.objects.bulk_create(matches, batch_size=batch_size)
+            matches = []
+    ResumeSkill.objects.bulk_create(resume_skills, batch_size=batch_size)
+    SkillMatch.objects.bulk_create(matches, batch_size=batch_size)
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.1 on 2026-10-18 09:08
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobSearchDocument',
+            fields=[
+                ('job', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_document', serialize=False, to='jobs.job')),
+                ('status', models.CharField(max_length=20)),
+                ('job_type', models.CharField(max_length=20)),
+                ('country', models.CharField(max_length=100)),
+                ('title_length', models.PositiveIntegerField(default=0)),
+                ('company_length', models.PositiveIntegerField(default=0)),
+                ('description_length', models.PositiveIntegerField(default=0)),
+                ('skills_length', models.PositiveIntegerField(default=0)),
+                ('indexed_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='JobSearchPosting',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('term', models.CharField(max_length=64)),
+                ('field', models.CharField(choices=[('title', 'Title'), ('company', 'Company'), ('description', 'Description'), ('skills', 'Skills')], max_length=20)),
+                ('frequency', models.PositiveIntegerField()),
+                ('field_length', models.PositiveIntegerField()),
+                ('status', models.CharField(max_length=20)),
+                ('job_type', models.CharField(max_length=20)),
+                ('country', models.CharField(max_length=100)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_postings', to='jobs.job')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['term', 'status', 'job_type', 'country'], name='jobs_posting_term_idx'), models.Index(fields=['term'], name='jobs_posting_prefix_idx', opclasses=['varchar_pattern_ops'])],
+            },
+        ),
+    ]
@@ -41,6 +41,10 @@ class Job(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'job_type', 'country', '-created_at'], name='jobs_job_listing_idx'),
+            models.Index(fields=['posted_by', '-created_at'], name='jobs_job_poster_created_idx'),
+        ]
     
     def __str__(self):
         return f"{self.title} at {self.company} ({self.get_job_type_display()})"
@@ -88,6 +92,115 @@ class JobApplication(models.Model):
     class Meta:
         unique_together = ['job', 'applicant']
         ordering = ['-applied_at']
+        indexes = [
+            models.Index(fields=['job', 'status', '-applied_at'], name='jobs_app_job_status_idx'),
+            models.Index(fields=['applicant', '-applied_at'], name='jobs_app_applicant_idx'),
+        ]
     
     def __str__(self):
         return f"{self.applicant.full_name} - {self.job.title} ({self.get_status_display()})"
+
+
+class JobSearchDocument(models.Model):
+    """
+    Per-job statistics for the search index: field lengths for BM25
+    normalisation plus the columns the search filters run against.
+    """
+    job = models.OneToOneField(Job, on_delete=models.CASCADE, primary_key=True, related_name='search_document')
+    status = models.CharField(max_length=20)
+    job_type = models.CharField(max_length=20)
+    country = models.CharField(max_length=100)
+    title_length = models.PositiveIntegerField(default=0)
+    company_length = models.PositiveIntegerField(default=0)
+    description_length = models.PositiveIntegerField(default=0)
+    skills_length = models.PositiveIntegerField(default=0)
+    indexed_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"Search document for {self.job_id}"
+
+
+class JobSearchPosting(models.Model):
+    FIELD_CHOICES = (
+        ('title', 'Title'),
+        ('company', 'Company'),
+        ('description', 'Description'),
+        ('skills', 'Skills'),
+    )
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    term = models.CharField(max_length=64)
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='search_postings')
+    field = models.CharField(max_length=20, choices=FIELD_CHOICES)
+    frequency = models.PositiveIntegerField()
+    field_length = models.PositiveIntegerField()
+    # Denormalised from the job so filters are applied inside the index
+    status = models.CharField(max_length=20)
+    job_type = models.CharField(max_length=20)
+    country = models.CharField(max_length=100)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['term', 'status', 'job_type', 'country'], name='jobs_posting_term_idx'),
+            # Lets prefix lookups (term LIKE 'abc%') use a btree on PostgreSQL
+            models.Index(fields=['term'], name='jobs_posting_prefix_idx', opclasses=['varchar_pattern_ops']),
+        ]
+    
+    def __str__(self):
+        return f"{self.term} -> {self.job_id} ({self.field})"
+
+
+class Skill(models.Model):
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    name = models.CharField(max_length=100, unique=True, help_text="Normalised skill name")
+    
+    class Meta:
+        ordering = ['name']
+    
+    def __str__(self):
+        return self.name
+
+
+class JobSkill(models.Model):
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='skill_vector')
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='job_skills')
+    weight = models.FloatField()
+    
+    class Meta:
+        unique_together = ['job', 'skill']
+    
+    def __str__(self):
+        return f"{self.job_id} - {self.skill.name} ({self.weight:.2f})"
+
+
+class ResumeSkill(models.Model):
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    resume = models.ForeignKey(ResumeUpload, on_delete=models.CASCADE, related_name='skill_vector')
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='resume_skills')
+    weight = models.FloatField()
+    
+    class Meta:
+        unique_together = ['resume', 'skill']
+    
+    def __str__(self):
+        return f"{self.resume_id} - {self.skill.name} ({self.weight:.2f})"
+
+
+class SkillMatch(models.Model):
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='skill_matches')
+    resume = models.ForeignKey(ResumeUpload, on_delete=models.CASCADE, related_name='skill_matches')
+    score = models.FloatField(help_text="Cosine similarity of the two skill vectors")
+    shared_skills = models.PositiveIntegerField()
+    
+    class Meta:
+        unique_together = ['job', 'resume']
+        ordering = ['-score']
+        indexes = [
+            models.Index(fields=['job', '-score'], name='jobs_match_job_score_idx'),
+            models.Index(fields=['resume', '-score'], name='jobs_match_resume_score_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.job_id} <-> {self.resume_id} ({self.score:.2f})"
@@ -0,0 +1,263 @@
+"""
+Full-text search backends for the Job model.
+
+The default backend keeps a tokenized inverted index (JobSearchPosting) that is
+updated incrementally whenever a Job is saved or deleted, and ranks matches
+with BM25F so per-field boosts are applied before length normalisation.
+"""
+
+import math
+import re
+from collections import Counter, defaultdict
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Avg, Count, Q
+from django.utils.module_loading import import_string
+
+from .models import Job, JobSearchDocument, JobSearchPosting
+
+
+DEFAULT_SETTINGS = {
+    'BACKEND': 'jobs.search.InvertedIndexBackend',
+    'FIELD_BOOSTS': {'title': 3.0, 'skills': 2.0, 'company': 1.5, 'description': 1.0},
+    'PREFIX_MATCHING': True,
+    'MIN_PREFIX_LENGTH': 2,
+    'MAX_RESULTS': 1000,
+    'BM25_K1': 1.2,
+    'BM25_B': 0.75,
+}
+
+INDEXED_FIELDS = ('title', 'company', 'description', 'skills')
+
+STOP_WORDS = frozenset([
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in', 'is',
+    'it', 'of', 'on', 'or', 'the', 'to', 'with', 'will', 'we', 'you', 'our',
+])
+
+TOKEN_RE = re.compile(r"[a-z0-9]+(?:[.+#][a-z0-9+#]*)*")
+
+MAX_TERM_LENGTH = 64
+
+
+def get_search_settings():
+    return {**DEFAULT_SETTINGS, **getattr(settings, 'JOB_SEARCH', {})}
+
+
+def tokenize(text):
+    """
+    Split text into lowercase terms. Keeps tokens such as 'c++', 'c#' and
+    'node.js' intact and drops trailing punctuation.
+    """
+    if not text:
+        return []
+    tokens = []
+    for token in TOKEN_RE.findall(text.lower()):
+        token = token.rstrip('.')
+        if token:
+            tokens.append(token[:MAX_TERM_LENGTH])
+    return tokens
+
+
+def analyze(text):
+    """Tokenize text for indexing, dropping stop words."""
+    return [token for token in tokenize(text) if token not in STOP_WORDS]
+
+
+class BaseJobSearchBackend:
+    """
+    Interface every job search backend implements. search() returns job IDs
+    ordered by relevance; only OPEN jobs are ever returned.
+    """
+
+    def index(self, job):
+        raise NotImplementedError
+
+    def remove(self, job_id):
+        raise NotImplementedError
+
+    def rebuild(self, batch_size=500):
+        raise NotImplementedError
+
+    def search(self, query, job_type=None, country=None):
+        raise NotImplementedError
+
+
+class DatabaseSearchBackend(BaseJobSearchBackend):
+    """
+    Unindexed fallback that matches the query as a substring of each field.
+    """
+
+    def index(self, job):
+        pass
+
+    def remove(self, job_id):
+        pass
+
+    def rebuild(self, batch_size=500):
+        pass
+
+    def search(self, query, job_type=None, country=None):
+        queryset = Job.objects.filter(status='OPEN').filter(
+            Q(title__icontains=query) |
+            Q(company__icontains=query) |
+            Q(description__icontains=query) |
+            Q(skills__icontains=query)
+        )
+        if job_type:
+            queryset = queryset.filter(job_type=job_type)
+        if country:
+            queryset = queryset.filter(country=country)
+        limit = get_search_settings()['MAX_RESULTS']
+        return list(queryset.values_list('id', flat=True)[:limit])
+
+
+class InvertedIndexBackend(BaseJobSearchBackend):
+    """
+    Inverted index stored in JobSearchPosting with BM25F ranking.
+
+    Queries are conjunctive: a job must match every query term. The last
+    term is also matched as a prefix so results update while the user types.
+    """
+
+    def __init__(self):
+        options = get_search_settings()
+        self.field_boosts = options['FIELD_BOOSTS']
+        self.prefix_matching = options['PREFIX_MATCHING']
+        self.min_prefix_length = options['MIN_PREFIX_LENGTH']
+        self.max_results = options['MAX_RESULTS']
+        self.k1 = options['BM25_K1']
+        self.b = options['BM25_B']
+
+    def build_postings(self, job):
+        postings = []
+        lengths = {}
+        for field in INDEXED_FIELDS:
+            terms = analyze(getattr(job, field))
+            lengths[field] = len(terms)
+            for term, frequency in Counter(terms).items():
+                postings.append(JobSearchPosting(
+                    term=term,
+                    job_id=job.pk,
+                    field=field,
+                    frequency=frequency,
+                    field_length=len(terms),
+                    status=job.status,
+                    job_type=job.job_type,
+                    country=job.country,
+                ))
+        return postings, lengths
+
+    def index(self, job):
+        postings, lengths = self.build_postings(job)
+        with transaction.atomic():
+            JobSearchPosting.objects.filter(job_id=job.pk).delete()
+            JobSearchPosting.objects.bulk_create(postings)
+            JobSearchDocument.objects.update_or_create(
+                job_id=job.pk,
+                defaults={
+                    'status': job.status,
+                    'job_type': job.job_type,
+                    'country': job.country,
+                    **{f'{field}_length': length for field, length in lengths.items()},
+                }
+            )
+
+    def remove(self, job_id):
+        JobSearchPosting.objects.filter(job_id=job_id).delete()
+        JobSearchDocument.objects.filter(job_id=job_id).delete()
+
+    def rebuild(self, batch_size=500):
+        with transaction.atomic():
+            JobSearchPosting.objects.all().delete()
+            JobSearchDocument.objects.all().delete()
+            postings = []
+            documents = []
+            for job in Job.objects.only(*INDEXED_FIELDS, 'status', 'job_type', 'country').iterator(chunk_size=batch_size):
+                job_postings, lengths = self.build_postings(job)
+                postings.extend(job_postings)
+                documents.append(JobSearchDocument(
+                    job_id=job.pk,
+                    status=job.status,
+                    job_type=job.job_type,
+                    country=job.country,
+                    **{f'{field}_length': length for field, length in lengths.items()},
+                ))
+                if len(postings) >= batch_size:
+                    JobSearchPosting.objects.bulk_create(postings, batch_size=batch_size)
+                    postings = []
+                if len(documents) >= batch_size:
+                    JobSearchDocument.objects.bulk_create(documents, batch_size=batch_size)
+                    documents = []
+            JobSearchPosting.objects.bulk_create(postings, batch_size=batch_size)
+            JobSearchDocument.objects.bulk_create(documents, batch_size=batch_size)
+
+    def search(self, query, job_type=None, country=None):
+        tokens = tokenize(query)
+        terms = [token for token in tokens if token not in STOP_WORDS] or tokens
+        # Keep the original order so the last term is the one being typed
+        terms = list(dict.fromkeys(terms))
+        if not terms:
+            return []
+
+        prefix_term = None
+        if self.prefix_matching and len(terms[-1]) >= self.min_prefix_length:
+            prefix_term = terms[-1]
+
+        filters = {'status': 'OPEN'}
+        if job_type:
+            filters['job_type'] = job_type
+        if country:
+            filters['country'] = country
+
+        term_query = Q(term__in=terms)
+        if prefix_term:
+            term_query |= Q(term__startswith=prefix_term)
+
+        # term -> job -> field -> (frequency, field_length)
+        matches = defaultdict(lambda: defaultdict(dict))
+        postings = JobSearchPosting.objects.filter(term_query, **filters).values_list(
+            'term', 'job_id', 'field', 'frequency', 'field_length'
+        )
+        for term, job_id, field, frequency, field_length in postings:
+            for query_term in terms:
+                if term == query_term or (query_term == prefix_term and term.startswith(prefix_term)):
+                    previous = matches[query_term][job_id].get(field, (0, field_length))
+                    matches[query_term][job_id][field] = (previous[0] + frequency, field_length)
+
+        if len(matches) < len(terms):
+            return []
+        candidates = set.intersection(*(set(jobs) for jobs in matches.values()))
+        if not candidates:
+            return []
+
+        stats = JobSearchDocument.objects.filter(**filters).aggregate(
+            total=Count('pk'),
+            **{field: Avg(f'{field}_length') for field in INDEXED_FIELDS}
+        )
+        total = stats['total'] or 1
+        average_lengths = {field: stats[field] or 1.0 for field in INDEXED_FIELDS}
+
+        scores = defaultdict(float)
+        for query_term, jobs in matches.items():
+            df = len(jobs)
+            idf = math.log(1 + (total - df + 0.5) / (df + 0.5))
+            for job_id in candidates:
+                weighted_tf = 0.0
+                for field, (frequency, field_length) in jobs[job_id].items():
+                    norm = 1 - self.b + self.b * field_length / average_lengths[field]
+                    weighted_tf += self.field_boosts.get(field, 1.0) * frequency / norm
+                scores[job_id] += idf * weighted_tf * (self.k1 + 1) / (weighted_tf + self.k1)
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], str(item[0])))
+        return [job_id for job_id, _ in ranked[:self.max_results]]
+
+
+@lru_cache(maxsize=None)
+def _load_backend(path):
+    return import_string(path)()
+
+
+def get_search_backend():
+    return _load_backend(get_search_settings()['BACKEND'])
@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import Job, JobApplication, ResumeUpload
+from .models import Job, JobApplication, ResumeUpload, SkillMatch
 from core.serializers import UserSerializer
 
 
@@ -97,3 +97,19 @@ class JobApplicationUpdateSerializer(serializers.ModelSerializer):
     class Meta:
         model = JobApplication
         fields = ['status', 'employer_notes']
+
+
+class ResumeMatchSerializer(serializers.ModelSerializer):
+    resume = ResumeUploadSerializer(read_only=True)
+    
+    class Meta:
+        model = SkillMatch
+        fields = ['resume', 'score', 'shared_skills']
+
+
+class JobMatchSerializer(serializers.ModelSerializer):
+    job = JobListSerializer(read_only=True)
+    
+    class Meta:
+        model = SkillMatch
+        fields = ['job', 'score', 'shared_skills']
@@ -0,0 +1,26 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Job, ResumeUpload
+from .search import get_search_backend
+from .matching import update_job_matches, update_resume_matches
+
+
+@receiver(post_save, sender=Job)
+def index_job(sender, instance, **kwargs):
+    get_search_backend().index(instance)
+
+
+@receiver(post_delete, sender=Job)
+def remove_job_from_index(sender, instance, **kwargs):
+    get_search_backend().remove(instance.pk)
+
+
+@receiver(post_save, sender=Job)
+def refresh_job_skill_matches(sender, instance, **kwargs):
+    update_job_matches(instance)
+
+
+@receiver(post_save, sender=ResumeUpload)
+def refresh_resume_skill_matches(sender, instance, **kwargs):
+    update_resume_matches(instance)
@@ -3,7 +3,9 @@ from .views import (
     JobListView, JobDetailView, JobCreateView, JobUpdateView, JobDeleteView,
     ResumeUploadListView, ResumeUploadDetailView, ResumeUploadCreateView, ResumeUploadUpdateView,
     JobApplicationListView, JobApplicationDetailView, JobApplicationCreateView, JobApplicationUpdateView,
-    EmployerJobApplicationsView, ApplicantJobApplicationsView, JobSearchView
+    JobApplicationExportView,
+    EmployerJobApplicationsView, ApplicantJobApplicationsView, JobSearchView,
+    JobResumeMatchesView, ResumeJobMatchesView
 )
 
 urlpatterns = [
@@ -14,12 +16,15 @@ urlpatterns = [
     path('jobs/create/', JobCreateView.as_view(), name='job_create'),
     path('jobs/<uuid:pk>/update/', JobUpdateView.as_view(), name='job_update'),
     path('jobs/<uuid:pk>/delete/', JobDeleteView.as_view(), name='job_delete'),
+    path('jobs/<uuid:pk>/matches/', JobResumeMatchesView.as_view(), name='job_resume_matches'),
+    path('jobs/<uuid:job_id>/applications/export/', JobApplicationExportView.as_view(), name='job_application_export'),
     
     # Resumes
     path('resumes/', ResumeUploadListView.as_view(), name='resume_list'),
     path('resumes/<uuid:pk>/', ResumeUploadDetailView.as_view(), name='resume_detail'),
     path('resumes/create/', ResumeUploadCreateView.as_view(), name='resume_create'),
     path('resumes/<uuid:pk>/update/', ResumeUploadUpdateView.as_view(), name='resume_update'),
+    path('resumes/<uuid:pk>/matches/', ResumeJobMatchesView.as_view(), name='resume_job_matches'),
     
     # Applications
     path('applications/', JobApplicationListView.as_view(), name='job_application_list'),
@@ -2,19 +2,26 @@ from rest_framework import generics, permissions, status, filters
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
-from django.db.models import Q
 
 from .models import Job, JobApplication, ResumeUpload
 from .serializers import (
     JobListSerializer, JobDetailSerializer, JobCreateUpdateSerializer,
     ResumeUploadSerializer, JobApplicationListSerializer,
     JobApplicationDetailSerializer, JobApplicationCreateSerializer,
-    JobApplicationUpdateSerializer
+    JobApplicationUpdateSerializer, ResumeMatchSerializer, JobMatchSerializer
 )
+from .search import get_search_backend
+from .matching import top_resumes_for_job, top_jobs_for_resume
+from .exports import JobApplicationExport
 from utils.permissions import IsEmployer, IsStudent, IsOwner
+from utils.prefetch import PrefetchPlanMixin
+from utils.conditional import ConditionalMixin
+from utils.pagination import FeedPagination
+from utils.export import ExportView
+from utils.throttling import AdmissionControlMixin
 
 
-class JobListView(generics.ListAPIView):
+class JobListView(ConditionalMixin, PrefetchPlanMixin, generics.ListAPIView):
     serializer_class = JobListSerializer
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
@@ -37,23 +44,15 @@ class JobListView(generics.ListAPIView):
         return queryset
 
 
-class JobSearchView(generics.ListAPIView):
+class JobSearchView(AdmissionControlMixin, PrefetchPlanMixin, generics.ListAPIView):
     serializer_class = JobListSerializer
     permission_classes = [permissions.IsAuthenticated]
+    throttle_scope = 'job_search'
+    admission_pool = 'search'
     
     def get_queryset(self):
         queryset = Job.objects.filter(status='OPEN')
         
-        # Search term
-        search = self.request.query_params.get('q', '')
-        if search:
-            queryset = queryset.filter(
-                Q(title__icontains=search) |
-                Q(company__icontains=search) |
-                Q(description__icontains=search) |
-                Q(skills__icontains=search)
-            )
-        
         # Filter by job type
         job_type = self.request.query_params.get('job_type')
         if job_type:
@@ -65,9 +64,30 @@ class JobSearchView(generics.ListAPIView):
             queryset = queryset.filter(country=country)
         
         return queryset
+    
+    def list(self, request, *args, **kwargs):
+        search = request.query_params.get('q', '')
+        if not search:
+            return super().list(request, *args, **kwargs)
+        
+        # The search backend ranks and filters inside the index; only the
+        # jobs on the requested page are loaded from the Job table
+        job_ids = get_search_backend().search(
+            search,
+            job_type=request.query_params.get('job_type'),
+            country=request.query_params.get('country')
+        )
+        page = self.paginate_queryset(job_ids)
+        page_ids = page if page is not None else job_ids
+        jobs = Job.objects.in_bulk(page_ids)
+        serializer = self.get_serializer([jobs[job_id] for job_id in page_ids if job_id in jobs], many=True)
+        
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data)
 
 
-class JobDetailView(generics.RetrieveAPIView):
+class JobDetailView(ConditionalMixin, PrefetchPlanMixin, generics.RetrieveAPIView):
     queryset = Job.objects.all()
     serializer_class = JobDetailSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -102,7 +122,7 @@ class JobDeleteView(generics.DestroyAPIView):
         super().check_object_permissions(request, obj)
 
 
-class ResumeUploadListView(generics.ListAPIView):
+class ResumeUploadListView(PrefetchPlanMixin, generics.ListAPIView):
     serializer_class = ResumeUploadSerializer
     permission_classes = [permissions.IsAuthenticated]
     
@@ -114,10 +134,10 @@ class ResumeUploadListView(generics.ListAPIView):
             return ResumeUpload.objects.filter(is_active=True)
         
         # Other users see only their own resumes
-        return ResumeUpload.objects.filter(user=user)
+        return ResumeUpload.objects.filter(user_id=user.pk)
 
 
-class ResumeUploadDetailView(generics.RetrieveAPIView):
+class ResumeUploadDetailView(PrefetchPlanMixin, generics.RetrieveAPIView):
     serializer_class = ResumeUploadSerializer
     permission_classes = [permissions.IsAuthenticated]
     
@@ -129,7 +149,7 @@ class ResumeUploadDetailView(generics.RetrieveAPIView):
             return ResumeUpload.objects.filter(is_active=True)
         
         # Other users see only their own resumes
-        return ResumeUpload.objects.filter(user=user)
+        return ResumeUpload.objects.filter(user_id=user.pk)
 
 
 class ResumeUploadCreateView(generics.CreateAPIView):
@@ -145,11 +165,45 @@ class ResumeUploadUpdateView(generics.UpdateAPIView):
     permission_classes = [permissions.IsAuthenticated, IsOwner]
     
     def get_queryset(self):
-        return ResumeUpload.objects.filter(user=self.request.user)
+        return ResumeUpload.objects.filter(user_id=self.request.user.pk)
+
+
+class MatchLimitMixin:
+    default_match_limit = 10
+    max_match_limit = 50
+    
+    def get_match_limit(self):
+        try:
+            limit = int(self.request.query_params.get('limit', self.default_match_limit))
+        except ValueError:
+            limit = self.default_match_limit
+        return max(1, min(limit, self.max_match_limit))
+
+
+class JobResumeMatchesView(MatchLimitMixin, generics.ListAPIView):
+    serializer_class = ResumeMatchSerializer
+    permission_classes = [IsEmployer]
+    pagination_class = None
+    
+    def get_queryset(self):
+        job = get_object_or_404(Job, pk=self.kwargs.get('pk'), posted_by_id=self.request.user.pk)
+        return top_resumes_for_job(job, limit=self.get_match_limit())
+
+
+class ResumeJobMatchesView(MatchLimitMixin, generics.ListAPIView):
+    serializer_class = JobMatchSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = None
+    
+    def get_queryset(self):
+        resume = get_object_or_404(ResumeUpload, pk=self.kwargs.get('pk'), user_id=self.request.user.pk)
+        return top_jobs_for_resume(resume, limit=self.get_match_limit())
 
 
-class JobApplicationListView(generics.ListAPIView):
+class JobApplicationListView(PrefetchPlanMixin, generics.ListAPIView):
     serializer_class = JobApplicationListSerializer
+    pagination_class = FeedPagination
+    keyset_ordering = '-applied_at'
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
@@ -157,13 +211,13 @@ class JobApplicationListView(generics.ListAPIView):
         
         # Employers see applications for their posted jobs
         if user.role == 'EMPLOYER':
-            return JobApplication.objects.filter(job__posted_by=user)
+            return JobApplication.objects.filter(job__posted_by_id=user.pk)
         
         # Students see their own applications
-        return JobApplication.objects.filter(applicant=user)
+        return JobApplication.objects.filter(applicant_id=user.pk)
 
 
-class JobApplicationDetailView(generics.RetrieveAPIView):
+class JobApplicationDetailView(PrefetchPlanMixin, generics.RetrieveAPIView):
     serializer_class = JobApplicationDetailSerializer
     permission_classes = [permissions.IsAuthenticated]
     
@@ -172,10 +226,15 @@ class JobApplicationDetailView(generics.RetrieveAPIView):
         
         # Employers see applications for their posted jobs
         if user.role == 'EMPLOYER':
-            return JobApplication.objects.filter(job__posted_by=user)
+            return JobApplication.objects.filter(job__posted_by_id=user.pk)
         
         # Students see their own applications
-        return JobApplication.objects.filter(applicant=user)
+        return JobApplication.objects.filter(applicant_id=user.pk)
+
+
+
+class JobApplicationExportView(ExportView):
+    export_class = JobApplicationExport
 
 
 class JobApplicationCreateView(generics.CreateAPIView):
@@ -187,7 +246,7 @@ class JobApplicationCreateView(generics.CreateAPIView):
         job = get_object_or_404(Job, id=job_id)
         
         # Check if user already applied for this job
-        if JobApplication.objects.filter(job=job, applicant=self.request.user).exists():
+        if JobApplication.objects.filter(job=job, applicant_id=self.request.user.pk).exists():
             raise serializer.ValidationError("You have already applied for this job")
         
         # Check if job is still open
@@ -206,21 +265,23 @@ class JobApplicationUpdateView(generics.UpdateAPIView):
         
         # Only employers can update application status
         if user.role == 'EMPLOYER':
-            return JobApplication.objects.filter(job__posted_by=user)
+            return JobApplication.objects.filter(job__posted_by_id=user.pk)
         
         # Students cannot update applications
         return JobApplication.objects.none()
 
 
-class EmployerJobApplicationsView(generics.ListAPIView):
+class EmployerJobApplicationsView(PrefetchPlanMixin, generics.ListAPIView):
     serializer_class = JobApplicationListSerializer
+    pagination_class = FeedPagination
+    keyset_ordering = '-applied_at'
     permission_classes = [IsEmployer]
     
     def get_queryset(self):
         job_id = self.request.query_params.get('job_id')
         status_filter = self.request.query_params.get('status')
         
-        queryset = JobApplication.objects.filter(job__posted_by=self.request.user)
+        queryset = JobApplication.objects.filter(job__posted_by_id=self.request.user.pk)
         
         if job_id:
             queryset = queryset.filter(job_id=job_id)
@@ -231,14 +292,16 @@ class EmployerJobApplicationsView(generics.ListAPIView):
         return queryset
 
 
-class ApplicantJobApplicationsView(generics.ListAPIView):
+class ApplicantJobApplicationsView(PrefetchPlanMixin, generics.ListAPIView):
     serializer_class = JobApplicationListSerializer
+    pagination_class = FeedPagination
+    keyset_ordering = '-applied_at'
     permission_classes = [IsStudent]
     
     def get_queryset(self):
         status_filter = self.request.query_params.get('status')
         
-        queryset = JobApplication.objects.filter(applicant=self.request.user)
+        queryset = JobApplication.objects.filter(applicant_id=self.request.user.pk)
         
         if status_filter:
             queryset = queryset.filter(status=status_filter)
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.1 on 2026-10-18 09:16
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='trackprogress',
+            index=models.Index(fields=['user', '-last_activity'], name='learning_trackprog_user_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userprogress',
+            index=models.Index(fields=['user', '-last_activity'], name='learning_progress_user_idx'),
+        ),
+    ]
@@ -123,6 +123,9 @@ class UserProgress(models.Model):
     class Meta:
         unique_together = ['user', 'resource']
         ordering = ['-last_activity']
+        indexes = [
+            models.Index(fields=['user', '-last_activity'], name='learning_progress_user_idx'),
+        ]
     
     def __str__(self):
         return f"{self.user.full_name} - {self.resource.title} ({self.get_status_display()})"
@@ -139,6 +142,9 @@ class TrackProgress(models.Model):
     class Meta:
         unique_together = ['user', 'track']
         ordering = ['-last_activity']
+        indexes = [
+            models.Index(fields=['user', '-last_activity'], name='learning_trackprog_user_idx'),
+        ]
     
     def __str__(self):
         return f"{self.user.full_name} - {self.track.title} ({self.completion_percentage}%)"
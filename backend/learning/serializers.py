@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from django.db.models import Count
 from .models import (
     LearningCategory, LearningResource, LearningTrack,
     TrackResource, UserProgress, TrackProgress
@@ -44,7 +45,7 @@ class LearningResourceDetailSerializer(serializers.ModelSerializer):
     def get_user_progress(self, obj):
         user = self.context['request'].user
         try:
-            progress = UserProgress.objects.get(user=user, resource=obj)
+            progress = UserProgress.objects.get(user_id=user.pk, resource=obj)
             return {
                 'status': progress.status,
                 'completion_percentage': progress.completion_percentage,
@@ -81,8 +82,11 @@ class LearningTrackListSerializer(serializers.ModelSerializer):
             'id', 'title', 'difficulty_level', 'difficulty_display',
             'estimated_completion_time', 'resource_count'
         ]
+        annotations = {'annotated_resource_count': Count('resources', distinct=True)}
     
     def get_resource_count(self, obj):
+        if hasattr(obj, 'annotated_resource_count'):
+            return obj.annotated_resource_count
         return obj.resources.count()
 
 
@@ -105,7 +109,7 @@ class LearningTrackDetailSerializer(serializers.ModelSerializer):
     def get_user_progress(self, obj):
         user = self.context['request'].user
         try:
-            progress = TrackProgress.objects.get(user=user, track=obj)
+            progress = TrackProgress.objects.get(user_id=user.pk, track=obj)
             return {
                 'completion_percentage': progress.completion_percentage,
                 'start_date': progress.start_date,
@@ -0,0 +1,32 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from utils.conditional import touch
+from .models import LearningResource, LearningTrack, TrackResource
+
+
+# Track and resource validators (ETag/Last-Modified) come from updated_at,
+# so changes to their nested relations touch the parent row
+
+@receiver(post_save, sender=TrackResource)
+@receiver(post_delete, sender=TrackResource)
+def touch_track_for_resource(sender, instance, **kwargs):
+    touch(LearningTrack, [instance.track_id])
+
+
+def _touch_categorised(model):
+    def handler(sender, instance, action, reverse, pk_set, **kwargs):
+        if action not in ('post_add', 'post_remove', 'post_clear'):
+            return
+        if reverse:
+            # category.tracks.add(...); a clear does not report the rows
+            touch(model, pk_set or model.objects.filter(categories=instance).values_list('pk', flat=True))
+        else:
+            touch(model, [instance.pk])
+    return handler
+
+
+touch_track_for_categories = _touch_categorised(LearningTrack)
+touch_resource_for_categories = _touch_categorised(LearningResource)
+m2m_changed.connect(touch_track_for_categories, sender=LearningTrack.categories.through)
+m2m_changed.connect(touch_resource_for_categories, sender=LearningResource.categories.through)
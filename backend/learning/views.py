@@ -2,7 +2,7 @@ from rest_framework import generics, permissions, status
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
-from django.db.models import Q
+from django.db.models import Max, Q
 
 from .models import (
     LearningCategory, LearningResource, LearningTrack,
@@ -17,17 +17,27 @@ from .serializers import (
     UserProgressUpdateSerializer, TrackProgressSerializer
 )
 from utils.permissions import IsOwner
+from utils.prefetch import PrefetchPlanMixin
+from utils.conditional import ConditionalMixin
+from utils.pagination import FeedPagination
+from utils.throttling import AdmissionControlMixin
 
 
-class CategoryListView(generics.ListAPIView):
+class CategoryListView(PrefetchPlanMixin, generics.ListAPIView):
     queryset = LearningCategory.objects.all()
     serializer_class = LearningCategorySerializer
     permission_classes = [permissions.IsAuthenticated]
 
 
-class ResourceListView(generics.ListAPIView):
+class ResourceListView(AdmissionControlMixin, ConditionalMixin, PrefetchPlanMixin, generics.ListAPIView):
     serializer_class = LearningResourceListSerializer
     permission_classes = [permissions.IsAuthenticated]
+    throttle_scope = 'resource_search'
+    admission_pool = 'search'
+    
+    def throttle_applies(self, request):
+        # Only the unindexed full-text search is expensive
+        return bool(request.query_params.get('search'))
     
     def get_queryset(self):
         queryset = LearningResource.objects.all()
@@ -64,11 +74,17 @@ class ResourceListView(generics.ListAPIView):
         return queryset
 
 
-class ResourceDetailView(generics.RetrieveAPIView):
+class ResourceDetailView(ConditionalMixin, PrefetchPlanMixin, generics.RetrieveAPIView):
     queryset = LearningResource.objects.all()
     serializer_class = LearningResourceDetailSerializer
     permission_classes = [permissions.IsAuthenticated]
     
+    def get_validator_parts(self):
+        # user_progress is part of the payload
+        return list(UserProgress.objects.filter(
+            user=self.request.user, resource_id=self.kwargs['pk']
+        ).values_list('status', 'completion_percentage', 'last_activity'))
+    
     def retrieve(self, request, *args, **kwargs):
         instance = self.get_object()
         
@@ -102,7 +118,7 @@ class ResourceDeleteView(generics.DestroyAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
 
-class TrackListView(generics.ListAPIView):
+class TrackListView(ConditionalMixin, PrefetchPlanMixin, generics.ListAPIView):
     serializer_class = LearningTrackListSerializer
     permission_classes = [permissions.IsAuthenticated]
     
@@ -131,11 +147,21 @@ class TrackListView(generics.ListAPIView):
         return queryset
 
 
-class TrackDetailView(generics.RetrieveAPIView):
+class TrackDetailView(ConditionalMixin, PrefetchPlanMixin, generics.RetrieveAPIView):
     queryset = LearningTrack.objects.all()
     serializer_class = LearningTrackDetailSerializer
     permission_classes = [permissions.IsAuthenticated]
     
+    def get_validator_parts(self):
+        # user_progress and the nested resources are part of the payload
+        latest_resource = LearningResource.objects.filter(
+            trackresource__track_id=self.kwargs['pk']
+        ).aggregate(latest=Max('updated_at'))['latest']
+        progress = list(TrackProgress.objects.filter(
+            user=self.request.user, track_id=self.kwargs['pk']
+        ).values_list('completion_percentage', 'last_activity'))
+        return [latest_resource, progress]
+    
     def retrieve(self, request, *args, **kwargs):
         instance = self.get_object()
         
@@ -215,20 +241,22 @@ class TrackResourceDeleteView(generics.DestroyAPIView):
         super().check_object_permissions(request, obj)
 
 
-class UserProgressListView(generics.ListAPIView):
+class UserProgressListView(PrefetchPlanMixin, generics.ListAPIView):
     serializer_class = UserProgressSerializer
+    pagination_class = FeedPagination
+    keyset_ordering = '-last_activity'
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
-        return UserProgress.objects.filter(user=self.request.user)
+        return UserProgress.objects.filter(user_id=self.request.user.pk)
 
 
-class UserProgressDetailView(generics.RetrieveAPIView):
+class UserProgressDetailView(PrefetchPlanMixin, generics.RetrieveAPIView):
     serializer_class = UserProgressSerializer
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
-        return UserProgress.objects.filter(user=self.request.user)
+        return UserProgress.objects.filter(user_id=self.request.user.pk)
 
 
 class UserProgressUpdateView(generics.UpdateAPIView):
@@ -236,23 +264,23 @@ class UserProgressUpdateView(generics.UpdateAPIView):
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
-        return UserProgress.objects.filter(user=self.request.user)
+        return UserProgress.objects.filter(user_id=self.request.user.pk)
 
 
-class TrackProgressListView(generics.ListAPIView):
+class TrackProgressListView(PrefetchPlanMixin, generics.ListAPIView):
     serializer_class = TrackProgressSerializer
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
-        return TrackProgress.objects.filter(user=self.request.user)
+        return TrackProgress.objects.filter(user_id=self.request.user.pk)
 
 
-class TrackProgressDetailView(generics.RetrieveAPIView):
+class TrackProgressDetailView(PrefetchPlanMixin, generics.RetrieveAPIView):
     serializer_class = TrackProgressSerializer
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
-        return TrackProgress.objects.filter(user=self.request.user)
+        return TrackProgress.objects.filter(user_id=self.request.user.pk)
 
 
 class TrackProgressUpdateView(generics.UpdateAPIView):
@@ -260,7 +288,7 @@ class TrackProgressUpdateView(generics.UpdateAPIView):
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
-        return TrackProgress.objects.filter(user=self.request.user)
+        return TrackProgress.objects.filter(user_id=self.request.user.pk)
 
 
 class RecommendedResourcesView(APIView):
@@ -270,7 +298,7 @@ class RecommendedResourcesView(APIView):
         user = request.user
         
         # Get user's previously viewed resources
-        viewed_resources = UserProgress.objects.filter(user=user).values_list('resource_id', flat=True)
+        viewed_resources = UserProgress.objects.filter(user_id=user.pk).values_list('resource_id', flat=True)
         
         # Get categories of viewed resources
         categories = LearningCategory.objects.filter(resources__id__in=viewed_resources).distinct()
@@ -1,7 +1,7 @@
 from django.contrib import admin
 from .models import (
     Course, Module, Lesson, Assignment, Submission,
-    Grade, Certificate, ZoomSession, Discussion, Group, Milestone
+    Grade, GradebookEntry, Certificate, ZoomSession, Discussion, Group, Milestone
 )
 
 
@@ -53,6 +53,12 @@ class GradeAdmin(admin.ModelAdmin):
     search_fields = ('student__full_name', 'course__title')
 
 
+class GradebookEntryAdmin(admin.ModelAdmin):
+    list_display = ('student', 'assignment', 'course', 'points_earned', 'updated_at')
+    list_filter = ('course__title',)
+    search_fields = ('student__full_name', 'assignment__title', 'course__title')
+
+
 class CertificateAdmin(admin.ModelAdmin):
     list_display = ('title', 'student', 'course', 'issue_date')
     list_filter = ('course__title', 'issue_date')
@@ -95,6 +101,7 @@ admin.site.register(Lesson, LessonAdmin)
 admin.site.register(Assignment, AssignmentAdmin)
 admin.site.register(Submission, SubmissionAdmin)
 admin.site.register(Grade, GradeAdmin)
+admin.site.register(GradebookEntry, GradebookEntryAdmin)
 admin.site.register(Certificate, CertificateAdmin)
 admin.site.register(ZoomSession, ZoomSessionAdmin)
 admin.site.register(Discussion, DiscussionAdmin)
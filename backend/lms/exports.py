@@ -0,0 +1,65 @@
+"""Course roster, submission and grade exports (see utils.export)."""
+
+from core.models import CustomUser
+from utils.export import Export, register
+from .membership import can_manage_course
+from .models import Assignment, Course, Grade, Submission
+
+
+def can_export_course(user, course_id):
+    """Whoever may manage the course (see can_manage_course) may export it."""
+    course = Course.objects.filter(pk=course_id).only('institution', 'instructor_id').first()
+    return course is not None and can_manage_course(user, course)
+
+
+@register
+class CourseRosterExport(Export):
+    name = 'lms.course_roster'
+    columns = [
+        ('uin', 'UIN'), ('full_name', 'Full name'), ('email', 'Email'), ('phone', 'Phone'),
+        ('role', 'Role'), ('institution', 'Institution'), ('program', 'Program'),
+    ]
+    ordering = ('full_name', 'pk')
+
+    def has_permission(self):
+        return can_export_course(self.user, self.kwargs['course_id'])
+
+    def get_queryset(self):
+        return CustomUser.objects.filter(enrolled_courses=self.kwargs['course_id'])
+
+
+@register
+class SubmissionExport(Export):
+    name = 'lms.assignment_submissions'
+    columns = [
+        ('id', 'Submission'), ('student__uin', 'UIN'), ('student__full_name', 'Full name'),
+        ('student__email', 'Email'), ('status', 'Status'), ('points_earned', 'Points'),
+        ('feedback', 'Feedback'), ('files_url', 'Files'), ('submitted_at', 'Submitted at'),
+    ]
+    filter_params = ['status']
+    ordering = ('submitted_at', 'pk')
+
+    def has_permission(self):
+        course_id = Assignment.objects.filter(pk=self.kwargs['assignment_id']).values_list('course_id', flat=True).first()
+        return course_id is not None and can_export_course(self.user, course_id)
+
+    def get_queryset(self):
+        return Submission.objects.filter(assignment_id=self.kwargs['assignment_id'], **self.params)
+
+
+@register
+class GradeExport(Export):
+    name = 'lms.course_grades'
+    columns = [
+        ('student__uin', 'UIN'), ('student__full_name', 'Full name'), ('student__email', 'Email'),
+        ('points_earned', 'Points'), ('points_possible', 'Points possible'),
+        ('grade_letter', 'Letter'), ('comments', 'Comments'),
+    ]
+    filter_params = ['grade_letter']
+    ordering = ('student__full_name', 'pk')
+
+    def has_permission(self):
+        return can_export_course(self.user, self.kwargs['course_id'])
+
+    def get_queryset(self):
+        return Grade.objects.filter(course_id=self.kwargs['course_id'], **self.params)
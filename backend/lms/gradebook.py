@@ -0,0 +1,273 @@
+"""
+Course gradebooks.
+
+GradebookEntry materialises the graded cells of each course's
+student x assignment matrix. Grading a submission upserts its cell and
+refreshes only that student's Grade row (total, points possible, letter),
+so a grade change never recomputes the whole course (see lms.signals).
+
+Gradebook loads a course's cells with one query and computes totals,
+percentages, letters and distribution statistics with numpy, for the grid
+endpoint and the CSV export.
+"""
+
+import warnings
+from collections import Counter
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Sum
+
+from core.models import CustomUser
+from .models import Assignment, Course, Grade, GradebookEntry, Submission
+
+
+# (minimum percentage, letter), highest first
+DEFAULT_LETTER_GRADES = [(90, 'A'), (80, 'B'), (70, 'C'), (60, 'D'), (0, 'F')]
+
+INCOMPLETE = 'I'
+
+
+def get_letter_grades():
+    return getattr(settings, 'GRADEBOOK_LETTER_GRADES', DEFAULT_LETTER_GRADES)
+
+
+def letters_for(percentages):
+    """Letter for every percentage; NaN (nothing to grade) is Incomplete."""
+    percentages = np.asarray(percentages, dtype=float)
+    scale = sorted(get_letter_grades())
+    cutoffs = np.array([cutoff for cutoff, _ in scale], dtype=float)
+    labels = np.array([letter for _, letter in scale] + [INCOMPLETE])
+    rows = np.searchsorted(cutoffs, np.nan_to_num(percentages, nan=-np.inf), side='right') - 1
+    # Below the lowest cutoff gets the lowest letter; NaN maps to the last label
+    rows = np.where(np.isnan(percentages), len(scale), np.clip(rows, 0, None))
+    return labels[rows]
+
+
+def percentages_for(totals, possible):
+    totals = np.asarray(totals, dtype=float)
+    if not possible:
+        return np.full(totals.shape, np.nan)
+    return totals / possible * 100
+
+
+# Incremental maintenance
+
+def course_points_possible(course_id):
+    return Assignment.objects.filter(course_id=course_id).aggregate(total=Sum('total_points'))['total'] or 0
+
+
+def refresh_grades(course_id, student_ids):
+    """Recompute the Grade rows of `student_ids` from their gradebook entries."""
+    student_ids = list(set(student_ids))
+    if not student_ids:
+        return
+    possible = course_points_possible(course_id)
+    totals = dict(
+        GradebookEntry.objects.filter(course_id=course_id, student_id__in=student_ids)
+        .values('student_id').annotate(total=Sum('points_earned')).values_list('student_id', 'total')
+    )
+    graded = [student_id for student_id in student_ids if student_id in totals]
+    earned = np.array([totals[student_id] for student_id in graded], dtype=float)
+    letters = letters_for(percentages_for(earned, possible))
+    Grade.objects.bulk_create(
+        [
+            Grade(
+                course_id=course_id, student_id=student_id, points_earned=float(points),
+                points_possible=float(possible), grade_letter=str(letter),
+            )
+            for student_id, points, letter in zip(graded, earned, letters)
+        ],
+        update_conflicts=True,
+        unique_fields=['student', 'course'],
+        update_fields=['points_earned', 'points_possible', 'grade_letter'],
+    )
+    # Students whose last graded work was removed
+    Grade.objects.filter(course_id=course_id, student_id__in=set(student_ids) - set(graded)).update(
+        points_earned=0, points_possible=possible, grade_letter=INCOMPLETE
+    )
+
+
+@transaction.atomic
+def sync_entries(cells):
+    """
+    Apply (assignment_id, student_id, points_earned) cells to the gradebook;
+    None removes the cell. Each affected course is refreshed once.
+    """
+    cells = list(cells)
+    if not cells:
+        return
+    course_ids = dict(
+        Assignment.objects.filter(pk__in={assignment_id for assignment_id, _, _ in cells}).values_list('pk', 'course_id')
+    )
+    upserts, removals, touched = [], [], {}
+    for assignment_id, student_id, points in cells:
+        course_id = course_ids.get(assignment_id)
+        if course_id is None:
+            continue  # the assignment is being deleted
+        touched.setdefault(course_id, set()).add(student_id)
+        if points is None:
+            removals.append((assignment_id, student_id))
+        else:
+            upserts.append(GradebookEntry(
+                course_id=course_id, assignment_id=assignment_id, student_id=student_id, points_earned=points
+            ))
+
+    GradebookEntry.objects.bulk_create(
+        upserts,
+        update_conflicts=True,
+        unique_fields=['assignment', 'student'],
+        update_fields=['points_earned', 'updated_at'],
+    )
+    for assignment_id, student_id in removals:
+        GradebookEntry.objects.filter(assignment_id=assignment_id, student_id=student_id).delete()
+    for course_id, student_ids in touched.items():
+        refresh_grades(course_id, student_ids)
+
+
+def record_submissions(submissions):
+    """Bring the gradebook in line with the given submissions' grading state."""
+    sync_entries(
+        (submission.assignment_id, submission.student_id, submission.points_earned)
+        for submission in submissions
+    )
+
+
+def refresh_course(course_id):
+    """Recompute every graded student's Grade (e.g. after total_points changed)."""
+    student_ids = GradebookEntry.objects.filter(course_id=course_id).values_list('student_id', flat=True).distinct()
+    refresh_grades(course_id, list(student_ids))
+
+
+@transaction.atomic
+def rebuild_course(course):
+    """Rematerialise a course's gradebook from its graded submissions."""
+    GradebookEntry.objects.filter(course=course).delete()
+    graded = Submission.objects.filter(assignment__course=course, points_earned__isnull=False)
+    GradebookEntry.objects.bulk_create(
+        [
+            GradebookEntry(course=course, assignment_id=assignment_id, student_id=student_id, points_earned=points)
+            for assignment_id, student_id, points in graded.values_list('assignment_id', 'student_id', 'points_earned')
+        ],
+        batch_size=1000,
+    )
+    refresh_course(course.pk)
+
+
+# Reading
+
+def _column_stats(matrix):
+    if not matrix.size:
+        # No students (or no assignments): every statistic is empty
+        empty = np.full(matrix.shape[1], np.nan)
+        return {'graded': np.zeros(matrix.shape[1], dtype=int), 'mean': empty, 'median': empty, 'std': empty, 'min': empty, 'max': empty}
+    with warnings.catch_warnings():
+        # Columns nobody has been graded on yet produce NaN, not warnings
+        warnings.simplefilter('ignore', category=RuntimeWarning)
+        return {
+            'graded': np.count_nonzero(~np.isnan(matrix), axis=0),
+            'mean': np.nanmean(matrix, axis=0),
+            'median': np.nanmedian(matrix, axis=0),
+            'std': np.nanstd(matrix, axis=0),
+            'min': np.nanmin(matrix, axis=0),
+            'max': np.nanmax(matrix, axis=0),
+        }
+
+
+def _number(value, digits=2):
+    value = float(value)
+    return None if np.isnan(value) else round(value, digits)
+
+
+class Gradebook:
+    """A course's full grade matrix, loaded with one query per table."""
+
+    def __init__(self, course):
+        self.course = course if isinstance(course, Course) else Course.objects.get(pk=course)
+        self.assignments = list(
+            Assignment.objects.filter(course=self.course).order_by('due_date', 'pk').values('id', 'title', 'total_points')
+        )
+        cells = list(GradebookEntry.objects.filter(course=self.course).values_list('student_id', 'assignment_id', 'points_earned'))
+
+        # Rows are enrolled students plus anyone graded after withdrawing
+        student_ids = set(Course.students.through.objects.filter(course=self.course).values_list('customuser_id', flat=True))
+        student_ids.update(student_id for student_id, _, _ in cells)
+        self.students = list(
+            CustomUser.objects.filter(pk__in=student_ids).order_by('full_name', 'pk').values('id', 'full_name', 'uin', 'email')
+        )
+
+        row_index = {student['id']: row for row, student in enumerate(self.students)}
+        column_index = {assignment['id']: column for column, assignment in enumerate(self.assignments)}
+        self.scores = np.full((len(self.students), len(self.assignments)), np.nan)
+        for student_id, assignment_id, points in cells:
+            self.scores[row_index[student_id], column_index[assignment_id]] = points
+
+        self.points_possible = float(sum(assignment['total_points'] for assignment in self.assignments))
+        self.totals = np.nansum(self.scores, axis=1)
+        self.percentages = percentages_for(self.totals, self.points_possible)
+        graded_rows = ~np.all(np.isnan(self.scores), axis=1)
+        # Students with nothing graded are Incomplete rather than failing
+        self.letters = letters_for(np.where(graded_rows, self.percentages, np.nan))
+
+    def summary(self):
+        graded = self.percentages[self.letters != INCOMPLETE]
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', category=RuntimeWarning)
+            return {
+                'students': len(self.students),
+                'assignments': len(self.assignments),
+                'points_possible': self.points_possible,
+                'mean_percentage': _number(np.nanmean(graded)) if graded.size else None,
+                'median_percentage': _number(np.nanmedian(graded)) if graded.size else None,
+                'std_percentage': _number(np.nanstd(graded)) if graded.size else None,
+                'letter_distribution': dict(Counter(str(letter) for letter in self.letters)),
+            }
+
+    def as_dict(self):
+        stats = _column_stats(self.scores)
+        return {
+            'course': {'id': self.course.pk, 'title': self.course.title, 'code': self.course.code},
+            'assignments': [
+                {
+                    'id': assignment['id'],
+                    'title': assignment['title'],
+                    'total_points': assignment['total_points'],
+                    'graded': int(stats['graded'][column]),
+                    'mean': _number(stats['mean'][column]),
+                    'median': _number(stats['median'][column]),
+                    'std': _number(stats['std'][column]),
+                    'min': _number(stats['min'][column]),
+                    'max': _number(stats['max'][column]),
+                }
+                for column, assignment in enumerate(self.assignments)
+            ],
+            'students': [
+                {
+                    'id': student['id'],
+                    'full_name': student['full_name'],
+                    'uin': student['uin'],
+                    'scores': [_number(value) for value in self.scores[row]],
+                    'total': _number(self.totals[row]),
+                    'percentage': _number(self.percentages[row]),
+                    'letter': str(self.letters[row]),
+                }
+                for row, student in enumerate(self.students)
+            ],
+            'summary': self.summary(),
+        }
+
+    def rows(self):
+        """Header plus one row per student, for CSV export."""
+        yield (
+            ['UIN', 'Full name', 'Email'] +
+            [f"{assignment['title']} ({assignment['total_points']})" for assignment in self.assignments] +
+            ['Total', 'Points possible', 'Percentage', 'Letter']
+        )
+        for row, student in enumerate(self.students):
+            yield (
+                [student['uin'], student['full_name'], student['email']] +
+                ['' if np.isnan(value) else _number(value) for value in self.scores[row]] +
+                [_number(self.totals[row]), self.points_possible, _number(self.percentages[row]), str(self.letters[row])]
+            )
+
@@ -0,0 +1,75 @@
+"""
+Bulk grading.
+
+grade_submissions() applies points, feedback and status to many of an
+assignment's submissions at once: the submissions are loaded in chunked IN
+queries, written back with bulk_update and the gradebook is brought up to
+date once for the whole batch. bulk_update sends no post_save, so the
+gradebook refresh (see lms.signals) and student notifications are issued
+here explicitly, one statement per batch rather than one per submission.
+"""
+
+from django.db import transaction
+
+from core.fanout import deliver_notifications
+from .gradebook import record_submissions
+from .membership import chunks
+from .models import Submission
+
+
+GRADED_FIELDS = ('points_earned', 'feedback', 'status')
+
+STATUS_MESSAGES = {
+    'graded': "Your submission for {title} has been graded.",
+    'resubmit': "Your submission for {title} needs to be resubmitted.",
+}
+
+
+@transaction.atomic
+def grade_submissions(assignment, grades, notify=True):
+    """
+    Apply `grades`, a list of dicts with a 'submission' ID and any of
+    points_earned, feedback and status, to `assignment`'s submissions.
+    """
+    grades = {grade['submission']: grade for grade in grades}
+    submissions = []
+    for chunk in chunks(grades):
+        submissions.extend(
+            Submission.objects.filter(assignment=assignment, pk__in=chunk)
+            .only('id', 'assignment_id', 'student_id', *GRADED_FIELDS)
+        )
+
+    changed = []
+    # Only a new status is news to the student, not a feedback or points edit
+    status_changed = []
+    for submission in submissions:
+        grade = grades[submission.pk]
+        before = [getattr(submission, field) for field in GRADED_FIELDS]
+        for field in GRADED_FIELDS:
+            if field in grade:
+                setattr(submission, field, grade[field])
+        if [getattr(submission, field) for field in GRADED_FIELDS] != before:
+            changed.append(submission)
+        if submission.status != before[GRADED_FIELDS.index('status')]:
+            status_changed.append(submission)
+
+    Submission.objects.bulk_update(changed, GRADED_FIELDS, batch_size=500)
+    record_submissions(changed)
+
+    notified = 0
+    if notify:
+        for status, message in STATUS_MESSAGES.items():
+            student_ids = [submission.student_id for submission in status_changed if submission.status == status]
+            deliver_notifications(
+                student_ids, assignment.title, message.format(title=assignment.title),
+                link=f"/assignments/{assignment.pk}", type='submission',
+            )
+            notified += len(student_ids)
+
+    found = {submission.pk for submission in submissions}
+    return {
+        'updated': len(changed),
+        'unchanged': len(submissions) - len(changed),
+        'notified': notified,
+        'not_found': sorted(str(pk) for pk in grades if pk not in found),
+    }
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from lms.gradebook import rebuild_course
+from lms.models import Course
+
+
+class Command(BaseCommand):
+    help = "Rematerialise course gradebooks and Grade rows from graded submissions"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--course', action='append', default=[], help="Course code (repeatable); default all courses")
+
+    def handle(self, *args, **options):
+        courses = Course.objects.order_by('code')
+        if options['course']:
+            courses = courses.filter(code__in=options['course'])
+        for course in courses.iterator():
+            rebuild_course(course)
+            self.stdout.write(f"{course.code}: {course.gradebook_entries.count()} graded cells")
+        self.stdout.write(self.style.SUCCESS("Done"))
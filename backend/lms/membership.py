@@ -0,0 +1,168 @@
+"""
+Course enrollment and group membership checks.
+
+Membership is answered with an EXISTS query against the indexed M2M through
+tables instead of loading a whole roster into Python, and every answer is
+memoised on the request so repeated checks in one request cost nothing.
+"""
+
+from django.contrib.auth.base_user import BaseUserManager
+from django.db import transaction
+
+from core.models import CustomUser, UserRole
+from utils.conditional import touch
+from .models import Course, Group
+
+
+STUDENT_ROLES = ['O_LEVEL', 'A_LEVEL', 'TERTIARY']
+
+# Roles that may manage every course
+COURSE_ADMIN_ROLES = [UserRole.MINISTRY_ADMIN, UserRole.SUPERUSER]
+
+BULK_CHUNK_SIZE = 500
+
+CourseStudent = Course.students.through
+GroupMember = Group.members.through
+
+
+def _pk(obj):
+    return getattr(obj, 'pk', obj)
+
+
+class MembershipChecker:
+    """
+    Membership questions for a single user. Accepts model instances or
+    primary keys for courses and groups.
+    """
+
+    def __init__(self, user):
+        self.user = user
+        self._cache = {}
+
+    def _memoise(self, key, query):
+        if key not in self._cache:
+            self._cache[key] = query.exists()
+        return self._cache[key]
+
+    def is_enrolled(self, course):
+        course_id = _pk(course)
+        return self._memoise(
+            ('course', course_id),
+            CourseStudent.objects.filter(course_id=course_id, customuser_id=self.user.pk)
+        )
+
+    def is_group_member(self, group):
+        group_id = _pk(group)
+        return self._memoise(
+            ('group', group_id),
+            GroupMember.objects.filter(group_id=group_id, customuser_id=self.user.pk)
+        )
+
+    def is_course_participant(self, course):
+        """True for the course instructor or an enrolled student."""
+        return course.instructor_id == self.user.pk or self.is_enrolled(course)
+
+    def forget(self, course=None, group=None):
+        if course is not None:
+            self._cache.pop(('course', _pk(course)), None)
+        if group is not None:
+            self._cache.pop(('group', _pk(group)), None)
+
+
+def get_membership(request):
+    """Return the MembershipChecker cached on this request, creating it on first use."""
+    checker = getattr(request, '_membership_checker', None)
+    if checker is None or checker.user.pk != request.user.pk:
+        checker = MembershipChecker(request.user)
+        request._membership_checker = checker
+    return checker
+
+
+def can_manage_course(user, course):
+    """
+    Whether `user` may manage `course`'s roster, gradebook and exports:
+    ministry admins and superusers, institution admins for their own
+    institution's courses, and lecturers for the courses they teach.
+    """
+    if user.role in COURSE_ADMIN_ROLES:
+        return True
+    if user.role == UserRole.INSTITUTION_ADMIN:
+        return course.institution == user.institution
+    return user.role == UserRole.LECTURER and course.instructor_id == user.pk
+
+
+def chunks(items, size=BULK_CHUNK_SIZE):
+    """Lists of at most `size` items, for chunked IN queries."""
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def resolve_users(uins=(), emails=()):
+    """
+    Look up users by UIN and email in chunked IN queries.
+
+    Returns (users, not_found) where users maps user ID to (uin, email, role).
+    """
+    uins = set(uins)
+    emails = {BaseUserManager.normalize_email(email) for email in emails}
+    users = {}
+    found_uins = set()
+    found_emails = set()
+    for uin_chunk in chunks(uins):
+        for user_id, uin, email, role in CustomUser.objects.filter(uin__in=uin_chunk).values_list('id', 'uin', 'email', 'role'):
+            users[user_id] = (uin, email, role)
+            found_uins.add(uin)
+    for email_chunk in chunks(emails):
+        for user_id, uin, email, role in CustomUser.objects.filter(email__in=email_chunk).values_list('id', 'uin', 'email', 'role'):
+            users[user_id] = (uin, email, role)
+            found_emails.add(email)
+    not_found = sorted(uins - found_uins) + sorted(emails - found_emails)
+    return users, not_found
+
+
+@transaction.atomic
+def bulk_enroll(course, uins=(), emails=()):
+    users, not_found = resolve_users(uins, emails)
+    skipped = sorted(uin for uin, _, role in users.values() if role not in STUDENT_ROLES)
+    student_ids = [user_id for user_id, (_, _, role) in users.items() if role in STUDENT_ROLES]
+
+    already_enrolled = set()
+    for chunk in chunks(student_ids):
+        already_enrolled.update(
+            CourseStudent.objects.filter(course_id=course.pk, customuser_id__in=chunk).values_list('customuser_id', flat=True)
+        )
+    new_rows = [
+        CourseStudent(course_id=course.pk, customuser_id=user_id)
+        for user_id in student_ids if user_id not in already_enrolled
+    ]
+    CourseStudent.objects.bulk_create(new_rows, batch_size=1000, ignore_conflicts=True)
+    if new_rows:
+        # bulk_create sends no m2m_changed; keep course validators fresh
+        touch(Course, [course.pk])
+
+    return {
+        'action': 'enroll',
+        'enrolled': len(new_rows),
+        'already_enrolled': len(already_enrolled),
+        'skipped_non_students': skipped,
+        'not_found': not_found,
+    }
+
+
+@transaction.atomic
+def bulk_withdraw(course, uins=(), emails=()):
+    users, not_found = resolve_users(uins, emails)
+    withdrawn = 0
+    for chunk in chunks(users.keys()):
+        deleted, _ = CourseStudent.objects.filter(course_id=course.pk, customuser_id__in=chunk).delete()
+        withdrawn += deleted
+    if withdrawn:
+        touch(Course, [course.pk])
+
+    return {
+        'action': 'withdraw',
+        'withdrawn': withdrawn,
+        'not_enrolled': len(users) - withdrawn,
+        'not_found': not_found,
+    }
@@ -0,0 +1,34 @@
+from django.db import migrations
+
+
+BATCH_SIZE = 1000
+
+
+def backfill_gradebook_entries(apps, schema_editor):
+    Submission = apps.get_model('lms', 'Submission')
+    GradebookEntry = apps.get_model('lms', 'GradebookEntry')
+
+    # Graded submissions from before the gradebook was materialised
+    rows = Submission.objects.filter(points_earned__isnull=False).order_by().values_list(
+        'assignment__course_id', 'assignment_id', 'student_id', 'points_earned'
+    )
+    batch = []
+    for course_id, assignment_id, student_id, points in rows.iterator(chunk_size=BATCH_SIZE):
+        batch.append(GradebookEntry(
+            course_id=course_id, assignment_id=assignment_id, student_id=student_id, points_earned=points
+        ))
+        if len(batch) >= BATCH_SIZE:
+            GradebookEntry.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    GradebookEntry.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lms', '0003_gradebook_entries'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_gradebook_entries, migrations.RunPython.noop),
+    ]
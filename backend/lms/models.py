@@ -93,6 +93,9 @@ class Submission(models.Model):
     class Meta:
         unique_together = ['assignment', 'student']
         ordering = ['-submitted_at']
+        indexes = [
+            models.Index(fields=['assignment', '-submitted_at'], name='lms_sub_assignment_idx'),
+        ]
     
     def __str__(self):
         return f"{self.assignment.title} - {self.student.full_name}"
@@ -125,6 +128,25 @@ class Grade(models.Model):
         return f"{self.course.code} - {self.student.full_name} - {self.grade_letter}"
 
 
+class GradebookEntry(models.Model):
+    """One cell of a course's student x assignment grade matrix (see lms.gradebook)."""
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='gradebook_entries')
+    assignment = models.ForeignKey(Assignment, on_delete=models.CASCADE, related_name='gradebook_entries')
+    student = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='gradebook_entries')
+    points_earned = models.FloatField()
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        unique_together = ['assignment', 'student']
+        indexes = [
+            models.Index(fields=['course', 'student'], name='lms_gradebook_course_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.assignment_id} - {self.student_id}: {self.points_earned}"
+
+
 class Certificate(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     student = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='certificates')
@@ -140,3 +140,51 @@ class GroupSerializer(serializers.ModelSerializer):
             'members_data', 'created_at', 'milestones'
         ]
         read_only_fields = ['created_at']
+
+
+class BulkEnrollmentSerializer(serializers.Serializer):
+    ACTION_CHOICES = (
+        ('enroll', 'Enroll'),
+        ('withdraw', 'Withdraw'),
+    )
+    MAX_STUDENTS = 10000
+    
+    action = serializers.ChoiceField(choices=ACTION_CHOICES, default='enroll')
+    uins = serializers.ListField(child=serializers.CharField(max_length=20), required=False, default=list)
+    emails = serializers.ListField(child=serializers.EmailField(), required=False, default=list)
+    
+    def validate(self, data):
+        total = len(data['uins']) + len(data['emails'])
+        if not total:
+            raise serializers.ValidationError("Provide at least one UIN or email")
+        if total > self.MAX_STUDENTS:
+            raise serializers.ValidationError(f"At most {self.MAX_STUDENTS} students can be processed per request")
+        return data
+
+
+class BulkGradeItemSerializer(serializers.Serializer):
+    submission = serializers.UUIDField()
+    points_earned = serializers.FloatField(required=False, allow_null=True, min_value=0)
+    feedback = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+    status = serializers.ChoiceField(choices=Submission.STATUS_CHOICES, required=False)
+    
+    def validate(self, data):
+        total_points = self.context['assignment'].total_points
+        if data.get('points_earned') is not None and data['points_earned'] > total_points:
+            raise serializers.ValidationError({'points_earned': f"Cannot exceed the assignment's {total_points} points"})
+        return data
+
+
+class BulkGradeSerializer(serializers.Serializer):
+    MAX_SUBMISSIONS = 5000
+    
+    grades = BulkGradeItemSerializer(many=True, allow_empty=False)
+    notify = serializers.BooleanField(default=True)
+    
+    def validate_grades(self, grades):
+        if len(grades) > self.MAX_SUBMISSIONS:
+            raise serializers.ValidationError(f"At most {self.MAX_SUBMISSIONS} submissions can be graded per request")
+        ids = [grade['submission'] for grade in grades]
+        if len(set(ids)) != len(ids):
+            raise serializers.ValidationError("Each submission may only appear once")
+        return grades
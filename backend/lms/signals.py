@@ -0,0 +1,72 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from utils.conditional import touch
+from .gradebook import record_submissions, refresh_course, refresh_grades, sync_entries
+from .models import Assignment, Course, GradebookEntry, Lesson, Module, Submission
+
+
+# Course validators (ETag/Last-Modified) come from Course.updated_at, so
+# changes to the modules and lessons nested in a course touch it
+
+@receiver(post_save, sender=Module)
+@receiver(post_delete, sender=Module)
+def touch_course_for_module(sender, instance, **kwargs):
+    touch(Course, [instance.course_id])
+
+
+@receiver(post_save, sender=Lesson)
+@receiver(post_delete, sender=Lesson)
+def touch_course_for_lesson(sender, instance, **kwargs):
+    course_id = Module.objects.filter(pk=instance.module_id).values_list('course_id', flat=True).first()
+    touch(Course, [course_id])
+
+
+@receiver(m2m_changed, sender=Course.students.through)
+def touch_course_for_enrollment(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if reverse:
+        # user.enrolled_courses.add(...); a clear does not report the courses
+        touch(Course, pk_set or Course.objects.filter(students=instance).values_list('pk', flat=True))
+    else:
+        touch(Course, [instance.pk])
+
+
+# Gradebook maintenance. Deletes cascading from a course or user remove the
+# gradebook rows too, so only deletes that start at the row itself are handled
+
+def _deleted_directly(origin, model):
+    return getattr(origin, 'model', type(origin)) is model
+
+
+@receiver(post_save, sender=Submission)
+def update_gradebook_for_submission(sender, instance, **kwargs):
+    record_submissions([instance])
+
+
+@receiver(post_delete, sender=Submission)
+def update_gradebook_for_deleted_submission(sender, instance, origin=None, **kwargs):
+    if _deleted_directly(origin, Submission):
+        sync_entries([(instance.assignment_id, instance.student_id, None)])
+
+
+@receiver(post_save, sender=Assignment)
+def update_gradebook_for_assignment(sender, instance, created, **kwargs):
+    # Points possible changed for every graded student
+    refresh_course(instance.course_id)
+
+
+@receiver(pre_delete, sender=Assignment)
+def remember_graded_students(sender, instance, origin=None, **kwargs):
+    if _deleted_directly(origin, Assignment):
+        instance._graded_student_ids = list(
+            GradebookEntry.objects.filter(course_id=instance.course_id).values_list('student_id', flat=True).distinct()
+        )
+
+
+@receiver(post_delete, sender=Assignment)
+def update_gradebook_for_deleted_assignment(sender, instance, **kwargs):
+    student_ids = getattr(instance, '_graded_student_ids', None)
+    if student_ids:
+        refresh_grades(instance.course_id, student_ids)
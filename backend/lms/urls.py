@@ -1,9 +1,10 @@
 from django.urls import path
 from .views import (
-    CourseListView, CourseDetailView, EnrollCourseView, WithdrawCourseView,
+    CourseListView, CourseDetailView, EnrollCourseView, WithdrawCourseView, BulkEnrollmentView, CourseRosterExportView,
     ModuleListView, ModuleDetailView, LessonDetailView,
-    AssignmentListView, AssignmentDetailView, SubmissionListView, SubmissionDetailView,
-    GradeListView, GradeDetailView, CertificateListView, CertificateDetailView,
+    AssignmentListView, AssignmentDetailView, SubmissionListView, SubmissionDetailView, BulkGradingView,
+    SubmissionExportView, GradeExportView,
+    GradeListView, GradeDetailView, GradebookView, GradebookExportView, CertificateListView, CertificateDetailView,
     ZoomSessionListView, ZoomSessionDetailView, DiscussionListView, DiscussionDetailView,
     DiscussionReplyListView, GroupListView, GroupDetailView, MilestoneListView, MilestoneDetailView
 )
@@ -14,6 +15,8 @@ urlpatterns = [
     path('courses/<uuid:pk>/', CourseDetailView.as_view(), name='course_detail'),
     path('courses/<uuid:pk>/enroll/', EnrollCourseView.as_view(), name='enroll_course'),
     path('courses/<uuid:pk>/withdraw/', WithdrawCourseView.as_view(), name='withdraw_course'),
+    path('courses/<uuid:pk>/enrollments/bulk/', BulkEnrollmentView.as_view(), name='bulk_enrollment'),
+    path('courses/<uuid:course_id>/roster/export/', CourseRosterExportView.as_view(), name='course_roster_export'),
     
     # Modules and Lessons
     path('courses/<uuid:course_id>/modules/', ModuleListView.as_view(), name='module_list'),
@@ -24,11 +27,16 @@ urlpatterns = [
     path('courses/<uuid:course_id>/assignments/', AssignmentListView.as_view(), name='assignment_list'),
     path('assignments/<uuid:pk>/', AssignmentDetailView.as_view(), name='assignment_detail'),
     path('assignments/<uuid:assignment_id>/submissions/', SubmissionListView.as_view(), name='submission_list'),
+    path('assignments/<uuid:assignment_id>/submissions/grade/', BulkGradingView.as_view(), name='bulk_grading'),
+    path('assignments/<uuid:assignment_id>/submissions/export/', SubmissionExportView.as_view(), name='submission_export'),
     path('submissions/<uuid:pk>/', SubmissionDetailView.as_view(), name='submission_detail'),
     
     # Grades
     path('courses/<uuid:course_id>/grades/', GradeListView.as_view(), name='grade_list'),
+    path('courses/<uuid:course_id>/grades/export/', GradeExportView.as_view(), name='grade_export'),
     path('grades/<uuid:pk>/', GradeDetailView.as_view(), name='grade_detail'),
+    path('courses/<uuid:course_id>/gradebook/', GradebookView.as_view(), name='gradebook'),
+    path('courses/<uuid:course_id>/gradebook/export/', GradebookExportView.as_view(), name='gradebook_export'),
     
     # Certificates
     path('certificates/', CertificateListView.as_view(), name='certificate_list'),
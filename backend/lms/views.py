@@ -1,6 +1,7 @@
 from rest_framework import generics, permissions, status
 from rest_framework.views import APIView
 from rest_framework.response import Response
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 
 from .models import (
@@ -13,25 +14,33 @@ from .serializers import (
     LessonSerializer, AssignmentSerializer, SubmissionSerializer,
     GradeSerializer, CertificateSerializer, ZoomSessionSerializer,
     DiscussionSerializer, DiscussionReplySerializer, GroupSerializer,
-    MilestoneSerializer
+    MilestoneSerializer, BulkEnrollmentSerializer, BulkGradeSerializer
 )
-from utils.permissions import IsLecturer, IsStudent
-
-
-class CourseListView(generics.ListAPIView):
+from .membership import get_membership, bulk_enroll, bulk_withdraw, can_manage_course
+from .gradebook import Gradebook
+from .exports import CourseRosterExport, GradeExport, SubmissionExport
+from .grading import grade_submissions
+from utils.permissions import IsLecturer, IsStudent, IsInstitutionOrMinistryAdmin
+from utils.prefetch import PrefetchPlanMixin
+from utils.conditional import ConditionalMixin
+from utils.pagination import FeedPagination
+from utils.export import ExportView, csv_lines
+
+
+class CourseListView(ConditionalMixin, PrefetchPlanMixin, generics.ListAPIView):
     serializer_class = CourseListSerializer
     
     def get_queryset(self):
         user = self.request.user
         # Show different courses based on user role
         if user.role == 'LECTURER':
-            return Course.objects.filter(instructor=user)
+            return Course.objects.filter(instructor_id=user.pk)
         elif user.role in ['O_LEVEL', 'A_LEVEL', 'TERTIARY']:
-            return Course.objects.filter(students=user)
+            return Course.objects.filter(students__id=user.pk)
         return Course.objects.all()
 
 
-class CourseDetailView(generics.RetrieveAPIView):
+class CourseDetailView(ConditionalMixin, PrefetchPlanMixin, generics.RetrieveAPIView):
     queryset = Course.objects.all()
     serializer_class = CourseDetailSerializer
 
@@ -43,7 +52,7 @@ class EnrollCourseView(APIView):
         course = get_object_or_404(Course, pk=pk)
         student = request.user
         
-        if student in course.students.all():
+        if get_membership(request).is_enrolled(course):
             return Response({'error': 'Already enrolled in this course'}, status=status.HTTP_400_BAD_REQUEST)
         
         course.students.add(student)
@@ -57,14 +66,66 @@ class WithdrawCourseView(APIView):
         course = get_object_or_404(Course, pk=pk)
         student = request.user
         
-        if student not in course.students.all():
+        if not get_membership(request).is_enrolled(course):
             return Response({'error': 'Not enrolled in this course'}, status=status.HTTP_400_BAD_REQUEST)
         
         course.students.remove(student)
         return Response({'success': 'Successfully withdrawn'}, status=status.HTTP_200_OK)
 
 
-class ModuleListView(generics.ListCreateAPIView):
+class BulkEnrollmentView(APIView):
+    permission_classes = [IsLecturer | IsInstitutionOrMinistryAdmin]
+    
+    def post(self, request, pk):
+        course = get_object_or_404(Course, pk=pk)
+        
+        # Lecturers manage their own courses, institution admins their institution's
+        if not can_manage_course(request.user, course):
+            self.permission_denied(request)
+        
+        serializer = BulkEnrollmentSerializer(data=request.data)
+        if serializer.is_valid():
+            data = serializer.validated_data
+            if data['action'] == 'withdraw':
+                result = bulk_withdraw(course, uins=data['uins'], emails=data['emails'])
+            else:
+                result = bulk_enroll(course, uins=data['uins'], emails=data['emails'])
+            return Response(result, status=status.HTTP_200_OK)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class GradebookMixin:
+    permission_classes = [IsLecturer | IsInstitutionOrMinistryAdmin]
+    
+    def get_gradebook(self, request, course_id):
+        course = get_object_or_404(Course, pk=course_id)
+        
+        # Lecturers see their own courses, institution admins their institution's
+        if not can_manage_course(request.user, course):
+            self.permission_denied(request)
+        
+        return Gradebook(course)
+
+
+class GradebookView(GradebookMixin, APIView):
+    def get(self, request, course_id):
+        return Response(self.get_gradebook(request, course_id).as_dict())
+
+
+class GradebookExportView(GradebookMixin, APIView):
+    def get(self, request, course_id):
+        gradebook = self.get_gradebook(request, course_id)
+        response = StreamingHttpResponse(csv_lines(gradebook.rows()), content_type='text/csv')
+        filename = f"{gradebook.course.code or gradebook.course.pk}-gradebook.csv"
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+
+class CourseRosterExportView(ExportView):
+    export_class = CourseRosterExport
+
+
+class ModuleListView(PrefetchPlanMixin, generics.ListCreateAPIView):
     serializer_class = ModuleSerializer
     
     def get_permissions(self):
@@ -81,13 +142,13 @@ class ModuleListView(generics.ListCreateAPIView):
         course = get_object_or_404(Course, id=course_id)
         
         # Check if user is the course instructor
-        if self.request.user != course.instructor:
+        if course.instructor_id != self.request.user.pk:
             self.permission_denied(self.request)
         
         serializer.save(course=course)
 
 
-class ModuleDetailView(generics.RetrieveUpdateDestroyAPIView):
+class ModuleDetailView(PrefetchPlanMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Module.objects.all()
     serializer_class = ModuleSerializer
     
@@ -97,7 +158,7 @@ class ModuleDetailView(generics.RetrieveUpdateDestroyAPIView):
         return [permissions.IsAuthenticated()]
 
 
-class LessonDetailView(generics.RetrieveUpdateDestroyAPIView):
+class LessonDetailView(PrefetchPlanMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Lesson.objects.all()
     serializer_class = LessonSerializer
     
@@ -107,7 +168,7 @@ class LessonDetailView(generics.RetrieveUpdateDestroyAPIView):
         return [permissions.IsAuthenticated()]
 
 
-class AssignmentListView(generics.ListCreateAPIView):
+class AssignmentListView(PrefetchPlanMixin, generics.ListCreateAPIView):
     serializer_class = AssignmentSerializer
     
     def get_permissions(self):
@@ -124,13 +185,13 @@ class AssignmentListView(generics.ListCreateAPIView):
         course = get_object_or_404(Course, id=course_id)
         
         # Check if user is the course instructor
-        if self.request.user != course.instructor:
+        if course.instructor_id != self.request.user.pk:
             self.permission_denied(self.request)
         
         serializer.save(course=course)
 
 
-class AssignmentDetailView(generics.RetrieveUpdateDestroyAPIView):
+class AssignmentDetailView(PrefetchPlanMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Assignment.objects.all()
     serializer_class = AssignmentSerializer
     
@@ -140,8 +201,10 @@ class AssignmentDetailView(generics.RetrieveUpdateDestroyAPIView):
         return [permissions.IsAuthenticated()]
 
 
-class SubmissionListView(generics.ListCreateAPIView):
+class SubmissionListView(PrefetchPlanMixin, generics.ListCreateAPIView):
     serializer_class = SubmissionSerializer
+    pagination_class = FeedPagination
+    keyset_ordering = '-submitted_at'
     
     def get_permissions(self):
         if self.request.method == 'GET':
@@ -166,23 +229,46 @@ class SubmissionListView(generics.ListCreateAPIView):
         assignment = get_object_or_404(Assignment, id=assignment_id)
         
         # Check if user is enrolled in the course
-        if self.request.user not in assignment.course.students.all():
+        if not get_membership(self.request).is_enrolled(assignment.course_id):
             self.permission_denied(self.request)
         
         serializer.save(assignment=assignment, student=self.request.user)
 
 
-class SubmissionDetailView(generics.RetrieveUpdateAPIView):
+
+class SubmissionExportView(ExportView):
+    export_class = SubmissionExport
+
+
+class SubmissionDetailView(PrefetchPlanMixin, generics.RetrieveUpdateAPIView):
     serializer_class = SubmissionSerializer
     
     def get_queryset(self):
         user = self.request.user
         if user.role == 'LECTURER':
             return Submission.objects.all()
-        return Submission.objects.filter(student=user)
+        return Submission.objects.filter(student_id=user.pk)
+
+
+class BulkGradingView(APIView):
+    permission_classes = [IsLecturer]
+    
+    def post(self, request, assignment_id):
+        assignment = get_object_or_404(Assignment, pk=assignment_id)
+        
+        # Lecturers may only grade their own courses
+        if assignment.course.instructor_id != request.user.pk:
+            self.permission_denied(request)
+        
+        serializer = BulkGradeSerializer(data=request.data, context={'assignment': assignment})
+        if serializer.is_valid():
+            data = serializer.validated_data
+            result = grade_submissions(assignment, data['grades'], notify=data['notify'])
+            return Response(result, status=status.HTTP_200_OK)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class GradeListView(generics.ListCreateAPIView):
+class GradeListView(PrefetchPlanMixin, generics.ListCreateAPIView):
     serializer_class = GradeSerializer
     
     def get_permissions(self):
@@ -197,20 +283,25 @@ class GradeListView(generics.ListCreateAPIView):
         if user.role == 'LECTURER':
             return Grade.objects.filter(course_id=course_id)
         else:
-            return Grade.objects.filter(course_id=course_id, student=user)
+            return Grade.objects.filter(course_id=course_id, student_id=user.pk)
     
     def perform_create(self, serializer):
         course_id = self.kwargs.get('course_id')
         course = get_object_or_404(Course, id=course_id)
         
         # Check if user is the course instructor
-        if self.request.user != course.instructor:
+        if course.instructor_id != self.request.user.pk:
             self.permission_denied(self.request)
         
         serializer.save(course=course)
 
 
-class GradeDetailView(generics.RetrieveUpdateDestroyAPIView):
+
+class GradeExportView(ExportView):
+    export_class = GradeExport
+
+
+class GradeDetailView(PrefetchPlanMixin, generics.RetrieveUpdateDestroyAPIView):
     serializer_class = GradeSerializer
     
     def get_permissions(self):
@@ -222,10 +313,10 @@ class GradeDetailView(generics.RetrieveUpdateDestroyAPIView):
         user = self.request.user
         if user.role == 'LECTURER':
             return Grade.objects.all()
-        return Grade.objects.filter(student=user)
+        return Grade.objects.filter(student_id=user.pk)
 
 
-class CertificateListView(generics.ListCreateAPIView):
+class CertificateListView(PrefetchPlanMixin, generics.ListCreateAPIView):
     serializer_class = CertificateSerializer
     
     def get_permissions(self):
@@ -238,10 +329,10 @@ class CertificateListView(generics.ListCreateAPIView):
         
         if user.role == 'LECTURER':
             # Show certificates for courses taught by the lecturer
-            return Certificate.objects.filter(course__instructor=user)
+            return Certificate.objects.filter(course__instructor_id=user.pk)
         else:
             # Students only see their own certificates
-            return Certificate.objects.filter(student=user)
+            return Certificate.objects.filter(student_id=user.pk)
     
     def perform_create(self, serializer):
         # Only lecturers can create certificates
@@ -251,12 +342,12 @@ class CertificateListView(generics.ListCreateAPIView):
         serializer.save()
 
 
-class CertificateDetailView(generics.RetrieveAPIView):
+class CertificateDetailView(PrefetchPlanMixin, generics.RetrieveAPIView):
     queryset = Certificate.objects.all()
     serializer_class = CertificateSerializer
 
 
-class ZoomSessionListView(generics.ListCreateAPIView):
+class ZoomSessionListView(PrefetchPlanMixin, generics.ListCreateAPIView):
     serializer_class = ZoomSessionSerializer
     
     def get_permissions(self):
@@ -273,13 +364,13 @@ class ZoomSessionListView(generics.ListCreateAPIView):
         course = get_object_or_404(Course, id=course_id)
         
         # Check if user is the course instructor
-        if self.request.user != course.instructor:
+        if course.instructor_id != self.request.user.pk:
             self.permission_denied(self.request)
         
         serializer.save(course=course)
 
 
-class ZoomSessionDetailView(generics.RetrieveUpdateDestroyAPIView):
+class ZoomSessionDetailView(PrefetchPlanMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = ZoomSession.objects.all()
     serializer_class = ZoomSessionSerializer
     
@@ -289,7 +380,7 @@ class ZoomSessionDetailView(generics.RetrieveUpdateDestroyAPIView):
         return [permissions.IsAuthenticated()]
 
 
-class DiscussionListView(generics.ListCreateAPIView):
+class DiscussionListView(PrefetchPlanMixin, generics.ListCreateAPIView):
     serializer_class = DiscussionSerializer
     
     def get_queryset(self):
@@ -301,14 +392,13 @@ class DiscussionListView(generics.ListCreateAPIView):
         course = get_object_or_404(Course, id=course_id)
         
         # Check if user is associated with the course
-        if (self.request.user != course.instructor and 
-            self.request.user not in course.students.all()):
+        if not get_membership(self.request).is_course_participant(course):
             self.permission_denied(self.request)
         
         serializer.save(course=course, created_by=self.request.user)
 
 
-class DiscussionDetailView(generics.RetrieveUpdateDestroyAPIView):
+class DiscussionDetailView(PrefetchPlanMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Discussion.objects.all()
     serializer_class = DiscussionSerializer
     
@@ -326,7 +416,7 @@ class DiscussionDetailView(generics.RetrieveUpdateDestroyAPIView):
         super().check_object_permissions(request, obj)
 
 
-class DiscussionReplyListView(generics.ListCreateAPIView):
+class DiscussionReplyListView(PrefetchPlanMixin, generics.ListCreateAPIView):
     serializer_class = DiscussionReplySerializer
     
     def get_queryset(self):
@@ -335,17 +425,16 @@ class DiscussionReplyListView(generics.ListCreateAPIView):
     
     def perform_create(self, serializer):
         discussion_id = self.kwargs.get('discussion_id')
-        discussion = get_object_or_404(Discussion, id=discussion_id)
+        discussion = get_object_or_404(Discussion.objects.select_related('course'), id=discussion_id)
         
         # Check if user is associated with the course
-        if (self.request.user != discussion.course.instructor and 
-            self.request.user not in discussion.course.students.all()):
+        if not get_membership(self.request).is_course_participant(discussion.course):
             self.permission_denied(self.request)
         
         serializer.save(discussion=discussion, author=self.request.user)
 
 
-class GroupListView(generics.ListCreateAPIView):
+class GroupListView(PrefetchPlanMixin, generics.ListCreateAPIView):
     serializer_class = GroupSerializer
     
     def get_queryset(self):
@@ -356,22 +445,21 @@ class GroupListView(generics.ListCreateAPIView):
             return Group.objects.filter(course_id=course_id)
         else:
             # Show only groups the student is a member of
-            return Group.objects.filter(course_id=course_id, members=user)
+            return Group.objects.filter(course_id=course_id, members__id=user.pk)
     
     def perform_create(self, serializer):
         course_id = self.kwargs.get('course_id')
         course = get_object_or_404(Course, id=course_id)
         
         # Only instructor or students in the course can create groups
-        if (self.request.user != course.instructor and 
-            self.request.user not in course.students.all()):
+        if not get_membership(self.request).is_course_participant(course):
             self.permission_denied(self.request)
         
         group = serializer.save(course=course)
         group.members.add(self.request.user)
 
 
-class GroupDetailView(generics.RetrieveUpdateDestroyAPIView):
+class GroupDetailView(PrefetchPlanMixin, generics.RetrieveUpdateDestroyAPIView):
     serializer_class = GroupSerializer
     
     def get_queryset(self):
@@ -381,10 +469,10 @@ class GroupDetailView(generics.RetrieveUpdateDestroyAPIView):
             return Group.objects.all()
         else:
             # Students can only access groups they are a member of
-            return Group.objects.filter(members=user)
+            return Group.objects.filter(members__id=user.pk)
 
 
-class MilestoneListView(generics.ListCreateAPIView):
+class MilestoneListView(PrefetchPlanMixin, generics.ListCreateAPIView):
     serializer_class = MilestoneSerializer
     
     def get_queryset(self):
@@ -393,17 +481,17 @@ class MilestoneListView(generics.ListCreateAPIView):
     
     def perform_create(self, serializer):
         group_id = self.kwargs.get('group_id')
-        group = get_object_or_404(Group, id=group_id)
+        group = get_object_or_404(Group.objects.select_related('course'), id=group_id)
         
         # Check if user is a member of the group or instructor
-        if (self.request.user != group.course.instructor and 
-            self.request.user not in group.members.all()):
+        if (group.course.instructor_id != self.request.user.pk and 
+            not get_membership(self.request).is_group_member(group)):
             self.permission_denied(self.request)
         
         serializer.save(group=group)
 
 
-class MilestoneDetailView(generics.RetrieveUpdateDestroyAPIView):
+class MilestoneDetailView(PrefetchPlanMixin, generics.RetrieveUpdateDestroyAPIView):
     serializer_class = MilestoneSerializer
     
     def get_queryset(self):
@@ -413,4 +501,4 @@ class MilestoneDetailView(generics.RetrieveUpdateDestroyAPIView):
             return Milestone.objects.all()
         else:
             # Students can only access milestones for groups they are a member of
-            return Milestone.objects.filter(group__members=user)
+            return Milestone.objects.filter(group__members__id=user.pk)
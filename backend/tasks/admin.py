@@ -0,0 +1,12 @@
+from django.contrib import admin
+from .models import Task
+
+
+class TaskAdmin(admin.ModelAdmin):
+    list_display = ('name', 'status', 'attempts', 'priority', 'run_after', 'duration_ms', 'created_at')
+    list_filter = ('status', 'name')
+    search_fields = ('name', 'error')
+    readonly_fields = ('locked_by', 'locked_at', 'started_at', 'finished_at', 'wait_ms', 'duration_ms')
+
+
+admin.site.register(Task, TaskAdmin)
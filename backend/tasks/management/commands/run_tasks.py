@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from tasks.registry import registered_tasks
+from tasks.worker import Worker
+
+
+class Command(BaseCommand):
+    help = "Run background task workers"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=2, help="Number of worker threads")
+        parser.add_argument('--poll-interval', type=float, default=None, help="Seconds to wait when the queue is empty")
+        parser.add_argument('--burst', action='store_true', help="Exit once no due tasks are left")
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"Registered tasks: {', '.join(registered_tasks()) or '(none)'}")
+        worker = Worker(
+            concurrency=options['concurrency'],
+            poll_interval=options['poll_interval'],
+            burst=options['burst'],
+            log=self.stdout.write,
+        )
+        processed = worker.run()
+        self.stdout.write(self.style.SUCCESS(f"Processed {processed} tasks"))
@@ -0,0 +1,29 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from tasks.metrics import task_stats
+
+
+class Command(BaseCommand):
+    help = "Show per-task outcome counts and latency percentiles"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=int, default=24)
+        parser.add_argument('--json', action='store_true')
+
+    def handle(self, *args, **options):
+        stats = task_stats(options['hours'])
+        if options['json']:
+            self.stdout.write(json.dumps(stats, indent=2))
+            return
+        for name, entry in sorted(stats.items()):
+            counts = ', '.join(f"{status} {n}" for status, n in sorted(entry['counts'].items()))
+            self.stdout.write(name)
+            self.stdout.write(f"  {counts or 'no tasks created in window'}")
+            for metric in ('wait_ms', 'duration_ms'):
+                if metric in entry:
+                    summary = entry[metric]
+                    self.stdout.write(
+                        f"  {metric}: p50 {summary['p50']}  p95 {summary['p95']}  max {summary['max']}"
+                    )
@@ -0,0 +1,38 @@
+"""Per-task latency and outcome statistics from the Task table."""
+
+from datetime import timedelta
+
+from django.db.models import Count
+from django.utils import timezone
+
+from utils.stats import percentile
+from .models import Task
+
+
+def _summary(values):
+    values = sorted(value for value in values if value is not None)
+    return {
+        'p50': round(percentile(values, 50), 2),
+        'p95': round(percentile(values, 95), 2),
+        'max': round(values[-1], 2) if values else 0.0,
+    }
+
+
+def task_stats(hours=24):
+    """Counts by status, plus wait and run time percentiles (ms) of finished tasks."""
+    since = timezone.now() - timedelta(hours=hours)
+    stats = {}
+    for row in Task.objects.filter(created_at__gte=since).values('name', 'status').annotate(n=Count('pk')):
+        stats.setdefault(row['name'], {'counts': {}})['counts'][row['status']] = row['n']
+
+    finished = Task.objects.filter(finished_at__gte=since).values_list('name', 'wait_ms', 'duration_ms')
+    timings = {}
+    for name, wait_ms, duration_ms in finished.iterator():
+        waits, durations = timings.setdefault(name, ([], []))
+        waits.append(wait_ms)
+        durations.append(duration_ms)
+    for name, (waits, durations) in timings.items():
+        entry = stats.setdefault(name, {'counts': {}})
+        entry['wait_ms'] = _summary(waits)
+        entry['duration_ms'] = _summary(durations)
+    return stats
@@ -0,0 +1,109 @@
+"""
+Task registration and enqueueing.
+
+    from tasks.registry import task
+
+    @task(max_attempts=5)
+    def rebuild_report(report_id):
+        ...
+
+    rebuild_report.delay(report.pk)
+
+delay() inserts a Task row in the caller's transaction, so work is only
+scheduled if the surrounding writes commit. Arguments and return values are
+stored as JSON (UUIDs, dates and decimals become strings). The run_tasks
+management command claims and executes queued tasks; with
+TASKS['EAGER'] = True they run in-process as soon as the transaction
+commits instead, which suits tests and a development server without a
+worker.
+"""
+
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+
+
+DEFAULT_SETTINGS = {
+    'EAGER': False,
+    'MAX_ATTEMPTS': 3,
+    # Retry n waits BACKOFF_BASE * 2^(n-1) seconds, capped at BACKOFF_MAX
+    'BACKOFF_BASE': 5,
+    'BACKOFF_MAX': 600,
+    # A running task whose worker has not finished it within LEASE_SECONDS
+    # is presumed dead and handed to another worker
+    'LEASE_SECONDS': 900,
+    'POLL_INTERVAL': 1.0,
+}
+
+
+def get_task_settings():
+    return {**DEFAULT_SETTINGS, **getattr(settings, 'TASKS', {})}
+
+
+class UnknownTask(Exception):
+    pass
+
+
+_registry = {}
+
+
+def to_json(value):
+    return json.loads(json.dumps(value, cls=DjangoJSONEncoder))
+
+
+class TaskFunction:
+    def __init__(self, func, name, max_attempts=None, priority=0):
+        self.func = func
+        self.name = name
+        self.max_attempts = max_attempts
+        self.priority = priority
+        self.__doc__ = func.__doc__
+
+    def __call__(self, *args, **kwargs):
+        return self.func(*args, **kwargs)
+
+    def delay(self, *args, **kwargs):
+        return self.enqueue(args, kwargs)
+
+    def enqueue(self, args=(), kwargs=None, priority=None, countdown=None):
+        from .models import Task
+        from .worker import execute
+
+        task = Task.objects.create(
+            name=self.name,
+            args=to_json(list(args)),
+            kwargs=to_json(kwargs or {}),
+            priority=self.priority if priority is None else priority,
+            max_attempts=self.max_attempts or get_task_settings()['MAX_ATTEMPTS'],
+            run_after=timezone.now() + timedelta(seconds=countdown or 0),
+        )
+        if get_task_settings()['EAGER']:
+            transaction.on_commit(lambda: execute(task, eager=True))
+        return task
+
+
+def task(func=None, *, name=None, max_attempts=None, priority=0):
+    """Register a function as a background task (usable with or without arguments)."""
+    def register(func):
+        task_name = name or f"{func.__module__}.{func.__name__}"
+        if task_name in _registry and _registry[task_name].func is not func:
+            raise ValueError(f"Task {task_name!r} is already registered")
+        _registry[task_name] = TaskFunction(func, task_name, max_attempts, priority)
+        return _registry[task_name]
+
+    return register(func) if func is not None else register
+
+
+def get_task(name):
+    try:
+        return _registry[name]
+    except KeyError:
+        raise UnknownTask(name)
+
+
+def registered_tasks():
+    return sorted(_registry)
@@ -0,0 +1,173 @@
+"""
+Claiming and running queued tasks.
+
+Workers claim due tasks in priority order. On databases with
+SELECT ... FOR UPDATE SKIP LOCKED (PostgreSQL, MySQL 8) concurrent workers
+lock disjoint rows and never wait on each other. SQLite has no row locks,
+so candidates are read without locking and each is taken with a
+conditional UPDATE that only succeeds while the row is unchanged; a process
+lock keeps this process's threads from racing for the same rows.
+
+A failed task is retried with exponential backoff until max_attempts is
+reached. Each attempt records how long the task waited to start and how
+long it ran (see tasks.metrics).
+"""
+
+import os
+import random
+import socket
+import threading
+import time
+import traceback
+from datetime import timedelta
+
+from django.db import close_old_connections, connections, router, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Task
+from .registry import UnknownTask, get_task, get_task_settings, to_json
+
+
+_claim_lock = threading.Lock()
+
+
+def _due(now):
+    lease = timedelta(seconds=get_task_settings()['LEASE_SECONDS'])
+    return (
+        Q(status='queued', run_after__lte=now) |
+        Q(status='running', locked_at__lt=now - lease)
+    )
+
+
+def _claim_update(worker_id, now):
+    return {
+        'status': 'running',
+        'locked_by': worker_id,
+        'locked_at': now,
+        'started_at': now,
+        'attempts': F('attempts') + 1,
+    }
+
+
+def claim(worker_id, limit=1):
+    """Claim up to `limit` due tasks for `worker_id`."""
+    now = timezone.now()
+    candidates = Task.objects.filter(_due(now)).order_by('priority', 'run_after')
+    connection = connections[router.db_for_write(Task)]
+
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic(using=connection.alias):
+            ids = list(candidates.select_for_update(skip_locked=True).values_list('pk', flat=True)[:limit])
+            Task.objects.filter(pk__in=ids).update(**_claim_update(worker_id, now))
+    else:
+        ids = []
+        with _claim_lock:
+            for pk, status, locked_at in candidates.values_list('pk', 'status', 'locked_at')[:limit]:
+                # Only wins if no other process claimed the row since we read it
+                if Task.objects.filter(pk=pk, status=status, locked_at=locked_at).update(**_claim_update(worker_id, now)):
+                    ids.append(pk)
+
+    return list(Task.objects.filter(pk__in=ids).order_by('priority', 'run_after'))
+
+
+def backoff(attempt):
+    options = get_task_settings()
+    delay = min(options['BACKOFF_MAX'], options['BACKOFF_BASE'] * 2 ** (attempt - 1))
+    # Jitter keeps tasks that failed together from retrying in lockstep
+    return delay * random.uniform(0.8, 1.0)
+
+
+def _jsonable(value):
+    try:
+        return to_json(value)
+    except (TypeError, ValueError):
+        return repr(value)
+
+
+def execute(task, eager=False):
+    """Run a claimed task and record its outcome; returns the final status."""
+    if eager:
+        # Eager mode: take the task without going through the claim query
+        now = timezone.now()
+        worker_id = f"eager:{os.getpid()}"
+        if not Task.objects.filter(pk=task.pk, status='queued').update(**_claim_update(worker_id, now)):
+            return None
+        task.refresh_from_db()
+
+    wait_ms = (task.started_at - task.run_after).total_seconds() * 1000
+    started = time.perf_counter()
+    outcome = {'wait_ms': max(wait_ms, 0.0), 'locked_by': '', 'locked_at': None}
+    try:
+        if task.attempts > task.max_attempts:
+            raise RuntimeError("Lease expired on the final attempt")
+        result = get_task(task.name)(*task.args, **task.kwargs)
+    except Exception as exc:
+        outcome['error'] = traceback.format_exc()
+        if task.attempts >= task.max_attempts or isinstance(exc, UnknownTask):
+            outcome.update(status='failed', finished_at=timezone.now())
+        else:
+            outcome.update(status='queued', run_after=timezone.now() + timedelta(seconds=backoff(task.attempts)))
+    else:
+        outcome.update(status='succeeded', result=_jsonable(result), error='', finished_at=timezone.now())
+    outcome['duration_ms'] = (time.perf_counter() - started) * 1000
+
+    # A worker whose lease was taken over must not overwrite the new attempt
+    Task.objects.filter(pk=task.pk, locked_by=task.locked_by, attempts=task.attempts).update(**outcome)
+    return outcome['status']
+
+
+class Worker:
+    """Runs `concurrency` threads that claim and execute tasks until stopped."""
+
+    def __init__(self, concurrency=1, poll_interval=None, burst=False, log=None):
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval or get_task_settings()['POLL_INTERVAL']
+        self.burst = burst
+        self.log = log or (lambda message: None)
+        self.stopping = threading.Event()
+        self.processed = 0
+        self._lock = threading.Lock()
+
+    def worker_id(self, index):
+        return f"{socket.gethostname()}:{os.getpid()}:{index}"
+
+    def loop(self, index):
+        worker_id = self.worker_id(index)
+        try:
+            while not self.stopping.is_set():
+                close_old_connections()
+                tasks = claim(worker_id)
+                if not tasks:
+                    if self.burst:
+                        break
+                    self.stopping.wait(self.poll_interval)
+                    continue
+                for task in tasks:
+                    status = execute(task)
+                    self.log(f"{task.name} [{task.pk}] attempt {task.attempts}: {status}")
+                    with self._lock:
+                        self.processed += 1
+        finally:
+            connections.close_all()
+
+    def run(self):
+        threads = [
+            threading.Thread(target=self.loop, args=(index,), name=f"task-worker-{index}", daemon=True)
+            for index in range(self.concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            while any(thread.is_alive() for thread in threads):
+                for thread in threads:
+                    thread.join(timeout=0.5)
+        except KeyboardInterrupt:
+            # Let running tasks finish; unclaimed work stays queued
+            self.stopping.set()
+            for thread in threads:
+                thread.join()
+        return self.processed
+
+    def stop(self):
+        self.stopping.set()
@@ -0,0 +1,137 @@
+"""
+HTTP conditional request helpers.
+
+Views compute a validator (ETag) cheaply, before any serialization, and
+answer 304 Not Modified when the client already holds that representation.
+"""
+
+import hashlib
+
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.utils import timezone
+from django.utils.http import http_date, parse_http_date_safe
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def parse_etags(header):
+    """Entity tags from an If-None-Match header, with weak prefixes dropped."""
+    tags = []
+    for tag in (header or '').split(','):
+        tag = tag.strip()
+        if tag.startswith('W/'):
+            tag = tag[2:]
+        if tag:
+            tags.append(tag)
+    return tags
+
+
+def etag_matches(request, etag):
+    tags = parse_etags(request.headers.get('If-None-Match'))
+    return '*' in tags or etag in tags
+
+
+def not_modified(etag, cache_control=None):
+    response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    response['ETag'] = etag
+    if cache_control:
+        response['Cache-Control'] = cache_control
+    return response
+
+
+def make_etag(*parts):
+    digest = hashlib.sha1('|'.join(str(part) for part in parts).encode()).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+class ConditionalMixin:
+    """
+    ETag/Last-Modified support for ListAPIView and RetrieveAPIView.
+
+    Validators come from one cheap query: the object's `last_modified_field`
+    for a detail view, or max(last_modified_field) plus the row count of the
+    filtered queryset for a list view. A matching If-None-Match is answered
+    with 304 before anything is serialized.
+
+    Last-Modified (and so If-Modified-Since) is only used on detail views
+    without per-user validator parts: a timestamp cannot show that a list
+    lost a row or that the user's own state changed, so those views rely on
+    the ETag alone.
+
+    Views whose payload varies per user override get_validator_parts() to add
+    the per-user state (e.g. the user's progress row). Changes to nested
+    rows must touch the parent's timestamp to be seen.
+    """
+
+    last_modified_field = 'updated_at'
+    cache_control = 'private, no-cache'
+
+    def get_validator_parts(self):
+        return []
+
+    def get_validator_queryset(self):
+        # Ordering and prefetches play no part in the validator query
+        return self.filter_queryset(self.get_queryset()).order_by().prefetch_related(None)
+
+    def get_validators(self):
+        """Return (etag, last_modified), or None to skip conditional handling."""
+        queryset = self.get_validator_queryset()
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        if lookup_url_kwarg in self.kwargs:
+            try:
+                last_modified = queryset.filter(
+                    **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+                ).values_list(self.last_modified_field, flat=True).first()
+            except (TypeError, ValueError, ValidationError):
+                return None
+            if last_modified is None:
+                return None  # let the view produce its 404
+            count = 1
+        else:
+            aggregate = queryset.aggregate(last_modified=Max(self.last_modified_field), count=Count('pk'))
+            last_modified, count = aggregate['last_modified'], aggregate['count']
+
+        parts = self.get_validator_parts()
+        etag = make_etag(
+            type(self).__name__, self.request.get_full_path(), self.request.user.pk,
+            last_modified and last_modified.isoformat(), count, *parts
+        )
+        # Only a single object's own timestamp fully describes the response
+        is_detail = lookup_url_kwarg in self.kwargs
+        return etag, last_modified if is_detail and not parts else None
+
+    def is_not_modified(self, request, etag, last_modified):
+        if request.headers.get('If-None-Match'):
+            return etag_matches(request, etag)
+        since = request.headers.get('If-Modified-Since')
+        if since and last_modified:
+            since = parse_http_date_safe(since)
+            return since is not None and int(last_modified.timestamp()) <= since
+        return False
+
+    def get(self, request, *args, **kwargs):
+        validators = self.get_validators()
+        if validators is None:
+            return super().get(request, *args, **kwargs)
+
+        etag, last_modified = validators
+        if self.is_not_modified(request, etag, last_modified):
+            response = not_modified(etag, self.cache_control)
+        else:
+            response = super().get(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+            response['ETag'] = etag
+            response['Cache-Control'] = self.cache_control
+        if last_modified:
+            response['Last-Modified'] = http_date(last_modified.timestamp())
+        response['Vary'] = 'Authorization'
+        return response
+
+
+def touch(model, pks, field='updated_at'):
+    """Bump the timestamp of parent rows whose nested data changed."""
+    pks = [pk for pk in pks if pk is not None]
+    if pks:
+        model.objects.filter(pk__in=pks).update(**{field: timezone.now()})
@@ -0,0 +1,225 @@
+"""
+Streaming CSV and NDJSON exports.
+
+An Export names a queryset and the columns to write from it:
+
+    @register
+    class RosterExport(Export):
+        name = 'lms.course_roster'
+        columns = [('uin', 'UIN'), ('email', 'Email')]
+
+        def get_queryset(self):
+            return CustomUser.objects.filter(enrolled_courses=self.kwargs['course_id'])
+
+Rows are read with values_list(...).iterator(chunk_size=...) and encoded
+line by line into a StreamingHttpResponse, so memory stays flat however
+many rows are exported. With ?background=1 the export is written to
+EXPORTS['DIRECTORY'] by a background task instead, and the file is
+fetched from ExportStatusView once the task has succeeded.
+
+Apps declare their exports in an `exports` module, which is discovered on
+first use (the task worker never imports the views).
+"""
+
+import csv
+import json
+import os
+import uuid
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import FileResponse, Http404, StreamingHttpResponse
+from django.urls import reverse
+from django.utils.module_loading import autodiscover_modules
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from tasks.registry import task
+
+
+DEFAULT_SETTINGS = {
+    # Rows fetched per database round trip
+    'CHUNK_SIZE': 2000,
+    # Where background exports are written
+    'DIRECTORY': os.path.join(settings.BASE_DIR, 'exports'),
+}
+
+
+def get_export_settings():
+    return {**DEFAULT_SETTINGS, **getattr(settings, 'EXPORTS', {})}
+
+
+# Encoding
+
+class _Echo:
+    """File-like object whose write() returns the line, for streaming csv.writer output."""
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(rows):
+    writer = csv.writer(_Echo())
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def ndjson_lines(records):
+    for record in records:
+        yield json.dumps(record, cls=DjangoJSONEncoder) + '\n'
+
+
+def _csv_value(value):
+    if value is None:
+        return ''
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+
+FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+# Exports
+
+class Export:
+    """
+    A named export. Subclasses set `name` and `columns`, a list of
+    (field lookup, CSV header) pairs, and implement get_queryset().
+    `kwargs` come from the URL; `params` holds the query parameters listed
+    in `filter_params`.
+    """
+    name = None
+    columns = []
+    filter_params = []
+    ordering = ('pk',)
+
+    def __init__(self, user, params=None, **kwargs):
+        self.user = user
+        self.kwargs = kwargs
+        self.params = {key: value for key, value in (params or {}).items() if key in self.filter_params and value}
+
+    def has_permission(self):
+        return True
+
+    def get_queryset(self):
+        raise NotImplementedError
+
+    def get_filename(self, output):
+        return f"{self.name.replace('.', '-')}.{output}"
+
+    def rows(self):
+        fields = [field for field, _ in self.columns]
+        queryset = self.get_queryset().order_by(*self.ordering).values_list(*fields)
+        return queryset.iterator(chunk_size=get_export_settings()['CHUNK_SIZE'])
+
+    def lines(self, output):
+        if output == 'ndjson':
+            fields = [field for field, _ in self.columns]
+            return ndjson_lines(dict(zip(fields, row)) for row in self.rows())
+        header = [[label for _, label in self.columns]]
+        body = ([_csv_value(value) for value in row] for row in self.rows())
+        return csv_lines(_chain(header, body))
+
+
+def _chain(*iterables):
+    for iterable in iterables:
+        yield from iterable
+
+
+_registry = {}
+_discovered = False
+
+
+def register(export_class):
+    """Class decorator making an Export available to background tasks."""
+    _registry[export_class.name] = export_class
+    return export_class
+
+
+def get_export(name):
+    global _discovered
+    if not _discovered:
+        autodiscover_modules('exports')
+        _discovered = True
+    return _registry[name]
+
+
+# Background exports
+
+@task(name='utils.run_export', max_attempts=1)
+def run_export(name, user_id, output, filename, params=None, kwargs=None):
+    from django.contrib.auth import get_user_model
+
+    user = get_user_model().objects.get(pk=user_id)
+    export = get_export(name)(user, params=params, **(kwargs or {}))
+    directory = get_export_settings()['DIRECTORY']
+    os.makedirs(directory, exist_ok=True)
+    lines = 0
+    with open(os.path.join(directory, filename), 'w', newline='', encoding='utf-8') as destination:
+        for line in export.lines(output):
+            destination.write(line)
+            lines += 1
+    return {'file': filename, 'download_name': export.get_filename(output), 'lines': lines}
+
+
+# Views
+
+class ExportView(APIView):
+    """
+    Streams `export_class` as CSV (default) or NDJSON (?output=ndjson).
+    ?background=1 queues the export and answers 202 with a status URL.
+    """
+    export_class = None
+
+    def get(self, request, **kwargs):
+        output = request.query_params.get('output', 'csv')
+        if output not in FORMATS:
+            return Response({'output': f"Choose one of: {', '.join(FORMATS)}"}, status=status.HTTP_400_BAD_REQUEST)
+
+        export = self.export_class(request.user, params=request.query_params, **kwargs)
+        if not export.has_permission():
+            self.permission_denied(request)
+
+        if request.query_params.get('background') in ('1', 'true'):
+            filename = f"{uuid.uuid4().hex}.{output}"
+            queued = run_export.enqueue(kwargs={
+                'name': export.name, 'user_id': request.user.pk, 'output': output,
+                'filename': filename, 'params': export.params, 'kwargs': kwargs,
+            })
+            # No status here: an eager task has already run by now, so
+            # the row in hand is stale; the status URL reads it fresh
+            return Response(
+                {'task': queued.pk, 'status_url': reverse('export_status', args=[queued.pk])},
+                status=status.HTTP_202_ACCEPTED,
+            )
+
+        response = StreamingHttpResponse(export.lines(output), content_type=FORMATS[output])
+        response['Content-Disposition'] = f'attachment; filename="{export.get_filename(output)}"'
+        return response
+
+
+class ExportStatusView(APIView):
+    """Status of a background export; the file itself once it has finished."""
+
+    def get(self, request, pk):
+        from tasks.models import Task
+
+        queued = Task.objects.filter(pk=pk, name=run_export.name).first()
+        if queued is None or queued.kwargs.get('user_id') != str(request.user.pk):
+            raise Http404
+        if queued.status != 'succeeded':
+            return Response({'task': queued.pk, 'status': queued.status})
+
+        path = os.path.join(get_export_settings()['DIRECTORY'], queued.result['file'])
+        if not os.path.exists(path):
+            raise Http404
+        output = queued.kwargs['output']
+        return FileResponse(
+            open(path, 'rb'), as_attachment=True,
+            filename=queued.result['download_name'], content_type=FORMATS[output],
+        )
@@ -0,0 +1,50 @@
+"""
+Password hashers with cost parameters taken from settings.
+
+PASSWORD_HASHING tunes the scrypt and Argon2 hashers without code changes:
+
+    PASSWORD_HASHING = {
+        'SCRYPT': {'WORK_FACTOR': 2 ** 14, 'BLOCK_SIZE': 8, 'PARALLELISM': 1},
+        'ARGON2': {'TIME_COST': 2, 'MEMORY_COST': 65536, 'PARALLELISM': 1},
+    }
+
+The first entry of PASSWORD_HASHERS hashes new passwords. Django upgrades a
+stored hash on the next successful login whenever it was made by another
+hasher or with other parameters (must_update), so changing either setting
+migrates users transparently. Argon2 needs the argon2-cffi package.
+"""
+
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher, ScryptPasswordHasher
+
+
+DEFAULT_SETTINGS = {
+    # n=2^14, r=8 costs 16 MiB and a few tens of milliseconds per hash
+    'SCRYPT': {'WORK_FACTOR': 2 ** 14, 'BLOCK_SIZE': 8, 'PARALLELISM': 1},
+    'ARGON2': {'TIME_COST': 2, 'MEMORY_COST': 65536, 'PARALLELISM': 1},
+}
+
+
+def get_hashing_settings(name):
+    return {**DEFAULT_SETTINGS[name], **getattr(settings, 'PASSWORD_HASHING', {}).get(name, {})}
+
+
+def _option(name, key):
+    return property(lambda self: get_hashing_settings(name)[key])
+
+
+class TunedScryptPasswordHasher(ScryptPasswordHasher):
+    work_factor = _option('SCRYPT', 'WORK_FACTOR')
+    block_size = _option('SCRYPT', 'BLOCK_SIZE')
+    parallelism = _option('SCRYPT', 'PARALLELISM')
+
+    @property
+    def maxmem(self):
+        # OpenSSL refuses anything above 32 MiB unless told otherwise
+        return 2 * 128 * self.work_factor * self.block_size
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    time_cost = _option('ARGON2', 'TIME_COST')
+    memory_cost = _option('ARGON2', 'MEMORY_COST')
+    parallelism = _option('ARGON2', 'PARALLELISM')
@@ -0,0 +1,192 @@
+"""
+Structured, sampled API logging.
+
+JsonFormatter renders log records as one JSON object per line, including
+any `extra` fields. QueueingHandler hands records to a bounded in-memory
+queue drained by a background thread, so a log call on the request path
+never waits on stdout or a file: when the queue is full the record is
+dropped and counted instead.
+
+RequestLoggingMiddleware writes one record per request to the
+`api.requests` logger, sampled per URL name (REQUEST_LOGGING['SAMPLE_RATES'],
+falling back to DEFAULT_SAMPLE_RATE). Server errors and slow requests are
+always logged. redact() masks secret fields (passwords, tokens) in any
+payload that is logged. log_stats counts logged, sampled-out and dropped
+records and the time spent logging, for the profiler endpoint.
+"""
+
+import atexit
+import json
+import logging
+import queue
+import random
+import threading
+import time
+from datetime import datetime, timezone as dt_timezone
+from logging.handlers import QueueHandler, QueueListener
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+from utils.network import client_ip
+
+
+DEFAULT_SETTINGS = {
+    'ENABLED': True,
+    'DEFAULT_SAMPLE_RATE': 0.1,
+    # URL name -> fraction of requests logged
+    'SAMPLE_RATES': {},
+    # Requests slower than this are always logged
+    'SLOW_REQUEST_MS': 1000,
+    'REDACT_FIELDS': [
+        'password', 'old_password', 'new_password', 'confirm_password',
+        'refresh', 'access', 'token', 'secret', 'authorization',
+    ],
+}
+
+REDACTED = '[REDACTED]'
+
+request_logger = logging.getLogger('api.requests')
+
+
+def get_request_logging_settings():
+    return {**DEFAULT_SETTINGS, **getattr(settings, 'REQUEST_LOGGING', {})}
+
+
+def redact(data, fields=None):
+    """Copy of `data` with the values of secret keys masked, at any depth."""
+    if fields is None:
+        fields = {field.lower() for field in get_request_logging_settings()['REDACT_FIELDS']}
+    if hasattr(data, 'items'):
+        return {
+            key: REDACTED if str(key).lower() in fields else redact(value, fields)
+            for key, value in data.items()
+        }
+    if isinstance(data, (list, tuple)):
+        return [redact(value, fields) for value in data]
+    return data
+
+
+# Formatting and handling
+
+# Attributes every LogRecord has; anything else came in through `extra`
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime', 'taskName'}
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, tz=dt_timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        entry.update((key, value) for key, value in vars(record).items() if key not in _RECORD_ATTRS)
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exc_info'] = record.exc_text
+        return json.dumps(entry, cls=DjangoJSONEncoder, default=str)
+
+
+class QueueingHandler(QueueHandler):
+    """
+    Non-blocking handler: records are queued (up to `maxsize`) and written
+    as JSON lines to `stream` by a listener thread.
+    """
+
+    def __init__(self, stream=None, maxsize=10000):
+        super().__init__(queue.Queue(maxsize))
+        target = logging.StreamHandler(stream)
+        target.setFormatter(JsonFormatter())
+        self.listener = QueueListener(self.queue, target)
+        self.listener.start()
+        atexit.register(self.close)
+
+    def close(self):
+        # Flush what is queued; safe to call more than once
+        if self.listener._thread is not None:
+            self.listener.stop()
+        super().close()
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            log_stats.add('dropped')
+
+
+# Request logging
+
+class LogStats:
+    """Thread-safe counters of the request logger's work."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def add(self, key, value=1):
+        with self._lock:
+            self._counts[key] = self._counts.get(key, 0) + value
+
+    def snapshot(self):
+        with self._lock:
+            counts = dict(self._counts)
+        logged = counts.get('logged', 0)
+        return {
+            'logged': logged,
+            'sampled_out': counts.get('sampled_out', 0),
+            'dropped': counts.get('dropped', 0),
+            'avg_logging_us': round(counts.get('logging_seconds', 0.0) / logged * 1e6, 2) if logged else 0.0,
+        }
+
+    def reset(self):
+        with self._lock:
+            self._counts = {}
+
+
+log_stats = LogStats()
+
+
+class RequestLoggingMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        response = self.get_response(request)
+        duration_ms = (time.perf_counter() - started) * 1000
+
+        options = get_request_logging_settings()
+        if not options['ENABLED']:
+            return response
+
+        match = getattr(request, 'resolver_match', None)
+        view_name = match.view_name if match else None
+        rate = options['SAMPLE_RATES'].get(view_name, options['DEFAULT_SAMPLE_RATE'])
+        always = response.status_code >= 500 or duration_ms >= options['SLOW_REQUEST_MS']
+        if not always and random.random() >= rate:
+            log_stats.add('sampled_out')
+            return response
+
+        logging_started = time.perf_counter()
+        # DRF's token user answers pk and is_authenticated without a query
+        user = getattr(request, 'user', None)
+        request_logger.log(
+            logging.WARNING if response.status_code >= 500 else logging.INFO,
+            "%s %s %s", request.method, request.path, response.status_code,
+            extra={
+                'method': request.method,
+                'path': request.path,
+                'view': view_name,
+                'status': response.status_code,
+                'duration_ms': round(duration_ms, 2),
+                'queries': int(response['X-Query-Count']) if response.has_header('X-Query-Count') else None,
+                'user_id': getattr(user, 'pk', None) if getattr(user, 'is_authenticated', False) else None,
+                'ip': client_ip(request),
+                'sample_rate': 1.0 if always else rate,
+            },
+        )
+        log_stats.add('logged')
+        log_stats.add('logging_seconds', time.perf_counter() - logging_started)
+        return response
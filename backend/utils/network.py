@@ -0,0 +1,19 @@
+"""Client address resolution shared by rate limiting and request logging."""
+
+from rest_framework.settings import api_settings
+
+
+def client_ip(request):
+    """
+    The client's address. X-Forwarded-For is client-supplied, so it is only
+    read when REST_FRAMEWORK['NUM_PROXIES'] says how many proxies append to
+    it, and then the entry the outermost proxy added is used; otherwise the
+    address is REMOTE_ADDR.
+    """
+    remote_addr = request.META.get('REMOTE_ADDR')
+    forwarded = request.META.get('HTTP_X_FORWARDED_FOR')
+    num_proxies = api_settings.NUM_PROXIES
+    if not num_proxies or not forwarded:
+        return remote_addr
+    addrs = forwarded.split(',')
+    return addrs[-min(num_proxies, len(addrs))].strip()
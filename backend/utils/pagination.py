@@ -0,0 +1,134 @@
+"""
+Keyset (cursor) pagination for high-volume feeds.
+
+FeedPagination behaves exactly like the default PageNumberPagination until
+the client sends a `cursor` query parameter (empty for the first page). From
+then on pages are selected with a keyset predicate on the view's ordering
+field plus the UUID primary key as a tiebreaker, so every page costs the
+same regardless of depth and no COUNT(*) is issued.
+"""
+
+import base64
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+def encode_cursor(values):
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    padded = cursor + '=' * (-len(cursor) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+
+
+class KeysetPaginator:
+    """
+    Forward-only keyset paginator over (ordering field, pk).
+
+    `ordering` is a single model field name, optionally prefixed with '-'.
+    """
+
+    invalid_cursor_message = 'Invalid cursor'
+
+    def __init__(self, ordering, page_size):
+        self.descending = ordering.startswith('-')
+        self.field_name = ordering.lstrip('-')
+        self.page_size = page_size
+
+    def order_by(self):
+        prefix = '-' if self.descending else ''
+        return [f'{prefix}{self.field_name}', f'{prefix}pk']
+
+    def position_filter(self, queryset, cursor):
+        try:
+            raw_value, raw_pk = decode_cursor(cursor)
+            field = queryset.model._meta.get_field(self.field_name)
+            value = field.to_python(raw_value)
+            pk = queryset.model._meta.pk.to_python(raw_pk)
+        except (ValueError, TypeError, ValidationError, UnicodeDecodeError):
+            raise NotFound(self.invalid_cursor_message)
+        op = 'lt' if self.descending else 'gt'
+        return (
+            Q(**{f'{self.field_name}__{op}': value}) |
+            Q(**{self.field_name: value, f'pk__{op}': pk})
+        )
+
+    def paginate(self, queryset, cursor):
+        queryset = queryset.order_by(*self.order_by())
+        if cursor:
+            queryset = queryset.filter(self.position_filter(queryset, cursor))
+        # One extra row tells us whether another page exists without counting
+        rows = list(queryset[:self.page_size + 1])
+        page = rows[:self.page_size]
+        next_cursor = None
+        if len(rows) > self.page_size:
+            last = page[-1]
+            value = queryset.model._meta.get_field(self.field_name).value_to_string(last)
+            next_cursor = encode_cursor([value, str(last.pk)])
+        return page, next_cursor
+
+
+class FeedPagination(PageNumberPagination):
+    """
+    Page-number pagination with opt-in keyset mode.
+
+    Views may set `keyset_ordering` (e.g. '-sent_at'); otherwise the first
+    entry of the model's Meta.ordering is used.
+    """
+
+    cursor_query_param = 'cursor'
+
+    def get_keyset_ordering(self, queryset, view):
+        ordering = getattr(view, 'keyset_ordering', None)
+        if ordering:
+            return ordering
+        return queryset.model._meta.ordering[0]
+
+    def use_keyset(self, request):
+        return self.cursor_query_param in request.query_params
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.next_cursor = None
+        self.keyset = self.use_keyset(request)
+        if not self.keyset:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        paginator = KeysetPaginator(self.get_keyset_ordering(queryset, view), self.get_page_size(request))
+        page, self.next_cursor = paginator.paginate(queryset, request.query_params.get(self.cursor_query_param))
+        return page
+
+    def get_next_link(self):
+        if not self.keyset:
+            return super().get_next_link()
+        if self.next_cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            return super().get_paginated_response(data)
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema['properties'].pop('count', None)
+        return response_schema
+
+
+class KeysetPagination(FeedPagination):
+    """Keyset pagination only; the first page needs no cursor."""
+
+    def use_keyset(self, request):
+        return True
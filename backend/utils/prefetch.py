@@ -0,0 +1,151 @@
+"""
+Declarative prefetch plans derived from serializers.
+
+Every ModelSerializer gets a plan describing the relations it touches:
+
+* dotted sources over forward foreign keys ('instructor.full_name') become
+  select_related('instructor');
+* nested serializers are followed recursively - single objects are joined
+  with select_related, many=True serializers and many-to-many fields become
+  Prefetch objects whose querysets carry the child serializer's own plan;
+* anything the serializer reaches for in code (SerializerMethodField) is
+  declared on its Meta with select_related, prefetch_related or annotations.
+
+Views mix in PrefetchPlanMixin so list and detail pages cost a constant
+number of queries regardless of page size.
+"""
+
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+
+
+class PrefetchPlan:
+    def __init__(self, select_related=(), prefetch_related=(), annotations=None):
+        self.select_related = tuple(select_related)
+        self.prefetch_related = tuple(prefetch_related)
+        self.annotations = dict(annotations or {})
+
+    def apply(self, queryset):
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*self.prefetch_related)
+        if self.annotations:
+            ordering = queryset.query.order_by or queryset.model._meta.ordering
+            # Aggregate annotations add a GROUP BY, which drops Meta.ordering
+            queryset = queryset.annotate(**self.annotations).order_by(*ordering)
+        return queryset
+
+
+def _get_field(model, name):
+    try:
+        return model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return None
+
+
+def _is_forward_single(field):
+    return field is not None and field.is_relation and field.concrete and (field.many_to_one or field.one_to_one)
+
+
+def _select_path(model, parts):
+    """Follow forward FK/one-to-one attributes and return the joinable path."""
+    path = []
+    for part in parts:
+        field = _get_field(model, part)
+        if not _is_forward_single(field):
+            break
+        path.append(part)
+        model = field.related_model
+    return '__'.join(path)
+
+
+def _lookup_name(lookup):
+    return lookup.prefetch_to if isinstance(lookup, Prefetch) else lookup
+
+
+def _prefixed(prefix, lookup):
+    if isinstance(lookup, Prefetch):
+        return Prefetch(f'{prefix}__{lookup.prefetch_through}', queryset=lookup.queryset)
+    return f'{prefix}__{lookup}'
+
+
+@lru_cache(maxsize=None)
+def get_prefetch_plan(serializer_class):
+    meta = getattr(serializer_class, 'Meta', None)
+    model = getattr(meta, 'model', None)
+    if model is None:
+        return PrefetchPlan()
+
+    select = set(getattr(meta, 'select_related', ()))
+    prefetch = {_lookup_name(lookup): lookup for lookup in getattr(meta, 'prefetch_related', ())}
+    annotations = dict(getattr(meta, 'annotations', {}))
+    declared = serializer_class._declared_fields
+
+    for name, field in declared.items():
+        source = field.source or name
+        if source == '*':
+            continue
+        path = source.replace('.', '__')
+
+        if isinstance(field, serializers.ListSerializer):
+            child = field.child
+            if isinstance(child, serializers.ModelSerializer):
+                child_plan = get_prefetch_plan(type(child))
+                queryset = child_plan.apply(child.Meta.model._default_manager.all())
+                prefetch[path] = Prefetch(path, queryset=queryset)
+            else:
+                prefetch.setdefault(path, path)
+            continue
+
+        if isinstance(field, serializers.ModelSerializer):
+            # Nested single object: join it and inherit its plan under the prefix
+            if _select_path(model, source.split('.')) == path:
+                select.add(path)
+                child_plan = get_prefetch_plan(type(field))
+                select.update(f'{path}__{lookup}' for lookup in child_plan.select_related)
+                for lookup in child_plan.prefetch_related:
+                    lookup = _prefixed(path, lookup)
+                    prefetch[_lookup_name(lookup)] = lookup
+            continue
+
+        if '.' in source:
+            join = _select_path(model, source.split('.')[:-1])
+            if join:
+                select.add(join)
+
+    # Many-to-many fields rendered as primary keys (e.g. Group.members)
+    fields = getattr(meta, 'fields', ())
+    if isinstance(fields, (list, tuple)):
+        for name in fields:
+            if name in declared:
+                continue
+            field = _get_field(model, name)
+            if field is not None and field.many_to_many:
+                prefetch.setdefault(name, name)
+
+    # A select on a path that is also the root of a nested select is redundant
+    select = {path for path in select if not any(other.startswith(f'{path}__') for other in select)}
+    return PrefetchPlan(sorted(select), prefetch.values(), annotations)
+
+
+def apply_prefetch_plan(queryset, serializer_class):
+    """Apply the serializer's plan when it describes the queryset's model."""
+    meta = getattr(serializer_class, 'Meta', None)
+    if getattr(meta, 'model', None) is not queryset.model:
+        return queryset
+    return get_prefetch_plan(serializer_class).apply(queryset)
+
+
+class PrefetchPlanMixin:
+    """
+    Generic view mixin that applies the serializer's prefetch plan to the
+    queryset used by list() and get_object().
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        return apply_prefetch_plan(queryset, self.get_serializer_class())
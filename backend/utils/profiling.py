@@ -0,0 +1,197 @@
+"""
+Per-request database query profiling.
+
+QueryProfilerMiddleware wraps every database connection for the duration of
+a request and records the number of queries, the time spent in the database
+and how often each SQL "shape" (the statement with literals stripped) was
+repeated. A shape repeated N_PLUS_ONE_THRESHOLD times or more in one request
+is reported as a likely N+1 pattern for that view. Aggregates per view are
+kept in-process and exposed to superusers through QueryProfileView.
+"""
+
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.db import connections
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SETTINGS = {
+    'ENABLED': False,
+    'N_PLUS_ONE_THRESHOLD': 5,
+    'BUDGETS': {},
+    'DEFAULT_BUDGET': None,
+    'RAISE_ON_BUDGET': False,
+}
+
+STRING_LITERAL_RE = re.compile(r"'(?:[^']|'')*'")
+NUMBER_LITERAL_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+IN_LIST_RE = re.compile(r"\bIN\s*\((?:\s*(?:\?|%s)\s*,?)+\)", re.IGNORECASE)
+WHITESPACE_RE = re.compile(r"\s+")
+
+# Stats key for requests no URL pattern matched, so 404s do not add one
+# entry per path
+UNRESOLVED = '<unresolved>'
+
+
+def get_profiler_settings():
+    return {**DEFAULT_SETTINGS, **getattr(settings, 'QUERY_PROFILER', {})}
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def normalize_sql(sql):
+    """Reduce a statement to its shape so repeated lookups compare equal."""
+    sql = STRING_LITERAL_RE.sub('?', sql)
+    sql = NUMBER_LITERAL_RE.sub('?', sql)
+    sql = IN_LIST_RE.sub('IN (...)', sql)
+    return WHITESPACE_RE.sub(' ', sql).strip()
+
+
+class QueryRecorder:
+    """
+    Execute wrapper (see django.db.connection.execute_wrapper) that counts
+    queries, database time and SQL shapes.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.shapes = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            self.shapes[normalize_sql(sql)] += 1
+
+    def duplicates(self, threshold):
+        return {shape: count for shape, count in self.shapes.most_common() if count >= threshold}
+
+    @contextmanager
+    def record(self):
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(self))
+            yield self
+
+
+class QueryStats:
+    """Thread-safe per-view aggregates of recorded requests."""
+
+    MAX_SHAPES_PER_VIEW = 10
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._views = {}
+
+    def record(self, view_name, recorder, duplicates):
+        with self._lock:
+            entry = self._views.setdefault(view_name, {
+                'requests': 0,
+                'total_queries': 0,
+                'max_queries': 0,
+                'total_db_time_ms': 0.0,
+                'n_plus_one_requests': 0,
+                'duplicated_shapes': Counter(),
+            })
+            entry['requests'] += 1
+            entry['total_queries'] += recorder.count
+            entry['max_queries'] = max(entry['max_queries'], recorder.count)
+            entry['total_db_time_ms'] += recorder.duration * 1000
+            if duplicates:
+                entry['n_plus_one_requests'] += 1
+                entry['duplicated_shapes'].update(duplicates)
+
+    def snapshot(self):
+        with self._lock:
+            views = {}
+            for view_name, entry in self._views.items():
+                views[view_name] = {
+                    'requests': entry['requests'],
+                    'avg_queries': round(entry['total_queries'] / entry['requests'], 2),
+                    'max_queries': entry['max_queries'],
+                    'avg_db_time_ms': round(entry['total_db_time_ms'] / entry['requests'], 3),
+                    'n_plus_one_requests': entry['n_plus_one_requests'],
+                    'duplicated_shapes': [
+                        {'sql': shape, 'executions': count}
+                        for shape, count in entry['duplicated_shapes'].most_common(self.MAX_SHAPES_PER_VIEW)
+                    ],
+                }
+            return views
+
+    def reset(self):
+        with self._lock:
+            self._views.clear()
+
+
+query_stats = QueryStats()
+
+
+def check_budget(view_name, recorder, options):
+    budget = options['BUDGETS'].get(view_name, options['DEFAULT_BUDGET'])
+    if budget is None or recorder.count <= budget:
+        return
+    message = f"{view_name} ran {recorder.count} queries (budget {budget})"
+    if options['RAISE_ON_BUDGET']:
+        raise QueryBudgetExceeded(message)
+    logger.warning(message)
+
+
+class QueryProfilerMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        options = get_profiler_settings()
+        if not options['ENABLED']:
+            return self.get_response(request)
+
+        recorder = QueryRecorder()
+        with recorder.record():
+            response = self.get_response(request)
+
+        match = getattr(request, 'resolver_match', None)
+        view_name = match.view_name if match else UNRESOLVED
+        duplicates = recorder.duplicates(options['N_PLUS_ONE_THRESHOLD'])
+        query_stats.record(view_name, recorder, duplicates)
+
+        if duplicates:
+            logger.warning(
+                "Possible N+1 in %s: %s",
+                view_name,
+                '; '.join(f"{count}x {shape[:120]}" for shape, count in duplicates.items())
+            )
+        check_budget(view_name, recorder, options)
+
+        response['X-Query-Count'] = str(recorder.count)
+        response['X-DB-Time-Ms'] = f"{recorder.duration * 1000:.2f}"
+        return response
+
+
+@contextmanager
+def query_budget(max_queries):
+    """
+    Fail with QueryBudgetExceeded when the wrapped block runs more than
+    max_queries queries. Intended for tests:
+
+        with query_budget(5):
+            client.get('/api/lms/courses/')
+    """
+    recorder = QueryRecorder()
+    with recorder.record():
+        yield recorder
+    if recorder.count > max_queries:
+        repeated = '\n'.join(f"  {count}x {shape}" for shape, count in recorder.shapes.most_common(5))
+        raise QueryBudgetExceeded(f"{recorder.count} queries run, budget was {max_queries}:\n{repeated}")
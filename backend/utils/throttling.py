@@ -0,0 +1,255 @@
+"""
+Rate limiting and admission control for expensive endpoints.
+
+Views opt in with AdmissionControlMixin and a `throttle_scope`:
+
+    class JobSearchView(AdmissionControlMixin, generics.ListAPIView):
+        throttle_scope = 'job_search'
+        admission_pool = 'search'
+
+THROTTLING['RATES'][scope] maps a key kind to a DRF-style rate ('20/min'):
+'ip' limits each client address, 'user' each authenticated user, 'account'
+each client address per value of the view's `account_field` in the request
+body (e.g. the email a login is attempted for) and 'endpoint' the scope as
+a whole. Account buckets include the address so that failed attempts from
+elsewhere cannot lock the owner out. Client addresses come from
+utils.network.client_ip. Each limit is a token bucket holding up to N
+tokens that refills at N per period, so short bursts pass while the
+sustained rate stays bounded. Buckets live in THROTTLING['CACHE'] (local
+memory by default; point it at Redis or another shared cache so all
+processes count together). Exhausted buckets answer 429 with Retry-After.
+
+`admission_pool` names a concurrency cap (THROTTLING['CONCURRENCY']): at
+most that many requests of the pool run at once in a process, and the rest
+are answered 503 with Retry-After straight away instead of queueing behind
+them. Admitted and rejected requests are counted per scope in
+throttle_stats, for the profiler endpoint.
+"""
+
+import hashlib
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework import status
+from rest_framework.exceptions import APIException, Throttled
+from rest_framework.throttling import BaseThrottle
+
+from utils.network import client_ip
+
+
+DEFAULT_SETTINGS = {
+    'ENABLED': True,
+    'CACHE': 'default',
+    # scope -> {'ip' | 'user' | 'account' | 'endpoint': 'N/period'}
+    'RATES': {},
+    # pool -> requests running at once per process
+    'CONCURRENCY': {},
+    # Seconds suggested to clients shed by a full pool
+    'RETRY_AFTER': 1,
+}
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def get_throttling_settings():
+    return {**DEFAULT_SETTINGS, **getattr(settings, 'THROTTLING', {})}
+
+
+def get_throttle_cache():
+    return caches[get_throttling_settings()['CACHE']]
+
+
+def parse_rate(rate):
+    """'20/min' -> (20, 60): bucket capacity and seconds to refill it."""
+    count, period = rate.split('/')
+    return int(count), PERIODS[period[0]]
+
+
+# Token buckets
+
+class TokenBucket:
+    """
+    A token bucket stored in the cache as (tokens, last update). Reads and
+    writes are not atomic, so concurrent requests for the same key may
+    occasionally both take the last token; the limit holds on average.
+    """
+
+    def __init__(self, key, rate):
+        self.key = key
+        self.capacity, self.period = parse_rate(rate)
+        self.refill = self.capacity / self.period
+
+    def take(self, now=None):
+        """Take a token; returns 0 on success or the seconds until one is available."""
+        now = time.time() if now is None else now
+        cache = get_throttle_cache()
+        tokens, updated = cache.get(self.key) or (self.capacity, now)
+        tokens = min(self.capacity, tokens + (now - updated) * self.refill)
+        if tokens < 1:
+            return (1 - tokens) / self.refill
+        # Untouched buckets expire once they would have refilled anyway
+        cache.set(self.key, (tokens - 1, now), self.period + 1)
+        return 0
+
+
+class BucketThrottle(BaseThrottle):
+    """
+    DRF throttle drawing from the view's token bucket of kind `kind`. Views
+    without a rate for their scope and kind are not limited.
+    """
+    kind = None
+
+    def __init__(self):
+        self.wait_seconds = None
+
+    def get_ident_key(self, request, view):
+        raise NotImplementedError
+
+    def allow_request(self, request, view):
+        scope = getattr(view, 'throttle_scope', None)
+        rate = get_throttling_settings()['RATES'].get(scope, {}).get(self.kind)
+        ident = self.get_ident_key(request, view) if rate else None
+        if ident is None:
+            return True
+        self.wait_seconds = TokenBucket(f"throttle:{scope}:{self.kind}:{ident}", rate).take()
+        return not self.wait_seconds
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class IPRateThrottle(BucketThrottle):
+    kind = 'ip'
+
+    def get_ident_key(self, request, view):
+        return client_ip(request)
+
+
+class UserRateThrottle(BucketThrottle):
+    kind = 'user'
+
+    def get_ident_key(self, request, view):
+        # Anonymous requests are covered by the IP limit
+        user = request.user
+        return user.pk if user and user.is_authenticated else None
+
+
+class AccountRateThrottle(BucketThrottle):
+    kind = 'account'
+
+    def get_ident_key(self, request, view):
+        field = getattr(view, 'account_field', None)
+        data = request.data if field else None
+        value = data.get(field) if hasattr(data, 'get') else None
+        if not isinstance(value, str) or not value.strip():
+            return None
+        # Hashed: the value is user input and may not be a valid cache key
+        account = hashlib.sha1(value.strip().lower().encode()).hexdigest()
+        return f"{account}:{client_ip(request)}"
+
+
+class EndpointRateThrottle(BucketThrottle):
+    kind = 'endpoint'
+
+    def get_ident_key(self, request, view):
+        return 'all'
+
+
+# Admission control
+
+class Overloaded(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "The server is busy, try again shortly."
+    default_code = 'overloaded'
+
+    def __init__(self, retry_after):
+        super().__init__()
+        self.wait = retry_after
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_admission_pool(name):
+    """The semaphore capping the pool, or None if the pool is unbounded."""
+    with _pools_lock:
+        if name not in _pools:
+            limit = get_throttling_settings()['CONCURRENCY'].get(name)
+            _pools[name] = threading.BoundedSemaphore(limit) if limit else None
+        return _pools[name]
+
+
+class ThrottleStats:
+    """Thread-safe admitted/rejected counters per throttle scope."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def add(self, scope, outcome):
+        with self._lock:
+            counts = self._scopes.setdefault(scope, {'admitted': 0, 'rate_limited': 0, 'overloaded': 0})
+            counts[outcome] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {scope: dict(counts) for scope, counts in self._scopes.items()}
+
+    def reset(self):
+        with self._lock:
+            self._scopes = {}
+
+
+throttle_stats = ThrottleStats()
+
+
+class AdmissionControlMixin:
+    """
+    Applies the scope's rate limits and, once they pass, takes a slot in
+    `admission_pool` for the rest of the request. throttle_applies() lets a
+    view limit only its expensive requests.
+    """
+    throttle_scope = None
+    admission_pool = None
+    # Request body field identifying the targeted account, for 'account' rates
+    account_field = None
+    throttle_classes = [IPRateThrottle, UserRateThrottle, AccountRateThrottle, EndpointRateThrottle]
+
+    def throttle_applies(self, request):
+        return True
+
+    def get_throttles(self):
+        if not get_throttling_settings()['ENABLED'] or not self.throttle_applies(self.request):
+            return []
+        return super().get_throttles()
+
+    def check_throttles(self, request):
+        try:
+            super().check_throttles(request)
+        except Throttled:
+            throttle_stats.add(self.throttle_scope, 'rate_limited')
+            raise
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        options = get_throttling_settings()
+        if not (options['ENABLED'] and self.throttle_applies(request)):
+            return
+        pool = get_admission_pool(self.admission_pool) if self.admission_pool else None
+        if pool is not None:
+            if not pool.acquire(blocking=False):
+                throttle_stats.add(self.throttle_scope, 'overloaded')
+                raise Overloaded(options['RETRY_AFTER'])
+            self._admission_slot = pool
+        throttle_stats.add(self.throttle_scope, 'admitted')
+
+    def dispatch(self, request, *args, **kwargs):
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            slot = self.__dict__.pop('_admission_slot', None)
+            if slot is not None:
+                slot.release()
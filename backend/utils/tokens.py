@@ -0,0 +1,253 @@
+"""
+Stateless JWT authentication.
+
+Tokens issued by tokens_for_user() carry the user's role, approval flag and
+institution as signed claims, plus the user's auth_version. For such tokens
+StatelessJWTAuthentication does not load the CustomUser row: request.user
+is a ClaimsUser that answers id, role, approved and institution from the
+token, so the permission classes in utils.permissions never touch the
+database. Any other attribute (or passing the user to the ORM) loads the
+row on first use.
+
+The only per-request check is that the token's version still matches
+CustomUser.auth_version, read through the cache for at most
+VERSION_CACHE_TIMEOUT seconds. CustomUser.save() bumps the version when a
+signed field, is_active or the password changes, and the cached value is
+dropped on commit, so a demoted or deactivated user's tokens stop working
+right away (within the timeout on other cache instances). The refresh
+endpoint re-stamps the claims, so clients recover from a stale access token
+with a normal refresh. Queryset .update() calls bypass save() and must call
+bump_auth_version() themselves.
+
+Tokens without the version claim are authenticated the old way, by loading
+the user.
+
+Individual tokens are revoked by JTI (logout, refresh rotation). Revoked
+JTIs are kept in the token cache (AUTH_TOKENS['CACHE']; point it at Redis
+or another shared cache in production) until the token would have expired
+anyway, so checking a token costs one cache lookup and no query. The
+version and revocation lookups share a single get_many(). RevokedToken rows
+are an audit trail only, purged in the background after expiry.
+"""
+
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.functional import SimpleLazyObject
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer as BaseTokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from tasks.registry import task
+
+
+DEFAULT_SETTINGS = {
+    # Cache alias holding auth versions and revoked JTIs
+    'CACHE': 'default',
+    # Seconds a user's auth_version is cached between checks
+    'VERSION_CACHE_TIMEOUT': 30,
+    # Seconds between background purges of expired RevokedToken rows
+    'PURGE_INTERVAL': 3600,
+}
+
+USER_CLAIMS = ('role', 'approved', 'institution')
+
+VERSION_CLAIM = 'ver'
+
+
+def get_token_settings():
+    return {**DEFAULT_SETTINGS, **getattr(settings, 'AUTH_TOKENS', {})}
+
+
+def get_token_cache():
+    return caches[get_token_settings()['CACHE']]
+
+
+# Issuing
+
+def stamp_claims(token, user):
+    for claim in USER_CLAIMS:
+        token[claim] = getattr(user, claim)
+    token[VERSION_CLAIM] = user.auth_version
+    return token
+
+
+def tokens_for_user(user):
+    """A refresh token (and, through .access_token, an access token) carrying the user's claims."""
+    return stamp_claims(RefreshToken.for_user(user), user)
+
+
+# Versions
+
+def _version_key(user_id):
+    return f"auth:version:{user_id}"
+
+
+def _load_auth_version(user_id):
+    row = get_user_model().objects.filter(pk=user_id).values_list('auth_version', 'is_active').first()
+    version = row[0] if row and row[1] else 0
+    get_token_cache().set(_version_key(user_id), version, get_token_settings()['VERSION_CACHE_TIMEOUT'])
+    return version
+
+
+def current_auth_version(user_id):
+    """The user's auth_version, or None for a missing or inactive user."""
+    version = get_token_cache().get(_version_key(user_id))
+    if version is None:
+        version = _load_auth_version(user_id)
+    return version or None
+
+
+def forget_auth_version(user_id):
+    transaction.on_commit(lambda: get_token_cache().delete(_version_key(user_id)))
+
+
+def bump_auth_version(user_ids):
+    """Invalidate the tokens of users changed with queryset.update()."""
+    user_ids = list(user_ids)
+    get_user_model().objects.filter(pk__in=user_ids).update(auth_version=F('auth_version') + 1)
+    for user_id in user_ids:
+        forget_auth_version(user_id)
+
+
+# Revocation
+
+def _revoked_key(jti):
+    return f"auth:revoked:{jti}"
+
+
+def _expires_at(token):
+    return datetime.fromtimestamp(token['exp'], tz=dt_timezone.utc)
+
+
+def revoke(token, reason):
+    """
+    Revoke a validated token until it expires. Returns False if it was
+    already revoked, which makes refresh rotation single-use even for
+    concurrent requests (cache.add is atomic).
+    """
+    jti = token[api_settings.JTI_CLAIM]
+    expires_at = _expires_at(token)
+    ttl = int((expires_at - timezone.now()).total_seconds()) + 1
+    if ttl <= 0:
+        return True
+    if not get_token_cache().add(_revoked_key(jti), reason, ttl):
+        return False
+
+    from core.models import RevokedToken
+
+    RevokedToken.objects.get_or_create(jti=jti, defaults={
+        'user_id': token.get(api_settings.USER_ID_CLAIM),
+        'token_type': token.get(api_settings.TOKEN_TYPE_CLAIM, ''),
+        'reason': reason,
+        'expires_at': expires_at,
+    })
+    _schedule_purge()
+    return True
+
+
+def is_revoked(token):
+    return get_token_cache().get(_revoked_key(token[api_settings.JTI_CLAIM])) is not None
+
+
+def _schedule_purge():
+    interval = get_token_settings()['PURGE_INTERVAL']
+    # At most one purge queued per interval
+    if get_token_cache().add('auth:purge-scheduled', True, interval):
+        purge_revoked_tokens.enqueue(countdown=interval)
+
+
+@task(name='utils.purge_revoked_tokens')
+def purge_revoked_tokens():
+    """Delete audit rows of tokens that have expired (the cache entries expire on their own)."""
+    from core.models import RevokedToken
+
+    deleted, _ = RevokedToken.objects.filter(expires_at__lt=timezone.now()).delete()
+    return deleted
+
+
+# Authentication
+
+class ClaimsUser(SimpleLazyObject):
+    """
+    The authenticated user as described by a token. Signed claims are read
+    from the token; anything else loads the CustomUser on first use.
+    """
+
+    def __init__(self, user_id, claims):
+        User = get_user_model()
+        # The claim is a string; compare like the model's primary key
+        user_id = User._meta.pk.to_python(user_id)
+        super().__init__(lambda: User.objects.get(pk=user_id))
+        self.__dict__['_claims'] = {'id': user_id, **claims}
+
+    id = pk = property(lambda self: self._claims['id'])
+    role = property(lambda self: self._claims['role'])
+    approved = property(lambda self: self._claims['approved'])
+    institution = property(lambda self: self._claims['institution'])
+    is_authenticated = True
+    is_anonymous = False
+    is_active = True
+
+    def __bool__(self):
+        # IsAuthenticated tests `request.user and ...`
+        return True
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    def get_user(self, validated_token):
+        if VERSION_CLAIM not in validated_token:
+            if is_revoked(validated_token):
+                raise AuthenticationFailed("Token has been revoked", code='token_revoked')
+            return super().get_user(validated_token)
+
+        user_id = validated_token[api_settings.USER_ID_CLAIM]
+        version_key = _version_key(user_id)
+        revoked_key = _revoked_key(validated_token[api_settings.JTI_CLAIM])
+        cached = get_token_cache().get_many([version_key, revoked_key])
+        if revoked_key in cached:
+            raise AuthenticationFailed("Token has been revoked", code='token_revoked')
+        version = cached.get(version_key)
+        if version is None:
+            version = _load_auth_version(user_id)
+        version = version or None
+        if version is None:
+            raise AuthenticationFailed("User not found or inactive", code='user_inactive')
+        if version != validated_token[VERSION_CLAIM]:
+            raise AuthenticationFailed("Token is out of date, refresh it", code='token_stale')
+        return ClaimsUser(user_id, {claim: validated_token.get(claim) for claim in USER_CLAIMS})
+
+
+class TokenRefreshSerializer(BaseTokenRefreshSerializer):
+    """
+    Refresh that rejects revoked tokens, re-stamps the user's current claims
+    and version, and with BLACKLIST_AFTER_ROTATION revokes the old refresh
+    token so it can only be used once.
+    """
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+        if is_revoked(refresh):
+            raise AuthenticationFailed("Token has been revoked", code='token_revoked')
+        user = get_user_model().objects.filter(pk=refresh.payload.get(api_settings.USER_ID_CLAIM)).first()
+        if user is None or not api_settings.USER_AUTHENTICATION_RULE(user):
+            raise AuthenticationFailed(self.error_messages['no_active_account'], 'no_active_account')
+
+        stamp_claims(refresh, user)
+        data = {'access': str(refresh.access_token)}
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION and not revoke(refresh, 'rotated'):
+                # Another request rotated this token first
+                raise AuthenticationFailed("Token has been revoked", code='token_revoked')
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            data['refresh'] = str(refresh)
+        return data
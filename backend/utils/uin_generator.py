@@ -1,20 +1,158 @@
-import uuid
-import datetime
-import random
-import string
+"""
+Universal Identification Number (UIN) allocation.
+
+Format: NS-YYYY-XXXXX, where XXXXX is five base-36 characters.
+
+Each year has a counter (core.UinSequence) that is advanced a block at a
+time under a row lock, so concurrent processes never hand out the same
+counter value. Counters are mapped onto XXXXX through a keyed Feistel
+permutation, which keeps consecutive registrations from getting adjacent
+UINs while remaining a bijection on the 36^5 space - uniqueness needs no
+retry loop. UINs issued by the old random generator are filtered out with
+one query per block.
+"""
+
+import hashlib
+import threading
+
+from django.apps import apps
+from django.conf import settings
+from django.db import IntegrityError, connections, router, transaction
+from django.utils import timezone
+
+
+BASE36 = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+UIN_LENGTH = 5
+UIN_SPACE = 36 ** UIN_LENGTH  # 60,466,176 UINs per year
+
+# The Feistel network permutes 26-bit values (2^26 >= 36^5); values that land
+# outside the UIN space are walked through the permutation again
+HALF_BITS = 13
+HALF_MASK = (1 << HALF_BITS) - 1
+ROUNDS = 4
+
+LEGACY_CHECK_CHUNK = 5000
+
+
+class UinSpaceExhausted(Exception):
+    pass
+
+
+def get_block_size():
+    return getattr(settings, 'UIN_BLOCK_SIZE', 100)
+
+
+def _round_keys(year):
+    secret = getattr(settings, 'UIN_PERMUTATION_KEY', 'nextstep-uin')
+    return [
+        int.from_bytes(hashlib.sha256(f"{secret}:{year}:{n}".encode()).digest()[:4], 'big')
+        for n in range(ROUNDS)
+    ]
+
+
+def _feistel(value, keys):
+    left, right = value >> HALF_BITS, value & HALF_MASK
+    for key in keys:
+        mixed = ((right * 0x9E3779B1) ^ key) & 0xFFFFFFFF
+        mixed = (mixed ^ (mixed >> 15)) * 0x2C1B3C6D & 0xFFFFFFFF
+        left, right = right, left ^ (mixed & HALF_MASK)
+    return (left << HALF_BITS) | right
+
+
+def permute(counter, year):
+    """Map a counter in [0, 36^5) to a unique value in the same range."""
+    keys = _round_keys(year)
+    value = _feistel(counter, keys)
+    while value >= UIN_SPACE:
+        value = _feistel(value, keys)
+    return value
+
+
+def format_uin(value, year):
+    digits = ''
+    for _ in range(UIN_LENGTH):
+        value, remainder = divmod(value, 36)
+        digits = BASE36[remainder] + digits
+    return f"NS-{year}-{digits}"
+
+
+def _reserve(year, count):
+    """Advance the year's counter by `count` and return the reserved range."""
+    UinSequence = apps.get_model('core', 'UinSequence')
+    with transaction.atomic():
+        try:
+            with transaction.atomic():
+                UinSequence.objects.get_or_create(year=year)
+        except IntegrityError:
+            pass  # created concurrently by another process
+        sequence = UinSequence.objects.select_for_update().get(year=year)
+        start = sequence.next_value
+        if start + count > UIN_SPACE:
+            raise UinSpaceExhausted(f"No UINs left for {year}")
+        sequence.next_value = start + count
+        sequence.save(update_fields=['next_value'])
+    return range(start, start + count)
+
+
+def _without_legacy(uins):
+    """Drop UINs already taken (e.g. by the old random generator)."""
+    CustomUser = apps.get_model('core', 'CustomUser')
+    taken = set()
+    for start in range(0, len(uins), LEGACY_CHECK_CHUNK):
+        taken.update(
+            CustomUser.objects.filter(uin__in=uins[start:start + LEGACY_CHECK_CHUNK]).values_list('uin', flat=True)
+        )
+    return [uin for uin in uins if uin not in taken]
+
+
+def _allocate_block(year, size):
+    return _without_legacy([format_uin(permute(n, year), year) for n in _reserve(year, size)])
+
+
+class UinAllocator:
+    """Process-wide pool of reserved UINs, refilled a block at a time."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pool = {}
+
+    def allocate(self, count, year=None):
+        year = year or timezone.now().year
+        connection = connections[router.db_for_write(apps.get_model('core', 'UinSequence'))]
+        uins = []
+
+        if connection.in_atomic_block:
+            # A rollback would hand the reserved range out again, so nothing
+            # reserved inside a transaction may outlive it in the pool
+            while len(uins) < count:
+                uins.extend(_allocate_block(year, count - len(uins)))
+            return uins
+
+        # Reservations are only valid for the database they were made in
+        key = (connection.settings_dict['NAME'], year)
+        with self._lock:
+            pool = self._pool.setdefault(key, [])
+            while len(pool) < count:
+                pool.extend(_allocate_block(year, max(count - len(pool), get_block_size())))
+            uins, self._pool[key] = pool[:count], pool[count:]
+        return uins
+
+    def reset(self):
+        with self._lock:
+            self._pool.clear()
+
+
+allocator = UinAllocator()
+
 
 def generate_uin():
     """
     Generate a Universal Identification Number (UIN) for users
-    Format: NS-YYYY-XXXXX (where XXXXX is a random alphanumeric string)
+    Format: NS-YYYY-XXXXX (where XXXXX is a unique alphanumeric string)
     """
-    # Get current year
-    current_year = datetime.datetime.now().year
-    
-    # Generate a random alphanumeric string of length 5
-    random_str = ''.join(random.choices(string.ascii_uppercase + string.digits, k=5))
-    
-    # Combine to form the UIN
-    uin = f"NS-{current_year}-{random_str}"
-    
-    return uin
\ No newline at end of file
+    return allocator.allocate(1)[0]
+
+
+def generate_uins(count):
+    """Allocate `count` unique UINs in one go (used by bulk_create)."""
+    return allocator.allocate(count) if count else []